@@ -284,6 +284,9 @@ class Settings(BaseSettings):
     postgres_pool_recycle: int = 3600
     """Connection pool recycle time in seconds"""
     
+    postgres_statement_cache_size: int = 1024
+    """Prepared statements cached per pooled connection (0 disables)"""
+    
     # ============================================================================
     # PROCESSING, RETRY & TIMEOUT SETTINGS
     # ============================================================================
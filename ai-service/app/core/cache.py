@@ -4,7 +4,7 @@ Redis cache manager for AI response caching.
 Provides async interface to Redis with automatic serialization/deserialization.
 """
 import json
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 import redis.asyncio as redis
 from loguru import logger
 
@@ -22,13 +22,18 @@ class CacheManager:
     def __init__(self):
         self.client: Optional[redis.Redis] = None
         self._connected = False
+        self._scripts: Dict[str, Any] = {}
     
     async def connect(self) -> None:
         """
         Establish connection to Redis.
         
         Creates a connection pool and tests the connection.
+        Idempotent: returns immediately if already connected.
         """
+        if self._connected and self.client:
+            return
+        
         try:
             self.client = await redis.from_url(
                 settings.redis_url,
@@ -52,6 +57,8 @@ class CacheManager:
         """Close Redis connection."""
         if self.client:
             await self.client.close()
+            self.client = None
+            self._scripts = {}
             self._connected = False
             logger.info("Redis cache disconnected")
     
@@ -171,6 +178,117 @@ class CacheManager:
             logger.error(f"Cache exists error for key '{key}': {e}")
             return False
     
+    async def increment(
+        self,
+        key: str,
+        field: str,
+        amount: int = 1,
+        ttl: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Atomically increment a counter field in a Redis hash.
+        
+        The increment and TTL refresh go out in one pipelined round-trip.
+        
+        Args:
+            key: Hash key
+            field: Counter field within the hash
+            amount: Increment step
+            ttl: Optional time to live in seconds for the whole hash
+            
+        Returns:
+            New counter value, or None on failure
+            
+        Example:
+            >>> await cache.increment("stats", "hits", ttl=3600)
+        """
+        if not self._connected or not self.client:
+            return None
+        
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, field, amount)
+                if ttl:
+                    pipe.expire(key, ttl)
+                results = await pipe.execute()
+            return int(results[0])
+            
+        except Exception as e:
+            logger.error(f"Cache increment error for key '{key}': {e}")
+            return None
+    
+    async def get_counters(self, key: str) -> Dict[str, int]:
+        """
+        Read every counter field of a Redis hash.
+        
+        Args:
+            key: Hash key
+            
+        Returns:
+            Mapping of field to integer value (empty if missing)
+        """
+        if not self._connected or not self.client:
+            return {}
+        
+        try:
+            raw = await self.client.hgetall(key)
+            return {field: int(value) for field, value in raw.items()}
+        except Exception as e:
+            logger.error(f"Cache get counters error for key '{key}': {e}")
+            return {}
+    
+    async def ttl(self, key: str) -> int:
+        """
+        Get a key's remaining time to live.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Seconds remaining, -1 if the key has no TTL, -2 if it is missing
+        """
+        if not self._connected or not self.client:
+            return -2
+        
+        try:
+            return await self.client.ttl(key)
+        except Exception as e:
+            logger.error(f"Cache ttl error for key '{key}': {e}")
+            return -2
+    
+    async def run_script(
+        self,
+        script: str,
+        keys: List[str],
+        args: Optional[List[Any]] = None
+    ) -> Any:
+        """
+        Run a Lua script atomically on the server.
+        
+        Scripts are registered once per client and invoked by SHA
+        (EVALSHA), falling back to a load only if Redis has evicted it.
+        
+        Args:
+            script: Lua source
+            keys: KEYS passed to the script
+            args: ARGV passed to the script
+            
+        Returns:
+            The script's return value
+            
+        Raises:
+            RuntimeError: If not connected
+        """
+        if not self._connected or not self.client:
+            raise RuntimeError("Cache not connected")
+        
+        handle = self._scripts.get(script)
+        if handle is None:
+            handle = self.client.register_script(script)
+            self._scripts[script] = handle
+        
+        return await handle(keys=keys, args=args or [])
+    
     async def clear_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
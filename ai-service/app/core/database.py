@@ -5,11 +5,104 @@ Provides async interface to PostgreSQL with connection pooling,
 automatic reconnection, and efficient query execution.
 """
 import asyncpg
+import orjson
 from typing import Optional, List, Dict, Any
 from loguru import logger
 from contextlib import asynccontextmanager
 
 from app.config import settings
+from app.utils.serialization import json_safe
+
+
+# ============================================================================
+# HOT-PATH QUERIES
+# ============================================================================
+# Kept as module constants so every call sends the byte-identical SQL text.
+# asyncpg keys its per-connection prepared statement cache on the query
+# string, so repeated calls skip the server-side Parse step and reuse the
+# cached plan.
+
+SQL_SAVE_CONVERSATION = """
+    INSERT INTO conversations (user_id, session_id, messages)
+    VALUES ($1, $2, $3)
+    RETURNING id
+"""
+
+SQL_GET_CONVERSATION_HISTORY = """
+    SELECT id, user_id, session_id, messages, created_at, updated_at
+    FROM conversations
+    WHERE user_id = $1 AND session_id = $2
+    ORDER BY created_at DESC
+    LIMIT $3
+"""
+
+SQL_UPDATE_CONVERSATION = """
+    UPDATE conversations
+    SET messages = $1, updated_at = NOW()
+    WHERE id = $2
+"""
+
+SQL_SAVE_PROJECT = """
+    INSERT INTO projects (user_id, project_name, architecture, layout, blockly)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING id
+"""
+
+SQL_GET_PROJECT = """
+    SELECT id, user_id, project_name, architecture, layout, blockly,
+           created_at, updated_at
+    FROM projects
+    WHERE id = $1
+"""
+
+SQL_GET_USER_PROJECTS = """
+    SELECT id, user_id, project_name, created_at, updated_at
+    FROM projects
+    WHERE user_id = $1
+    ORDER BY updated_at DESC
+    LIMIT $2
+"""
+
+SQL_SAVE_USER_PREFERENCES = """
+    INSERT INTO user_preferences (user_id, preferences)
+    VALUES ($1, $2)
+    ON CONFLICT (user_id) 
+    DO UPDATE SET preferences = $2, updated_at = NOW()
+"""
+
+SQL_GET_USER_PREFERENCES = """
+    SELECT preferences
+    FROM user_preferences
+    WHERE user_id = $1
+"""
+
+SQL_SAVE_REQUEST_METRIC = """
+    INSERT INTO request_metrics 
+    (task_id, user_id, stage, duration_ms, success, error_message)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+METRIC_COLUMNS = ("task_id", "user_id", "stage", "duration_ms", "success", "error_message")
+
+
+def _encode_jsonb(value: Any) -> str:
+    """Encode a Python value for a JSONB parameter"""
+    return orjson.dumps(value, default=json_safe).decode("utf-8")
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Per-connection setup run by the pool.
+    
+    Registers an orjson codec for JSONB so callers pass and receive
+    plain dicts/lists instead of pre-serialized strings.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=orjson.loads,
+        schema="pg_catalog"
+    )
 
 
 class DatabaseManager:
@@ -32,8 +125,13 @@ class DatabaseManager:
         Establish connection pool to PostgreSQL.
         
         Creates a connection pool with min/max connections
-        and tests connectivity.
+        and tests connectivity. Idempotent: if a pool is already
+        established it is reused instead of opening a new one.
         """
+        if self._connected and self.pool:
+            logger.debug("PostgreSQL pool already established, reusing it")
+            return
+        
         try:
             logger.info(f"Connecting to PostgreSQL: {settings.postgres_host}:{settings.postgres_port}")
             
@@ -47,7 +145,9 @@ class DatabaseManager:
                 min_size=settings.postgres_min_connections,
                 max_size=settings.postgres_max_connections,
                 command_timeout=30,
-                timeout=10
+                timeout=10,
+                statement_cache_size=settings.postgres_statement_cache_size,
+                init=_init_connection
             )
             
             # Test connection
@@ -68,6 +168,7 @@ class DatabaseManager:
         """Close connection pool gracefully."""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             self._connected = False
             logger.info("PostgreSQL connection pool closed")
     
@@ -186,16 +287,9 @@ class DatabaseManager:
         Returns:
             Conversation ID
         """
-        query = """
-            INSERT INTO conversations (user_id, session_id, messages)
-            VALUES ($1, $2, $3)
-            RETURNING id
-        """
-        
-        import json
-        messages_json = json.dumps(messages)
-        
-        conversation_id = await self.fetch_val(query, user_id, session_id, messages_json)
+        conversation_id = await self.fetch_val(
+            SQL_SAVE_CONVERSATION, user_id, session_id, messages
+        )
         logger.debug(f"Saved conversation: {conversation_id}")
         return str(conversation_id)
     
@@ -216,15 +310,9 @@ class DatabaseManager:
         Returns:
             List of conversations
         """
-        query = """
-            SELECT id, user_id, session_id, messages, created_at, updated_at
-            FROM conversations
-            WHERE user_id = $1 AND session_id = $2
-            ORDER BY created_at DESC
-            LIMIT $3
-        """
-        
-        conversations = await self.fetch_all(query, user_id, session_id, limit)
+        conversations = await self.fetch_all(
+            SQL_GET_CONVERSATION_HISTORY, user_id, session_id, limit
+        )
         logger.debug(f"Retrieved {len(conversations)} conversations for {user_id}/{session_id}")
         return conversations
     
@@ -243,14 +331,9 @@ class DatabaseManager:
         Returns:
             True if updated successfully
         """
-        import json
-        query = """
-            UPDATE conversations
-            SET messages = $1, updated_at = NOW()
-            WHERE id = $2
-        """
-        
-        result = await self.execute(query, json.dumps(messages), conversation_id)
+        result = await self.execute(
+            SQL_UPDATE_CONVERSATION, messages, conversation_id
+        )
         return "UPDATE 1" in result
     
     # ========================================================================
@@ -278,20 +361,13 @@ class DatabaseManager:
         Returns:
             Project ID
         """
-        import json
-        query = """
-            INSERT INTO projects (user_id, project_name, architecture, layout, blockly)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id
-        """
-        
         project_id = await self.fetch_val(
-            query,
+            SQL_SAVE_PROJECT,
             user_id,
             project_name,
-            json.dumps(architecture),
-            json.dumps(layout),
-            json.dumps(blockly)
+            architecture,
+            layout,
+            blockly
         )
         
         logger.debug(f"Saved project: {project_id}")
@@ -307,14 +383,7 @@ class DatabaseManager:
         Returns:
             Project data or None
         """
-        query = """
-            SELECT id, user_id, project_name, architecture, layout, blockly,
-                   created_at, updated_at
-            FROM projects
-            WHERE id = $1
-        """
-        
-        return await self.fetch_one(query, project_id)
+        return await self.fetch_one(SQL_GET_PROJECT, project_id)
     
     async def get_user_projects(
         self,
@@ -331,15 +400,7 @@ class DatabaseManager:
         Returns:
             List of projects
         """
-        query = """
-            SELECT id, user_id, project_name, created_at, updated_at
-            FROM projects
-            WHERE user_id = $1
-            ORDER BY updated_at DESC
-            LIMIT $2
-        """
-        
-        return await self.fetch_all(query, user_id, limit)
+        return await self.fetch_all(SQL_GET_USER_PROJECTS, user_id, limit)
     
     async def update_project(
         self,
@@ -360,24 +421,23 @@ class DatabaseManager:
         Returns:
             True if updated successfully
         """
-        import json
         updates = []
         params = []
         param_idx = 1
         
         if architecture is not None:
             updates.append(f"architecture = ${param_idx}")
-            params.append(json.dumps(architecture))
+            params.append(architecture)
             param_idx += 1
         
         if layout is not None:
             updates.append(f"layout = ${param_idx}")
-            params.append(json.dumps(layout))
+            params.append(layout)
             param_idx += 1
         
         if blockly is not None:
             updates.append(f"blockly = ${param_idx}")
-            params.append(json.dumps(blockly))
+            params.append(blockly)
             param_idx += 1
         
         if not updates:
@@ -414,15 +474,9 @@ class DatabaseManager:
         Returns:
             True if saved successfully
         """
-        import json
-        query = """
-            INSERT INTO user_preferences (user_id, preferences)
-            VALUES ($1, $2)
-            ON CONFLICT (user_id) 
-            DO UPDATE SET preferences = $2, updated_at = NOW()
-        """
-        
-        result = await self.execute(query, user_id, json.dumps(preferences))
+        result = await self.execute(
+            SQL_SAVE_USER_PREFERENCES, user_id, preferences
+        )
         return "INSERT" in result or "UPDATE" in result
     
     async def get_user_preferences(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -435,13 +489,7 @@ class DatabaseManager:
         Returns:
             Preferences or None
         """
-        query = """
-            SELECT preferences
-            FROM user_preferences
-            WHERE user_id = $1
-        """
-        
-        result = await self.fetch_one(query, user_id)
+        result = await self.fetch_one(SQL_GET_USER_PREFERENCES, user_id)
         return result['preferences'] if result else None
     
     # ========================================================================
@@ -468,14 +516,8 @@ class DatabaseManager:
             success: Whether stage succeeded
             error_message: Error message if failed
         """
-        query = """
-            INSERT INTO request_metrics 
-            (task_id, user_id, stage, duration_ms, success, error_message)
-            VALUES ($1, $2, $3, $4, $5, $6)
-        """
-        
         await self.execute(
-            query,
+            SQL_SAVE_REQUEST_METRIC,
             task_id,
             user_id,
             stage,
@@ -483,6 +525,46 @@ class DatabaseManager:
             success,
             error_message
         )
+    
+    async def bulk_import_metrics(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Bulk-insert request metrics with one COPY on one connection.
+        
+        Rows go straight into request_metrics; ids and timestamps come
+        from the column defaults. Concurrent imports don't block each
+        other.
+        
+        Args:
+            records: Dicts with the same keys as save_request_metric's
+                arguments (error_message optional)
+            
+        Returns:
+            Number of rows imported
+        """
+        if not records:
+            return 0
+        
+        rows = [
+            (
+                r["task_id"],
+                r["user_id"],
+                r["stage"],
+                r["duration_ms"],
+                r["success"],
+                r.get("error_message")
+            )
+            for r in records
+        ]
+        
+        async with self.acquire() as conn:
+            await conn.copy_records_to_table(
+                "request_metrics",
+                records=rows,
+                columns=METRIC_COLUMNS
+            )
+        
+        logger.debug(f"Bulk imported {len(rows)} request metrics")
+        return len(rows)
 
 
 # Global database manager instance
@@ -5,7 +5,7 @@ Manages connections, publishing, and consuming messages.
 """
 import json
 import asyncio
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Set
 from aio_pika import connect_robust, Message, Channel, Queue, Connection
 from aio_pika.abc import AbstractRobustConnection, AbstractIncomingMessage
 from loguru import logger
@@ -27,13 +27,19 @@ class QueueManager:
         self.request_queue: Optional[Queue] = None
         self.response_queue: Optional[Queue] = None
         self._connected = False
+        # Publishes whose broker confirm is still outstanding
+        self._pending_publishes: Set[asyncio.Task] = set()
     
     async def connect(self) -> None:
         """
         Establish connection to RabbitMQ.
         
         Creates connection pool, channel, and declares queues.
+        Idempotent: returns immediately if already connected.
         """
+        if self._connected and self.connection:
+            return
+        
         try:
             logger.info(f"Connecting to RabbitMQ: {settings.rabbitmq_url}")
             
@@ -75,8 +81,14 @@ class QueueManager:
     
     async def disconnect(self) -> None:
         """Close RabbitMQ connection gracefully."""
+        # Let background publishes receive their confirms first
+        if self._pending_publishes:
+            await asyncio.gather(*self._pending_publishes, return_exceptions=True)
+        
         if self.connection:
             await self.connection.close()
+            self.connection = None
+            self.channel = None
             self._connected = False
             logger.info("RabbitMQ connection closed")
     
@@ -124,6 +136,21 @@ class QueueManager:
             logger.error(f"Failed to publish response: {e}")
             return False
     
+    def publish_response_nowait(self, response: Dict[str, Any]) -> None:
+        """
+        Publish a response without waiting for the broker's confirm.
+        
+        For best-effort messages such as progress updates: the publish and
+        its confirm complete in the background, and failures are logged by
+        publish_response(). disconnect() waits for any still pending.
+        
+        Args:
+            response: Response data (will be JSON serialized)
+        """
+        task = asyncio.create_task(self.publish_response(response))
+        self._pending_publishes.add(task)
+        task.add_done_callback(self._pending_publishes.discard)
+    
     async def consume(
         self,
         queue_name: str,
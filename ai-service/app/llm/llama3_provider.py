@@ -2,9 +2,10 @@
 app/llm/llama3_provider.py
 Llama3 LLM provider implementation - Production Ready
 """
+import asyncio
 import httpx
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 
 from .base import BaseLLMProvider, LLMResponse, LLMMessage, LLMProvider
 
@@ -12,6 +13,72 @@ from .base import BaseLLMProvider, LLMResponse, LLMMessage, LLMProvider
 logger = logging.getLogger(__name__)
 
 
+# One HTTP client shared by every provider instance, so the architecture,
+# layout and blockly generators reuse the same keep-alive connections.
+# Pooled connections belong to the event loop that opened them, so a new
+# client is made (and the old one closed) when the running loop changes.
+_shared: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+
+# Close tasks for replaced clients, referenced until they finish
+_closing: Set[asyncio.Task] = set()
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    """Close a client, ignoring errors from connections of a dead loop"""
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.debug(f"Llama3 HTTP client close failed: {e!r}")
+
+
+def _discard(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """
+    Best-effort close of a client opened on another event loop.
+    
+    If that loop is still usable the close runs there; otherwise it runs
+    on the current loop and whatever can't be closed cleanly is dropped.
+    """
+    if client.is_closed:
+        return
+    
+    if not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+        return
+    
+    task = asyncio.get_running_loop().create_task(_close_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def _shared_client() -> httpx.AsyncClient:
+    """HTTP client for the running event loop, created on first use"""
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared[0] is not loop or _shared[1].is_closed:
+        if _shared is not None:
+            _discard(*_shared)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        _shared = (loop, client)
+    return _shared[1]
+
+
+async def close_shared_client() -> None:
+    """Close the shared HTTP client; the next request opens a new one"""
+    global _shared
+    if _shared is None:
+        return
+    
+    loop, client = _shared
+    _shared = None
+    
+    if loop is asyncio.get_running_loop():
+        await client.aclose()
+    else:
+        _discard(loop, client)
+
+
 class Llama3Provider(BaseLLMProvider):
     """
     Production-ready Llama3 LLM provider with:
@@ -169,53 +236,56 @@ class Llama3Provider(BaseLLMProvider):
     ) -> LLMResponse:
         """Make actual HTTP request to Llama3 API"""
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                self.api_url,
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Validate response structure
-            if "choices" not in data or len(data["choices"]) == 0:
-                raise ValueError("Invalid Llama3 response: missing choices")
-            
-            # Parse response following OpenAI format
-            choice = data["choices"][0]
-            
-            if "message" not in choice or "content" not in choice["message"]:
-                raise ValueError("Invalid Llama3 response: missing message/content")
-            
-            content = choice["message"]["content"]
-            finish_reason = choice.get("finish_reason")
-            
-            # Extract usage info
-            usage = data.get("usage", {})
-            tokens_used = usage.get("total_tokens")
-            
-            # Log success
-            logger.info(
-                f"Llama3 success (attempt {attempt}): "
-                f"tokens={tokens_used}, finish={finish_reason}"
-            )
-            
-            return LLMResponse(
-                content=content,
-                provider=self.provider_name,
-                tokens_used=tokens_used,
-                finish_reason=finish_reason,
-                model=self.model,
-                metadata={
-                    "usage": usage,
-                    "id": data.get("id"),
-                    "attempt": attempt,
-                    "prompt_tokens": usage.get("prompt_tokens"),
-                    "completion_tokens": usage.get("completion_tokens")
-                }
-            )
+        # Timeout is per request, since providers may be configured differently
+        response = await _shared_client().post(
+            self.api_url,
+            json=payload,
+            headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        # Validate response structure
+        if "choices" not in data or len(data["choices"]) == 0:
+            raise ValueError("Invalid Llama3 response: missing choices")
+        
+        # Parse response following OpenAI format
+        choice = data["choices"][0]
+        
+        if "message" not in choice or "content" not in choice["message"]:
+            raise ValueError("Invalid Llama3 response: missing message/content")
+        
+        content = choice["message"]["content"]
+        finish_reason = choice.get("finish_reason")
+        
+        # Extract usage info
+        usage = data.get("usage", {})
+        tokens_used = usage.get("total_tokens")
+        
+        # Log success
+        logger.info(
+            f"Llama3 success (attempt {attempt}): "
+            f"tokens={tokens_used}, finish={finish_reason}"
+        )
+        
+        return LLMResponse(
+            content=content,
+            provider=self.provider_name,
+            tokens_used=tokens_used,
+            finish_reason=finish_reason,
+            model=self.model,
+            metadata={
+                "usage": usage,
+                "id": data.get("id"),
+                "attempt": attempt,
+                "prompt_tokens": usage.get("prompt_tokens"),
+                "completion_tokens": usage.get("completion_tokens"),
+                # Prompt prefix served from the server's cache, when reported
+                "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+            }
+        )
     
     async def health_check(self) -> bool:
         """
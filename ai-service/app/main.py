@@ -19,6 +19,7 @@ from app.config import settings
 from app.core.messaging import queue_manager
 from app.core.cache import cache_manager
 from app.core.database import db_manager
+from app.llm.llama3_provider import close_shared_client
 from app.models.schemas import AIRequest
 from app.services.pipeline import default_pipeline
 from app.api.v1 import stats
@@ -107,6 +108,9 @@ async def lifespan(app: FastAPI):
             await db_manager.disconnect()
             logger.info("app.shutdown.postgresql.disconnected")
             
+            await close_shared_client()
+            logger.info("app.shutdown.llm_client.closed")
+            
             logger.info("app.shutdown.completed")
 
 
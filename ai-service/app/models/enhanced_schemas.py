@@ -300,22 +300,34 @@ class EnhancedLayoutDefinition(BaseModel):
             
             return True
         
-        # Check all pairs for collision
-        for i, comp1 in enumerate(self.components):
-            bounds1 = get_bounds(comp1)
-            if not bounds1:
-                continue
+        # Resolve each component's bounds once, keeping original order
+        boxes = []
+        for index, comp in enumerate(self.components):
+            bounds = get_bounds(comp)
+            if bounds:
+                boxes.append((bounds, index, comp))
+        
+        # Sort-and-sweep on the x-axis: only boxes whose right edge is still
+        # past the current left edge can overlap, so pairs far apart on x
+        # are never compared.
+        boxes.sort(key=lambda box: box[0][0])
+        active: List[tuple] = []
+        
+        for box in boxes:
+            bounds, index, comp = box
+            active = [other for other in active if other[0][2] > bounds[0]]
             
-            for comp2 in self.components[i+1:]:
-                bounds2 = get_bounds(comp2)
-                if not bounds2:
-                    continue
-                
-                if rectangles_overlap(bounds1, bounds2):
+            for other_bounds, other_index, other_comp in active:
+                if rectangles_overlap(bounds, other_bounds):
+                    first, second = (
+                        (other_comp, comp) if other_index < index else (comp, other_comp)
+                    )
                     raise ValueError(
-                        f"Component collision detected: {comp1.component_id} "
-                        f"overlaps with {comp2.component_id}"
+                        f"Component collision detected: {first.component_id} "
+                        f"overlaps with {second.component_id}"
                     )
+            
+            active.append(box)
         
         return self
     
@@ -267,6 +267,30 @@ Return ONLY valid JSON (no markdown, no explanations) with this structure:
 Generate the complete layout JSON now."""
     )
     
+    LAYOUT_GENERATE_BATCH = PromptTemplate(
+        system=LAYOUT_GENERATE.system,
+        
+        user_template="""Create mobile-optimized layouts for these {count} screens:
+
+**App Purpose:** {prompt}
+
+{screen_specs}
+
+**Design Requirements:**
+1. Position components logically (top to bottom priority)
+2. Ensure touch targets meet minimum size (44px height)
+3. Use consistent 8px spacing
+4. Center align for single-column layouts
+5. Group related components together
+
+**Important Property Names:**
+- Text components: use "value" for the displayed text (e.g., bound to a variable)
+- Button components: use "value" for the button label
+- InputText: use "value" for current text, "placeholder" for hint
+
+Return ONLY a JSON array of {count} layout objects, one per screen in the order listed above, each in the output format described."""
+    )
+    
     # ========================================================================
     # BLOCKLY GENERATION PROMPTS
     # ========================================================================
@@ -64,10 +64,13 @@ class AIRequest(BaseModel):
     @field_validator('prompt')
     @classmethod
     def validate_prompt(cls, v: str) -> str:
-        """Ensure prompt is not just whitespace"""
-        if not v.strip():
+        """Ensure prompt is not just whitespace or padded past the length check"""
+        v = v.strip()
+        if not v:
             raise ValueError("Prompt cannot be empty or whitespace")
-        return v.strip()
+        if len(v) < 10:
+            raise ValueError("Prompt must be at least 10 characters")
+        return v
     
     class Config:
         json_schema_extra = {
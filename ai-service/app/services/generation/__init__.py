@@ -29,7 +29,8 @@ from app.services.generation.layout_generator import (
 from app.services.generation.layout_validator import (
     layout_validator,
     LayoutValidator,
-    LayoutWarning
+    LayoutWarning,
+    WarningCode
 )
 
 from app.services.generation.blockly_generator import (
@@ -71,6 +72,7 @@ __all__ = [
     'layout_validator',
     'LayoutValidator',
     'LayoutWarning',
+    'WarningCode',
     
     # Blockly generation
     'blockly_generator',
@@ -4,6 +4,8 @@ Uses LLM Orchestrator (Llama3 → Heuristic fallback)
 """
 import json
 import asyncio
+from collections import Counter
+import orjson
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
@@ -30,6 +32,63 @@ class InvalidArchitectureError(ArchitectureGenerationError):
     pass
 
 
+def _strip_code_fence(text: str) -> str:
+    """Return the body of a ```json fenced block, or the text unchanged."""
+    text = text.strip()
+    if not text.startswith("```"):
+        return text
+    
+    body = text[3:]
+    if body.startswith("json"):
+        body = body[4:]
+    body, fence, _ = body.rpartition("```")
+    return body.strip() if fence else text
+
+
+def _repair_json(text: str) -> str:
+    """
+    Drop // line comments and trailing commas from near-JSON in one pass.
+    
+    Tracks string state so "//" or "," inside string values is preserved.
+    """
+    out = []
+    in_string = False
+    escape = False
+    i, n = 0, len(text)
+    
+    while i < n:
+        ch = text[i]
+        i += 1
+        
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        
+        if ch == '"':
+            in_string = True
+        elif ch == "/" and text.startswith("/", i):
+            newline = text.find("\n", i)
+            i = n if newline == -1 else newline
+            continue
+        elif ch in "}]":
+            # Remove a comma left dangling before the closing bracket
+            j = len(out) - 1
+            while j >= 0 and out[j] in " \t\r\n":
+                j -= 1
+            if j >= 0 and out[j] == ",":
+                del out[j]
+        
+        out.append(ch)
+    
+    return "".join(out)
+
+
 class ArchitectureGenerator:
     """
     Phase 3 Architecture Generator using LLM Orchestrator.
@@ -209,8 +268,10 @@ class ArchitectureGenerator:
                     source="heuristic" if used_heuristic else "llama3"
                 )
                 
-                error_count = sum(1 for w in warnings if w.level == "error")
-                warning_count = sum(1 for w in warnings if w.level == "warning")
+                # One pass over the warnings for both counts
+                levels = Counter(w.level for w in warnings)
+                error_count = levels["error"]
+                warning_count = levels["warning"]
                 
                 if not is_valid:
                     logger.error(
@@ -525,19 +586,11 @@ class ArchitectureGenerator:
         Parse architecture JSON from LLM response with auto-correction.
         """
         
-        # Remove markdown code blocks
-        if response_text.startswith("```"):
-            parts = response_text.split("```")
-            if len(parts) >= 3:
-                response_text = parts[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+        response_text = _strip_code_fence(response_text)
         
-        # Try parsing
+        # Try parsing (orjson errors subclass json.JSONDecodeError)
         try:
-            architecture_data = json.loads(response_text)
-            return architecture_data
+            return orjson.loads(response_text)
             
         except json.JSONDecodeError as e:
             logger.warning(
@@ -567,23 +620,8 @@ class ArchitectureGenerator:
         
         logger.debug("🔧 architecture.json.correcting")
         
-        # Remove comments
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            if '//' in line:
-                line = line[:line.index('//')]
-            cleaned_lines.append(line)
-        
-        text = '\n'.join(cleaned_lines)
-        
-        # Remove trailing commas
-        import re
-        text = re.sub(r',(\s*[}\]])', r'\1', text)
-        
-        # Try parsing again
         try:
-            return json.loads(text)
+            return orjson.loads(_repair_json(text))
         except json.JSONDecodeError:
             logger.debug("architecture.json.correction_failed")
             return None
@@ -4,6 +4,7 @@ Enhanced Architecture Validator with Heuristic Awareness
 Validates architectures from both Claude and heuristic generators.
 Provides detailed feedback with structured logging.
 """
+from collections import Counter
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime
 
@@ -13,6 +14,9 @@ from app.utils.logging import get_logger, log_context
 
 logger = get_logger(__name__)
 
+# Components that take user input; checked with set lookups per screen
+INPUT_COMPONENTS: frozenset[str] = frozenset({"InputText", "TextArea"})
+
 
 class ValidationWarning:
     """Validation warning/error"""
@@ -57,7 +61,8 @@ class ArchitectureValidator:
     
     def __init__(self):
         self.warnings: List[ValidationWarning] = []
-        self.available_components = set(settings.available_components)
+        self.available_components: frozenset[str] = frozenset(settings.available_components)
+        self._components_hint = ', '.join(sorted(self.available_components))
         
         # Validation stats
         self.stats = {
@@ -192,7 +197,7 @@ class ArchitectureValidator:
         
         # Check for duplicate screen IDs
         screen_ids = [s.id for s in architecture.screens]
-        duplicates = [id for id in screen_ids if screen_ids.count(id) > 1]
+        duplicates = [id for id, n in Counter(screen_ids).items() if n > 1]
         
         if duplicates:
             self.warnings.append(ValidationWarning(
@@ -236,30 +241,29 @@ class ArchitectureValidator:
         for screen in architecture.screens:
             all_components.extend(screen.components)
         
+        unique_components = set(all_components)
+        
         # Check for unsupported components
-        for component in set(all_components):
-            if component not in self.available_components:
-                self.warnings.append(ValidationWarning(
-                    level="error",
-                    component="components",
-                    message=f"Unsupported component: '{component}'",
-                    suggestion=f"Use one of: {', '.join(sorted(self.available_components))}"
-                ))
+        for component in unique_components - self.available_components:
+            self.warnings.append(ValidationWarning(
+                level="error",
+                component="components",
+                message=f"Unsupported component: '{component}'",
+                suggestion=f"Use one of: {self._components_hint}"
+            ))
         
         # Check for reasonable component diversity
-        unique_components = set(all_components)
-        
         if len(unique_components) == 1 and len(all_components) > 1:
             self.warnings.append(ValidationWarning(
                 level="info",
                 component="components",
-                message=f"App uses only one component type: {unique_components.pop()}",
+                message=f"App uses only one component type: {next(iter(unique_components))}",
                 suggestion="Consider adding more component types for richer UI"
             ))
         
         # Check for common UI patterns
-        has_input = any(c in all_components for c in ['InputText', 'TextArea'])
-        has_button = 'Button' in all_components
+        has_input = not INPUT_COMPONENTS.isdisjoint(unique_components)
+        has_button = 'Button' in unique_components
         
         if has_input and not has_button:
             self.warnings.append(ValidationWarning(
@@ -273,27 +277,35 @@ class ArchitectureValidator:
         """Validate navigation structure"""
         
         screen_ids = {s.id for s in architecture.screens}
+        screens_hint = ', '.join(sorted(screen_ids))
         
-        # Validate navigation routes
-        for route in architecture.navigation.routes:
-            from_screen = route.get('from')
-            to_screen = route.get('to')
-            
-            if from_screen and from_screen not in screen_ids:
-                self.warnings.append(ValidationWarning(
-                    level="error",
-                    component="navigation",
-                    message=f"Route from non-existent screen: {from_screen}",
-                    suggestion=f"Valid screens: {', '.join(sorted(screen_ids))}"
-                ))
-            
-            if to_screen and to_screen not in screen_ids:
-                self.warnings.append(ValidationWarning(
-                    level="error",
-                    component="navigation",
-                    message=f"Route to non-existent screen: {to_screen}",
-                    suggestion=f"Valid screens: {', '.join(sorted(screen_ids))}"
-                ))
+        # Validate navigation routes. One set difference tells whether any
+        # endpoint is unknown; only then are routes walked, in order, to
+        # report each bad endpoint where it occurs
+        routes = architecture.navigation.routes
+        endpoints = {r.get(key) for r in routes for key in ('from', 'to')}
+        endpoints.discard(None)
+        
+        if endpoints - screen_ids:
+            for route in routes:
+                from_screen = route.get('from')
+                to_screen = route.get('to')
+                
+                if from_screen and from_screen not in screen_ids:
+                    self.warnings.append(ValidationWarning(
+                        level="error",
+                        component="navigation",
+                        message=f"Route from non-existent screen: {from_screen}",
+                        suggestion=f"Valid screens: {screens_hint}"
+                    ))
+                
+                if to_screen and to_screen not in screen_ids:
+                    self.warnings.append(ValidationWarning(
+                        level="error",
+                        component="navigation",
+                        message=f"Route to non-existent screen: {to_screen}",
+                        suggestion=f"Valid screens: {screens_hint}"
+                    ))
         
         # Check for orphaned screens (multi-page apps only)
         if len(architecture.screens) > 1:
@@ -335,7 +347,7 @@ class ArchitectureValidator:
         
         # Check for duplicate state names
         state_names = [s.name for s in architecture.state_management]
-        duplicates = [name for name in state_names if state_names.count(name) > 1]
+        duplicates = [name for name, n in Counter(state_names).items() if n > 1]
         
         if duplicates:
             self.warnings.append(ValidationWarning(
@@ -382,7 +394,7 @@ class ArchitectureValidator:
         
         # Check for input validation
         has_inputs = any(
-            any(c in screen.components for c in ['InputText', 'TextArea'])
+            not INPUT_COMPONENTS.isdisjoint(screen.components)
             for screen in architecture.screens
         )
         
@@ -4,6 +4,8 @@ Uses LLM Orchestrator (Llama3 → Heuristic fallback)
 """
 import json
 import asyncio
+from collections import Counter
+import orjson
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 
@@ -12,6 +14,7 @@ from app.models.schemas import ArchitectureDesign
 from app.models.enhanced_schemas import EnhancedLayoutDefinition
 from app.models.prompts import prompts
 from app.services.generation.blockly_validator import blockly_validator
+from app.services.generation.generation_stats import GenerationStatsMixin
 from app.llm.orchestrator import LLMOrchestrator
 from app.llm.base import LLMMessage
 from app.utils.logging import get_logger, log_context, trace_async
@@ -24,7 +27,12 @@ class BlocklyGenerationError(Exception):
     pass
 
 
-class BlocklyGenerator:
+def _dumps_indented(value: Any) -> str:
+    """Serialize a prompt payload as 2-space indented JSON."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
+class BlocklyGenerator(GenerationStatsMixin):
     """
     Phase 3 Blockly Generator using LLM Orchestrator.
     
@@ -69,7 +77,11 @@ class BlocklyGenerator:
             'blocks_generated': 0,
             'variables_created': 0,
             'heuristic_fallbacks': 0,
-            'llama3_successes': 0
+            'llama3_successes': 0,
+            # Derived rates, kept current by _record() so reads are a copy
+            'success_rate': 0,
+            'heuristic_fallback_rate': 0,
+            'llama3_success_rate': 0
         }
         
         logger.info(
@@ -99,7 +111,7 @@ class BlocklyGenerator:
         Raises:
             BlocklyGenerationError: If generation fails
         """
-        self.stats['total_requests'] += 1
+        self._record('total_requests')
         self.block_id_counter = 0
         
         with log_context(operation="blockly_generation"):
@@ -119,7 +131,7 @@ class BlocklyGenerator:
                     layouts=layouts
                 )
                 
-                self.stats['llama3_successes'] += 1
+                self._record('llama3_successes')
                 logger.info(
                     "✅ blockly.llm.success",
                     extra={
@@ -152,7 +164,7 @@ class BlocklyGenerator:
                     }
                     
                     used_heuristic = True
-                    self.stats['heuristic_fallbacks'] += 1
+                    self._record('heuristic_fallbacks')
                     
                     logger.info(
                         "✅ blockly.heuristic.success",
@@ -166,7 +178,7 @@ class BlocklyGenerator:
                         exc_info=heuristic_error
                     )
                     
-                    self.stats['failed'] += 1
+                    self._record('failed')
                     raise BlocklyGenerationError(
                         f"Both LLM and heuristic generation failed. "
                         f"LLM: {llm_error}, Heuristic: {heuristic_error}"
@@ -184,8 +196,16 @@ class BlocklyGenerator:
             try:
                 is_valid, warnings = await blockly_validator.validate(validated)
                 
-                error_count = sum(1 for w in warnings if w.level == "error")
-                warning_count = sum(1 for w in warnings if w.level == "warning")
+                # Kept in metadata so callers need not validate again
+                metadata['validation'] = {
+                    'is_valid': is_valid,
+                    'warnings': [w.to_dict() for w in warnings]
+                }
+                
+                # One pass over the warnings for both counts
+                levels = Counter(w.level for w in warnings)
+                error_count = levels["error"]
+                warning_count = levels["warning"]
                 
                 if not is_valid:
                     logger.warning(
@@ -213,7 +233,7 @@ class BlocklyGenerator:
                 'generated_at': datetime.now(timezone.utc).isoformat() + "Z"
             })
             
-            self.stats['successful'] += 1
+            self._record('successful')
             self.stats['blocks_generated'] = len(validated['blocks']['blocks'])
             self.stats['variables_created'] = len(validated['variables'])
             
@@ -249,13 +269,12 @@ class BlocklyGenerator:
                 
                 # Format prompt
                 system_prompt, user_prompt = prompts.BLOCKLY_GENERATE.format(
-                    architecture=json.dumps(architecture.dict(), indent=2),
-                    layout=json.dumps(
+                    architecture=_dumps_indented(architecture.dict()),
+                    layout=_dumps_indented(
                         {k: v.dict() for k, v in layouts.items()} if len(layouts) > 1 
-                        else list(layouts.values())[0].dict(),
-                        indent=2
+                        else list(layouts.values())[0].dict()
                     ),
-                    component_events=json.dumps(component_events, indent=2)
+                    component_events=_dumps_indented(component_events)
                 )
                 
                 # Create messages
@@ -369,9 +388,9 @@ class BlocklyGenerator:
                     response_text = response_text[4:]
                 response_text = response_text.strip()
         
-        # Parse JSON
+        # Parse JSON (orjson errors subclass json.JSONDecodeError)
         try:
-            data = json.loads(response_text)
+            data = orjson.loads(response_text)
             
             # Ensure it's in the right format
             if isinstance(data, list):
@@ -554,17 +573,6 @@ class BlocklyGenerator:
         """Generate unique block ID"""
         self.block_id_counter += 1
         return f"block_{self.block_id_counter}"
-    
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get generation statistics"""
-        total = self.stats['total_requests']
-        
-        return {
-            **self.stats,
-            'success_rate': (self.stats['successful'] / total * 100) if total > 0 else 0,
-            'heuristic_fallback_rate': (self.stats['heuristic_fallbacks'] / total * 100) if total > 0 else 0,
-            'llama3_success_rate': (self.stats['llama3_successes'] / total * 100) if total > 0 else 0
-        }
 
 
 # Global Blockly generator instance
@@ -8,10 +8,17 @@ Validates generated Blockly blocks for:
 - Reference checking
 - Logic flow validation
 """
+from collections import Counter
 from typing import List, Tuple, Dict, Any, Set, Optional
 from loguru import logger
 
 
+# Lookup tables used on every validation, built once at import
+_LEVEL_EMOJI = {"info": "ℹ️", "warning": "⚠️", "error": "❌"}
+_VARIABLE_FIELDS = frozenset({'VAR', 'VARIABLE'})
+_ENTRY_BLOCK_TYPES = frozenset({'variables_set', 'component_event'})
+
+
 class BlocklyWarning:
     """Represents a Blockly validation warning"""
     
@@ -30,8 +37,7 @@ class BlocklyWarning:
         }
     
     def __str__(self) -> str:
-        emoji = {"info": "ℹ️", "warning": "⚠️", "error": "❌"}
-        s = f"{emoji.get(self.level, '•')} [{self.level.upper()}] {self.block_id}: {self.message}"
+        s = f"{_LEVEL_EMOJI.get(self.level, '•')} [{self.level.upper()}] {self.block_id}: {self.message}"
         if self.suggestion:
             s += f"\n   → {self.suggestion}"
         return s
@@ -53,6 +59,7 @@ class BlocklyValidator:
     def __init__(self):
         self.warnings: List[BlocklyWarning] = []
         self.block_ids: Set[str] = set()
+        self.duplicate_block_ids: Dict[str, None] = {}
         self.variable_ids: Set[str] = set()
         self.variable_names: Set[str] = set()
     
@@ -71,6 +78,7 @@ class BlocklyValidator:
         """
         self.warnings = []
         self.block_ids = set()
+        self.duplicate_block_ids = {}
         self.variable_ids = set()
         self.variable_names = set()
         
@@ -92,17 +100,17 @@ class BlocklyValidator:
         await self._validate_logic_flow(blocks)
         await self._detect_orphans(blocks)
         
-        # Determine if valid
-        has_errors = any(w.level == "error" for w in self.warnings)
-        is_valid = not has_errors
+        # Determine if valid; one pass counts every level
+        levels = Counter(w.level for w in self.warnings)
+        error_count = levels["error"]
+        is_valid = error_count == 0
         
         if is_valid:
             logger.info("✅ Blockly validation passed")
         else:
-            error_count = sum(1 for w in self.warnings if w.level == "error")
             logger.error(f"❌ Blockly validation failed: {error_count} error(s)")
         
-        warning_count = sum(1 for w in self.warnings if w.level == "warning")
+        warning_count = levels["warning"]
         if warning_count > 0:
             logger.warning(f"⚠️  {warning_count} warning(s) found")
         
@@ -113,11 +121,16 @@ class BlocklyValidator:
         blocks: List[Dict[str, Any]],
         variables: List[Dict[str, str]]
     ) -> None:
-        """Collect all block and variable IDs"""
+        """Collect all block and variable IDs, noting reused block IDs"""
         
         def collect_from_block(block: Dict[str, Any]):
             if 'id' in block:
-                self.block_ids.add(block['id'])
+                block_id = block['id']
+                if block_id in self.block_ids:
+                    # Dict keys keep first-seen order without repeats
+                    self.duplicate_block_ids[block_id] = None
+                else:
+                    self.block_ids.add(block_id)
             
             # Recursively check inputs
             inputs = block.get('inputs', {})
@@ -182,18 +195,12 @@ class BlocklyValidator:
             ))
             return
         
-        # Check for duplicate IDs
-        id_counts = {}
-        for block in blocks:
-            block_id = block.get('id', 'unknown')
-            id_counts[block_id] = id_counts.get(block_id, 0) + 1
-        
-        duplicates = [bid for bid, count in id_counts.items() if count > 1]
-        if duplicates:
+        # Duplicate IDs (nested blocks included) were found by _collect_ids
+        if self.duplicate_block_ids:
             self.warnings.append(BlocklyWarning(
                 level="error",
                 block_id="root",
-                message=f"Duplicate block IDs: {', '.join(duplicates)}",
+                message=f"Duplicate block IDs: {', '.join(self.duplicate_block_ids)}",
                 suggestion="Ensure all block IDs are unique"
             ))
         
@@ -324,7 +331,7 @@ class BlocklyValidator:
             # Check field references
             fields = block.get('fields', {})
             for field_name, field_value in fields.items():
-                if field_name in ['VAR', 'VARIABLE']:
+                if field_name in _VARIABLE_FIELDS:
                     # Variable reference
                     if isinstance(field_value, str):
                         if field_value not in self.variable_names:
@@ -397,7 +404,7 @@ class BlocklyValidator:
             is_event = 'event' in block_type.lower()
             
             # If it's not an event and has no clear entry point, warn
-            if not is_event and block_type not in ['variables_set', 'component_event']:
+            if not is_event and block_type not in _ENTRY_BLOCK_TYPES:
                 # Check if it has a next connection but no previous
                 # This would indicate it might be orphaned
                 pass  # More complex orphan detection could be added
@@ -27,11 +27,15 @@ class SemanticCacheManager:
     def __init__(self):
         self.cache_prefix = "semantic_cache:"
         self.embedding_prefix = "embedding:"
-        self.stats_key = "cache_stats"
         
-        # Simple similarity check without ML dependencies for Phase 2
-        # Will enhance with proper embeddings in future phases
-        self.use_simple_similarity = True
+        # Redis hash of counters (HINCRBY), not a JSON blob
+        self.stats_key = "cache_counters"
+        
+        # Off: token-set similarity can't tell "a red button and a blue
+        # label" from "a blue button and a red label", so a similar hit can
+        # serve another app. Only exact normalized prompts hit until real
+        # embeddings land
+        self.use_simple_similarity = False
     
     async def get_cached_result(
         self,
@@ -152,7 +156,7 @@ class SemanticCacheManager:
             Cache key string
         """
         # Normalize prompt
-        normalized = prompt.lower().strip()
+        normalized = self._normalize_prompt(prompt)
         
         # Create hash components
         components = [normalized, user_id]
@@ -165,6 +169,16 @@ class SemanticCacheManager:
         
         return f"{self.cache_prefix}{hash_value}"
     
+    @staticmethod
+    def _normalize_prompt(prompt: str) -> str:
+        """
+        Normalize a prompt for keying.
+        
+        Case and runs of whitespace are folded; word order and repeats are
+        kept, so only prompts that say the same thing share a key.
+        """
+        return " ".join(prompt.lower().split())
+    
     async def _find_similar_simple(
         self,
         prompt: str,
@@ -174,8 +188,8 @@ class SemanticCacheManager:
         """
         Find similar cached prompts using simple text similarity.
         
-        This is a simple implementation for Phase 2. Will be enhanced
-        with proper embeddings in future phases.
+        Disabled (see use_simple_similarity): without embeddings there is no
+        similarity measure safe enough to return another prompt's result.
         
         Args:
             prompt: User's prompt
@@ -185,26 +199,7 @@ class SemanticCacheManager:
         Returns:
             Similar cached result or None
         """
-        threshold = threshold or settings.redis_cache_similarity_threshold
-        
-        try:
-            # Get all cache keys
-            pattern = f"{self.cache_prefix}*"
-            similar_results = []
-            
-            # Scan through cache (limited to avoid performance issues)
-            # In production, use a proper vector database
-            cache_keys = []
-            
-            # This is a simplified approach - in production use vector search
-            # For now, we'll skip similarity search and rely on exact matches
-            # to avoid performance issues
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Similarity search error: {e}")
-            return None
+        return None
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """
@@ -231,14 +226,15 @@ class SemanticCacheManager:
         return len(intersection) / len(union)
     
     async def _update_stats(self, stat_type: str) -> None:
-        """Update cache statistics"""
+        """
+        Update cache statistics.
+        
+        Runs on every lookup, so this is a single atomic HINCRBY rather
+        than a GET + JSON decode + SET read-modify-write.
+        """
         try:
             stats_key = f"{self.cache_prefix}{self.stats_key}"
-            stats = await cache_manager.get(stats_key) or {}
-            
-            stats[stat_type] = stats.get(stat_type, 0) + 1
-            
-            await cache_manager.set(stats_key, stats, ttl=86400 * 7)  # 7 days
+            await cache_manager.increment(stats_key, stat_type, ttl=86400 * 7)  # 7 days
             
         except Exception as e:
             logger.error(f"Stats update error: {e}")
@@ -252,7 +248,7 @@ class SemanticCacheManager:
         """
         try:
             stats_key = f"{self.cache_prefix}{self.stats_key}"
-            stats = await cache_manager.get(stats_key) or {}
+            stats = await cache_manager.get_counters(stats_key)
             
             hits = stats.get('hits', 0) + stats.get('similarity_hits', 0)
             misses = stats.get('misses', 0)
@@ -0,0 +1,32 @@
+"""
+Statistics bookkeeping shared by the LLM-backed generators.
+"""
+from typing import Any, Dict
+
+
+class GenerationStatsMixin:
+    """
+    Request counters and the success rates derived from them.
+    
+    The generator's __init__ sets `self.stats` with at least
+    total_requests, successful, heuristic_fallbacks and llama3_successes,
+    plus the three rate fields. _record() keeps the rates current, so
+    get_statistics() is just a copy.
+    """
+    
+    stats: Dict[str, Any]
+    
+    def _record(self, key: str, count: int = 1) -> None:
+        """Bump a counter and refresh the rates derived from it"""
+        stats = self.stats
+        stats[key] += count
+        
+        total = stats['total_requests']
+        if total > 0:
+            stats['success_rate'] = stats['successful'] / total * 100
+            stats['heuristic_fallback_rate'] = stats['heuristic_fallbacks'] / total * 100
+            stats['llama3_success_rate'] = stats['llama3_successes'] / total * 100
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get generation statistics"""
+        return self.stats.copy()
@@ -4,7 +4,8 @@ Uses LLM Orchestrator (Llama3 → Heuristic fallback)
 """
 import json
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from app.config import settings
@@ -16,6 +17,7 @@ from app.models.enhanced_schemas import (
 )
 from app.models.prompts import prompts
 from app.services.generation.layout_validator import layout_validator
+from app.services.generation.generation_stats import GenerationStatsMixin
 from app.llm.orchestrator import LLMOrchestrator
 from app.llm.base import LLMMessage
 from app.utils.logging import get_logger, log_context, trace_async
@@ -32,7 +34,7 @@ class CollisionError(Exception):
     pass
 
 
-class LayoutGenerator:
+class LayoutGenerator(GenerationStatsMixin):
     """
     Phase 3 Layout Generator using LLM Orchestrator.
     
@@ -62,6 +64,12 @@ class LayoutGenerator:
             }
             self.orchestrator = LLMOrchestrator(config)
         
+        # Static instructions, rendered once. Every request sends this exact
+        # text first, so servers with prefix caching reuse its KV state
+        self.system_prompt = prompts.LAYOUT_GENERATE.system.format(
+            components=", ".join(settings.available_components)
+        )
+        
         # Canvas constraints
         self.canvas_width = settings.canvas_width
         self.canvas_height = settings.canvas_height
@@ -91,6 +99,14 @@ class LayoutGenerator:
         self.max_retries = 3
         self.retry_delay = 2
         
+        # Token budgets. A batched reply carries one layout per screen, so
+        # its budget grows with the screen count; batches are split into
+        # chunks so a single reply never outgrows the model's window
+        self.max_tokens = 4096
+        self.batch_tokens_per_screen = 1536
+        self.batch_tokens_overhead = 512
+        self.max_batch_size = 4
+        
         # Statistics
         self.stats = {
             'total_requests': 0,
@@ -98,7 +114,11 @@ class LayoutGenerator:
             'failed': 0,
             'collisions_resolved': 0,
             'heuristic_fallbacks': 0,
-            'llama3_successes': 0
+            'llama3_successes': 0,
+            # Derived rates, kept current by _record() so reads are a copy
+            'success_rate': 0,
+            'heuristic_fallback_rate': 0,
+            'llama3_success_rate': 0
         }
         
         logger.info(
@@ -129,7 +149,7 @@ class LayoutGenerator:
         Raises:
             LayoutGenerationError: If generation fails
         """
-        self.stats['total_requests'] += 1
+        self._record('total_requests')
         
         # Find the screen
         screen = None
@@ -151,134 +171,305 @@ class LayoutGenerator:
             )
             
             # Try LLM first
-            layout = None
-            metadata = {}
-            used_heuristic = False
-            
             try:
                 layout_data, metadata = await self._generate_with_llm(
                     screen=screen,
                     architecture=architecture
                 )
-                
-                # Convert to enhanced components
-                components = await self._convert_to_enhanced_components(
-                    layout_data['components'],
-                    screen_id
-                )
-                
-                self.stats['llama3_successes'] += 1
-                logger.info(
-                    "✅ layout.llm.success",
-                    extra={
-                        "components": len(components),
-                        "provider": metadata.get('provider', 'llama3')
-                    }
+                components = await self._components_from_llm(
+                    layout_data, screen_id, metadata
                 )
+                used_heuristic = False
                 
             except Exception as llm_error:
-                logger.warning(
-                    "⚠️ layout.llm.failed",
-                    extra={"error": str(llm_error)},
-                    exc_info=llm_error
-                )
-                
-                # Fall back to heuristic
-                logger.info("🛡️ layout.fallback.initiating")
-                
-                try:
-                    components = await self._generate_heuristic_layout(screen)
-                    metadata = {
-                        'generation_method': 'heuristic',
-                        'fallback_reason': str(llm_error),
-                        'provider': 'heuristic',
-                        'tokens_used': 0,
-                        'api_duration_ms': 0
-                    }
-                    
-                    used_heuristic = True
-                    self.stats['heuristic_fallbacks'] += 1
-                    
-                    logger.info(
-                        "✅ layout.heuristic.success",
-                        extra={"components": len(components)}
-                    )
-                    
-                except Exception as heuristic_error:
-                    logger.error(
-                        "❌ layout.heuristic.failed",
-                        extra={"error": str(heuristic_error)},
-                        exc_info=heuristic_error
-                    )
-                    
-                    self.stats['failed'] += 1
-                    raise LayoutGenerationError(
-                        f"Both LLM and heuristic generation failed. "
-                        f"LLM: {llm_error}, Heuristic: {heuristic_error}"
-                    )
+                components, metadata = await self._fallback_to_heuristic(screen, llm_error)
+                used_heuristic = True
             
-            # Resolve collisions
-            components = await self._resolve_collisions(components)
+            layout = await self._finalize_layout(
+                screen, components, metadata, used_heuristic
+            )
+            return layout, metadata
+    
+    @trace_async("layout.batch_generation")
+    async def generate_batch(
+        self,
+        architecture: ArchitectureDesign,
+        screen_ids: List[str]
+    ) -> List[Tuple[EnhancedLayoutDefinition, Dict[str, Any]]]:
+        """
+        Generate layouts for several screens with batched LLM calls.
+        
+        Screens are sent in chunks of up to max_batch_size, so the shared
+        instructions go out once per chunk instead of once per screen. A
+        screen whose layout is missing or unusable in its chunk's reply is
+        retried on its own, then falls back to the heuristic generator, as
+        in generate(); screens the batch got right are not re-requested.
+        
+        Args:
+            architecture: Complete architecture design
+            screen_ids: Screens to generate layouts for
+            
+        Returns:
+            List of (EnhancedLayoutDefinition, metadata), in screen_ids order
+            
+        Raises:
+            LayoutGenerationError: If a screen is unknown or both LLM and
+                heuristic generation fail for a screen
+        """
+        screens_by_id = {s.id: s for s in architecture.screens}
+        missing = [sid for sid in screen_ids if sid not in screens_by_id]
+        if missing:
+            raise LayoutGenerationError(f"Screens not found in architecture: {missing}")
+        
+        screens = [screens_by_id[sid] for sid in screen_ids]
+        self._record('total_requests', len(screens))
+        
+        chunks = [
+            screens[start:start + self.max_batch_size]
+            for start in range(0, len(screens), self.max_batch_size)
+        ]
+        
+        with log_context(operation="layout_batch_generation"):
+            logger.info(
+                "📐 layout.batch.started",
+                extra={"screens": len(screens), "chunks": len(chunks)}
+            )
             
-            # Create layout definition
-            layout = EnhancedLayoutDefinition(
-                screen_id=screen_id,
-                canvas=self._get_default_canvas(),
-                components=components,
-                layout_metadata=metadata
+            replies = await asyncio.gather(
+                *(self._generate_batch_with_llm(chunk) for chunk in chunks),
+                return_exceptions=True
             )
             
-            # Validate layout
-            logger.info("🔍 layout.validation.starting")
+            # (components, metadata, used_heuristic) per screen, None where
+            # the batch reply was unusable and the screen needs a retry
+            generated: List[Optional[Tuple[List[EnhancedComponentDefinition], Dict[str, Any], bool]]] = []
+            failed: List[Tuple[int, ScreenDefinition, Exception]] = []
             
-            try:
-                is_valid, warnings = await layout_validator.validate(layout)
-                
-                error_count = sum(1 for w in warnings if w.level == "error")
-                warning_count = sum(1 for w in warnings if w.level == "warning")
-                
-                if not is_valid:
-                    logger.error(
-                        "❌ layout.validation.failed",
-                        extra={
-                            "errors": error_count,
-                            "warnings": warning_count
-                        }
+            for chunk, reply in zip(chunks, replies):
+                if isinstance(reply, Exception):
+                    batch_data, batch_metadata, batch_error = [], {}, reply
+                    logger.warning(
+                        "⚠️ layout.batch.llm_failed",
+                        extra={"error": str(reply), "screens": len(chunk)},
+                        exc_info=reply
                     )
-                    # Don't fail - validation warnings are informational
+                else:
+                    (batch_data, batch_metadata), batch_error = reply, None
                 
+                for offset, screen in enumerate(chunk):
+                    with log_context(screen_id=screen.id):
+                        try:
+                            if offset >= len(batch_data):
+                                raise batch_error or LayoutGenerationError(
+                                    f"Batched reply has no layout for screen {offset + 1}"
+                                )
+                            
+                            metadata = {**batch_metadata, 'screen_id': screen.id, 'screen_name': screen.name}
+                            components = await self._components_from_llm(
+                                batch_data[offset], screen.id, metadata
+                            )
+                            generated.append((components, metadata, False))
+                            
+                        except Exception as batch_screen_error:
+                            failed.append((len(generated), screen, batch_screen_error))
+                            generated.append(None)
+            
+            if failed:
                 logger.info(
-                    "✅ layout.validation.completed",
-                    extra={
-                        "warnings": warning_count,
-                        "used_heuristic": used_heuristic
-                    }
+                    "🔄 layout.batch.retrying_screens",
+                    extra={"screens": len(failed)}
                 )
-                
-            except Exception as validation_error:
-                logger.warning(
-                    "⚠️ layout.validation.error",
-                    extra={"error": str(validation_error)}
+                retried = await asyncio.gather(*(
+                    self._retry_screen(screen, architecture, error)
+                    for _, screen, error in failed
+                ))
+                for (index, _, _), outcome in zip(failed, retried):
+                    generated[index] = outcome
+            
+            results = []
+            
+            for screen, (components, metadata, used_heuristic) in zip(screens, generated):
+                with log_context(screen_id=screen.id):
+                    layout = await self._finalize_layout(
+                        screen, components, metadata, used_heuristic
+                    )
+                    results.append((layout, metadata))
+            
+            return results
+    
+    async def _retry_screen(
+        self,
+        screen: ScreenDefinition,
+        architecture: ArchitectureDesign,
+        batch_error: Exception
+    ) -> Tuple[List[EnhancedComponentDefinition], Dict[str, Any], bool]:
+        """Generate one screen the batch missed: own LLM call, then heuristic"""
+        
+        with log_context(screen_id=screen.id):
+            logger.debug(
+                "layout.batch.screen_retry",
+                extra={"batch_error": str(batch_error)[:200]}
+            )
+            
+            try:
+                layout_data, metadata = await self._generate_with_llm(
+                    screen=screen,
+                    architecture=architecture
+                )
+                components = await self._components_from_llm(
+                    layout_data, screen.id, metadata
                 )
+                return components, metadata, False
+                
+            except Exception as llm_error:
+                components, metadata = await self._fallback_to_heuristic(screen, llm_error)
+                return components, metadata, True
+    
+    async def _components_from_llm(
+        self,
+        layout_data: Dict[str, Any],
+        screen_id: str,
+        metadata: Dict[str, Any]
+    ) -> List[EnhancedComponentDefinition]:
+        """Convert one LLM layout into enhanced components"""
+        
+        components = await self._convert_to_enhanced_components(
+            layout_data['components'],
+            screen_id
+        )
+        
+        self._record('llama3_successes')
+        logger.info(
+            "✅ layout.llm.success",
+            extra={
+                "components": len(components),
+                "provider": metadata.get('provider', 'llama3')
+            }
+        )
+        
+        return components
+    
+    async def _fallback_to_heuristic(
+        self,
+        screen: ScreenDefinition,
+        llm_error: Exception
+    ) -> Tuple[List[EnhancedComponentDefinition], Dict[str, Any]]:
+        """Build components with the heuristic generator after an LLM failure"""
+        
+        logger.warning(
+            "⚠️ layout.llm.failed",
+            extra={"error": str(llm_error)},
+            exc_info=llm_error
+        )
+        
+        # Fall back to heuristic
+        logger.info("🛡️ layout.fallback.initiating")
+        
+        try:
+            components = await self._generate_heuristic_layout(screen)
+            metadata = {
+                'generation_method': 'heuristic',
+                'fallback_reason': str(llm_error),
+                'provider': 'heuristic',
+                'tokens_used': 0,
+                'api_duration_ms': 0
+            }
+            
+            self._record('heuristic_fallbacks')
+            
+            logger.info(
+                "✅ layout.heuristic.success",
+                extra={"components": len(components)}
+            )
+            
+            return components, metadata
+            
+        except Exception as heuristic_error:
+            logger.error(
+                "❌ layout.heuristic.failed",
+                extra={"error": str(heuristic_error)},
+                exc_info=heuristic_error
+            )
+            
+            self._record('failed')
+            raise LayoutGenerationError(
+                f"Both LLM and heuristic generation failed. "
+                f"LLM: {llm_error}, Heuristic: {heuristic_error}"
+            )
+    
+    async def _finalize_layout(
+        self,
+        screen: ScreenDefinition,
+        components: List[EnhancedComponentDefinition],
+        metadata: Dict[str, Any],
+        used_heuristic: bool
+    ) -> EnhancedLayoutDefinition:
+        """Resolve collisions, build and validate the layout, update metadata"""
+        
+        # Resolve collisions
+        components = await self._resolve_collisions(components)
+        
+        # Create layout definition
+        layout = EnhancedLayoutDefinition(
+            screen_id=screen.id,
+            canvas=self._get_default_canvas(),
+            components=components,
+            layout_metadata=metadata
+        )
+        
+        # Validate layout
+        logger.info("🔍 layout.validation.starting")
+        
+        try:
+            is_valid, warnings = await layout_validator.validate(layout)
             
-            # Update metadata
-            metadata.update({
-                'used_heuristic': used_heuristic,
-                'generated_at': datetime.now(timezone.utc).isoformat() + "Z"
-            })
+            # One pass over the warnings for both counts
+            levels = Counter(w.level for w in warnings)
+            error_count = levels["error"]
+            warning_count = levels["warning"]
             
-            self.stats['successful'] += 1
+            if not is_valid:
+                logger.error(
+                    "❌ layout.validation.failed",
+                    extra={
+                        "errors": error_count,
+                        "warnings": warning_count
+                    }
+                )
+                # Don't fail - validation warnings are informational
             
             logger.info(
-                "🎉 layout.generation.completed",
+                "✅ layout.validation.completed",
                 extra={
-                    "screen": screen.name,
-                    "components": len(components),
+                    "warnings": warning_count,
                     "used_heuristic": used_heuristic
                 }
             )
             
-            return layout, metadata
+        except Exception as validation_error:
+            logger.warning(
+                "⚠️ layout.validation.error",
+                extra={"error": str(validation_error)}
+            )
+        
+        # Update metadata
+        metadata.update({
+            'used_heuristic': used_heuristic,
+            'generated_at': datetime.now(timezone.utc).isoformat() + "Z"
+        })
+        
+        self._record('successful')
+        
+        logger.info(
+            "🎉 layout.generation.completed",
+            extra={
+                "screen": screen.name,
+                "components": len(components),
+                "used_heuristic": used_heuristic
+            }
+        )
+        
+        return layout
     
     async def _generate_with_llm(
         self,
@@ -287,41 +478,112 @@ class LayoutGenerator:
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Generate layout using LLM orchestrator with retries"""
         
+        # Format prompt
+        _, user_prompt = prompts.LAYOUT_GENERATE.format(
+            prompt=f"Layout for {screen.name}",
+            screen_architecture=self._screen_architecture(screen),
+            required_components=", ".join(screen.components),
+            primary_action=self._primary_action(screen)
+        )
+        
+        layout_data, metadata = await self._call_llm(user_prompt, screen.name)
+        
+        metadata.update({
+            'screen_id': screen.id,
+            'screen_name': screen.name
+        })
+        
+        return layout_data, metadata
+    
+    async def _generate_batch_with_llm(
+        self,
+        screens: List[ScreenDefinition]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Generate layouts for several screens in one LLM call"""
+        
+        screen_specs = "\n\n".join(
+            f"{index}. **Screen Details:**\n{self._screen_architecture(screen)}\n"
+            f"   **Required Components:** {', '.join(screen.components)}\n"
+            f"   **Primary Action:** {self._primary_action(screen)}"
+            for index, screen in enumerate(screens, start=1)
+        )
+        
+        _, user_prompt = prompts.LAYOUT_GENERATE_BATCH.format(
+            count=len(screens),
+            prompt=f"Layouts for {', '.join(s.name for s in screens)}",
+            screen_specs=screen_specs
+        )
+        
+        # One attempt only: screens the reply gets wrong are retried on
+        # their own by generate_batch() rather than re-sending the batch
+        layouts, metadata = await self._call_llm(
+            user_prompt,
+            f"batch of {len(screens)}",
+            max_tokens=self.batch_tokens_overhead + self.batch_tokens_per_screen * len(screens),
+            attempts=1
+        )
+        
+        if not isinstance(layouts, list):
+            raise LayoutGenerationError("Batched layout reply is not a JSON array")
+        
+        metadata['batch_size'] = len(screens)
+        return layouts, metadata
+    
+    @staticmethod
+    def _screen_architecture(screen: ScreenDefinition) -> str:
+        """Screen description embedded in layout prompts"""
+        return json.dumps({
+            'id': screen.id,
+            'name': screen.name,
+            'purpose': screen.purpose
+        }, indent=2)
+    
+    @staticmethod
+    def _primary_action(screen: ScreenDefinition) -> str:
+        """Main interaction a screen is laid out around"""
+        if any('Button' in comp for comp in screen.components):
+            return "button interaction"
+        if any('Input' in comp for comp in screen.components):
+            return "text input"
+        return "view content"
+    
+    async def _call_llm(
+        self,
+        user_prompt: str,
+        label: str,
+        max_tokens: Optional[int] = None,
+        attempts: Optional[int] = None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Send a layout prompt with retries and parse the JSON reply.
+        
+        Args:
+            user_prompt: Request-specific prompt, sent after the static system prompt
+            label: What is being laid out, for logs
+            max_tokens: Reply budget (defaults to self.max_tokens)
+            attempts: Number of tries (defaults to self.max_retries)
+            
+        Returns:
+            Tuple of (parsed JSON, call metadata)
+        """
+        
         last_error = None
+        max_tokens = max_tokens or self.max_tokens
+        attempts = attempts or self.max_retries
         
-        for attempt in range(1, self.max_retries + 1):
+        for attempt in range(1, attempts + 1):
             try:
                 logger.debug(
                     f"🔄 layout.llm.attempt",
                     extra={
                         "attempt": attempt,
-                        "screen": screen.name
+                        "screen": label
                     }
                 )
                 
-                # Determine primary action
-                primary_action = "view content"
-                if any('Button' in comp for comp in screen.components):
-                    primary_action = "button interaction"
-                elif any('Input' in comp for comp in screen.components):
-                    primary_action = "text input"
-                
-                # Format prompt
-                system_prompt, user_prompt = prompts.LAYOUT_GENERATE.format(
-                    components=", ".join(settings.available_components),
-                    prompt=f"Layout for {screen.name}",
-                    screen_architecture=json.dumps({
-                        'id': screen.id,
-                        'name': screen.name,
-                        'purpose': screen.purpose
-                    }, indent=2),
-                    required_components=", ".join(screen.components),
-                    primary_action=primary_action
-                )
-                
                 # Create messages
                 messages = [
-                    LLMMessage(role="system", content=system_prompt),
+                    LLMMessage(role="system", content=self.system_prompt),
                     LLMMessage(role="user", content=user_prompt)
                 ]
                 
@@ -331,7 +593,7 @@ class LayoutGenerator:
                 response = await self.orchestrator.generate(
                     messages=messages,
                     temperature=0.7,
-                    max_tokens=4096
+                    max_tokens=max_tokens
                 )
                 
                 api_duration = int((asyncio.get_event_loop().time() - start_time) * 1000)
@@ -354,8 +616,7 @@ class LayoutGenerator:
                     'provider': response.provider.value,
                     'tokens_used': response.tokens_used,
                     'api_duration_ms': api_duration,
-                    'screen_id': screen.id,
-                    'screen_name': screen.name
+                    'cached_prompt_tokens': (response.metadata or {}).get('cached_tokens')
                 }
                 
                 return layout_data, metadata
@@ -368,11 +629,11 @@ class LayoutGenerator:
                     extra={
                         "attempt": attempt,
                         "error": str(e)[:200],
-                        "will_retry": attempt < self.max_retries
+                        "will_retry": attempt < attempts
                     }
                 )
                 
-                if attempt < self.max_retries:
+                if attempt < attempts:
                     delay = self.retry_delay * (2 ** (attempt - 1))
                     await asyncio.sleep(delay)
                 else:
@@ -554,30 +815,16 @@ class LayoutGenerator:
         logger.debug("Checking for collisions...")
         
         # Check for collisions
-        has_collisions = False
-        for i, comp1 in enumerate(components):
-            bounds1 = self._get_component_bounds(comp1)
-            if not bounds1:
-                continue
-            
-            for comp2 in components[i+1:]:
-                bounds2 = self._get_component_bounds(comp2)
-                if not bounds2:
-                    continue
-                
-                if self._rectangles_overlap(bounds1, bounds2):
-                    has_collisions = True
-                    break
-            
-            if has_collisions:
-                break
+        has_collisions = self._any_overlap(
+            bounds for bounds in map(self._get_component_bounds, components) if bounds
+        )
         
         if not has_collisions:
             logger.debug("No collisions detected")
             return components
         
         logger.info(f"⚠️ Collisions detected, resolving...")
-        self.stats['collisions_resolved'] += 1
+        self._record('collisions_resolved')
         
         # Simple vertical stack layout
         current_y = self.safe_area_top + 20
@@ -625,6 +872,27 @@ class LayoutGenerator:
         
         return (left, top, left + width, top + height)
     
+    def _any_overlap(self, rects: Iterable[Tuple[int, int, int, int]]) -> bool:
+        """
+        Check whether any two rectangles overlap.
+        
+        Sort-and-sweep on x: each rectangle is only compared with those
+        whose right edge is still past its left edge, instead of every pair.
+        """
+        active: List[Tuple[int, int, int, int]] = []
+        
+        for rect in sorted(rects):
+            # Drop rectangles that end at or before this one starts
+            active = [other for other in active if other[2] > rect[0]]
+            
+            for other in active:
+                if self._rectangles_overlap(rect, other):
+                    return True
+            
+            active.append(rect)
+        
+        return False
+    
     def _rectangles_overlap(
         self,
         rect1: Tuple[int, int, int, int],
@@ -654,18 +922,6 @@ class LayoutGenerator:
                 "right": 0
             }
         }
-    
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get generation statistics"""
-        total = self.stats['total_requests']
-        
-        return {
-            **self.stats,
-            'success_rate': (self.stats['successful'] / total * 100) if total > 0 else 0,
-            'heuristic_fallback_rate': (self.stats['heuristic_fallbacks'] / total * 100) if total > 0 else 0,
-            'llama3_success_rate': (self.stats['llama3_successes'] / total * 100) if total > 0 else 0,
-            'collisions_resolved': self.stats['collisions_resolved']
-        }
 
 
 # Global layout generator instance
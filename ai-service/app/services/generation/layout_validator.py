@@ -8,6 +8,7 @@ Validates generated layouts for:
 - Visual hierarchy
 - Accessibility compliance
 """
+from enum import Enum
 from typing import List, Tuple, Dict, Any, Optional
 from loguru import logger
 
@@ -18,21 +19,45 @@ from app.models.enhanced_schemas import (
 )
 
 
+class WarningCode(str, Enum):
+    """Category of a layout warning, for filtering without parsing messages"""
+    CANVAS_SIZE = "canvas_size"
+    SAFE_AREA = "safe_area"
+    INVALID_STYLE = "invalid_style"
+    OUT_OF_BOUNDS = "out_of_bounds"
+    TOUCH_TARGET = "touch_target"
+    BUTTON_WIDTH = "button_width"
+    OVERLAP = "overlap"
+    TIGHT_SPACING = "tight_spacing"
+    UNIFORM_BUTTONS = "uniform_buttons"
+    LOW_CONTRAST = "low_contrast"
+    MISSING_LABEL = "missing_label"
+
+
 class LayoutWarning:
     """Represents a layout validation warning"""
     
-    def __init__(self, level: str, component: str, message: str, suggestion: str = ""):
+    def __init__(
+        self,
+        level: str,
+        component: str,
+        message: str,
+        suggestion: str = "",
+        code: Optional[WarningCode] = None
+    ):
         self.level = level  # "info", "warning", "error"
         self.component = component
         self.message = message
         self.suggestion = suggestion
+        self.code = code
     
-    def to_dict(self) -> Dict[str, str]:
+    def to_dict(self) -> Dict[str, Any]:
         return {
             'level': self.level,
             'component': self.component,
             'message': self.message,
-            'suggestion': self.suggestion
+            'suggestion': self.suggestion,
+            'code': self.code.value if self.code else None
         }
     
     def __str__(self) -> str:
@@ -115,7 +140,8 @@ class LayoutValidator:
                 level="warning",
                 component="canvas",
                 message=f"Canvas width {canvas['width']} != standard {self.canvas_width}",
-                suggestion=f"Use standard width of {self.canvas_width}px"
+                suggestion=f"Use standard width of {self.canvas_width}px",
+                code=WarningCode.CANVAS_SIZE
             ))
         
         if canvas['height'] != self.canvas_height:
@@ -123,7 +149,8 @@ class LayoutValidator:
                 level="warning",
                 component="canvas",
                 message=f"Canvas height {canvas['height']} != standard {self.canvas_height}",
-                suggestion=f"Use standard height of {self.canvas_height}px"
+                suggestion=f"Use standard height of {self.canvas_height}px",
+                code=WarningCode.CANVAS_SIZE
             ))
         
         # Check safe area insets
@@ -133,7 +160,8 @@ class LayoutValidator:
                 level="info",
                 component="canvas",
                 message="Small top safe area",
-                suggestion="Consider increasing for status bar clearance"
+                suggestion="Consider increasing for status bar clearance",
+                code=WarningCode.SAFE_AREA
             ))
     
     async def _validate_component_bounds(
@@ -149,7 +177,8 @@ class LayoutValidator:
                     level="error",
                     component=component.component_id,
                     message="Missing or invalid style property",
-                    suggestion="Add valid style with position and size"
+                    suggestion="Add valid style with position and size",
+                    code=WarningCode.INVALID_STYLE
                 ))
                 continue
             
@@ -161,7 +190,8 @@ class LayoutValidator:
                     level="error",
                     component=component.component_id,
                     message=f"Component extends beyond left edge (x={left})",
-                    suggestion="Move component right to x >= 0"
+                    suggestion="Move component right to x >= 0",
+                    code=WarningCode.OUT_OF_BOUNDS
                 ))
             
             # Check top bound
@@ -170,7 +200,8 @@ class LayoutValidator:
                     level="error",
                     component=component.component_id,
                     message=f"Component extends beyond top edge (y={top})",
-                    suggestion="Move component down to y >= 0"
+                    suggestion="Move component down to y >= 0",
+                    code=WarningCode.OUT_OF_BOUNDS
                 ))
             
             # Check right bound
@@ -179,7 +210,8 @@ class LayoutValidator:
                     level="error",
                     component=component.component_id,
                     message=f"Component extends beyond right edge ({right} > {self.canvas_width})",
-                    suggestion=f"Reduce width or move left"
+                    suggestion=f"Reduce width or move left",
+                    code=WarningCode.OUT_OF_BOUNDS
                 ))
             
             # Check bottom bound
@@ -188,7 +220,8 @@ class LayoutValidator:
                     level="warning",
                     component=component.component_id,
                     message=f"Component extends beyond bottom edge ({bottom} > {self.canvas_height})",
-                    suggestion="Consider scrollable container or reduce size"
+                    suggestion="Consider scrollable container or reduce size",
+                    code=WarningCode.OUT_OF_BOUNDS
                 ))
             
             # Check safe area violations
@@ -200,7 +233,8 @@ class LayoutValidator:
                     level="warning",
                     component=component.component_id,
                     message=f"Component in safe area (top={top}, safe={safe_top})",
-                    suggestion="Move component below safe area"
+                    suggestion="Move component below safe area",
+                    code=WarningCode.SAFE_AREA
                 ))
     
     async def _validate_touch_targets(
@@ -229,7 +263,8 @@ class LayoutValidator:
                     level="error",
                     component=component.component_id,
                     message=f"Touch target too small: {height}px < {self.min_touch_size}px",
-                    suggestion=f"Increase height to at least {self.min_touch_size}px"
+                    suggestion=f"Increase height to at least {self.min_touch_size}px",
+                    code=WarningCode.TOUCH_TARGET
                 ))
             
             # Check minimum width for buttons
@@ -238,7 +273,8 @@ class LayoutValidator:
                     level="warning",
                     component=component.component_id,
                     message=f"Button width small: {width}px",
-                    suggestion=f"Consider increasing to at least {self.min_touch_size}px"
+                    suggestion=f"Consider increasing to at least {self.min_touch_size}px",
+                    code=WarningCode.BUTTON_WIDTH
                 ))
     
     async def _validate_collisions(
@@ -264,7 +300,8 @@ class LayoutValidator:
                         level="error",
                         component=f"{comp1.component_id}+{comp2.component_id}",
                         message="Components overlap",
-                        suggestion="Reposition components to avoid collision"
+                        suggestion="Reposition components to avoid collision",
+                        code=WarningCode.OVERLAP
                     ))
     
     async def _validate_spacing(
@@ -295,7 +332,8 @@ class LayoutValidator:
                         level="info",
                         component=f"{comp1.component_id}+{comp2.component_id}",
                         message=f"Tight spacing: {distance}px",
-                        suggestion=f"Consider {min_spacing}px minimum spacing"
+                        suggestion=f"Consider {min_spacing}px minimum spacing",
+                        code=WarningCode.TIGHT_SPACING
                     ))
     
     def _get_component_distance(
@@ -354,7 +392,8 @@ class LayoutValidator:
                     level="info",
                     component="buttons",
                     message="All buttons same size",
-                    suggestion="Consider varying sizes for visual hierarchy"
+                    suggestion="Consider varying sizes for visual hierarchy",
+                    code=WarningCode.UNIFORM_BUTTONS
                 ))
     
     async def _validate_accessibility(
@@ -382,7 +421,8 @@ class LayoutValidator:
                             level="warning",
                             component=text_comp.component_id,
                             message="Text color same as background",
-                            suggestion="Ensure sufficient contrast for readability"
+                            suggestion="Ensure sufficient contrast for readability",
+                            code=WarningCode.LOW_CONTRAST
                         ))
         
         # Check label associations for inputs
@@ -413,7 +453,8 @@ class LayoutValidator:
                         level="info",
                         component=input_comp.component_id,
                         message="Input may be missing label",
-                        suggestion="Add Text component above input as label"
+                        suggestion="Add Text component above input as label",
+                        code=WarningCode.MISSING_LABEL
                     ))
     
     def _get_component_bounds(
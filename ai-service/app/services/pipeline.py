@@ -74,7 +74,8 @@ class Pipeline:
                 message=message
             )
             
-            await queue_manager.publish_response(update.dict())
+            # Progress is best-effort; its confirm is not worth waiting on
+            queue_manager.publish_response_nowait(update.dict())
             logger.debug(f"📊 Progress [{task_id}]: {stage} - {progress}% - {message}")
             
         except Exception as e:
@@ -400,6 +401,8 @@ class ArchitectureGenerationStage(PipelineStage):
             
             # Store results
             context['architecture'] = architecture.dict()
+            # Parsed model for later stages, so they need not rebuild it
+            context['architecture_design'] = architecture
             context['architecture_metadata'] = metadata
             context['architecture_warnings'] = [w.to_dict() for w in warnings]
             
@@ -444,9 +447,11 @@ class LayoutGenerationStage(PipelineStage):
             if not architecture:
                 raise ValueError("No architecture found in context")
             
-            # Parse architecture
-            from app.models.schemas import ArchitectureDesign
-            arch_design = ArchitectureDesign(**architecture)
+            # Parse architecture, unless the previous stage left the model
+            arch_design = context.get('architecture_design')
+            if arch_design is None:
+                from app.models.schemas import ArchitectureDesign
+                arch_design = ArchitectureDesign(**architecture)
             
             #Null safety check
             if arch_design is None:
@@ -457,17 +462,26 @@ class LayoutGenerationStage(PipelineStage):
             
             # Generate layout for each screen
             layouts = {}
+            layout_models = {}
             all_warnings = []
             
-            for screen in arch_design.screens:
-                logger.info(f"Generating layout for screen: {screen.name}")
-                
-                # Generate layout
-                layout, metadata = await layout_generator.generate(
+            # One LLM call covers every screen; a single screen keeps the
+            # per-screen prompt
+            if len(arch_design.screens) > 1:
+                generated = await layout_generator.generate_batch(
                     architecture=arch_design,
-                    screen_id=screen.id
+                    screen_ids=[screen.id for screen in arch_design.screens]
                 )
-                
+            else:
+                generated = [
+                    await layout_generator.generate(
+                        architecture=arch_design,
+                        screen_id=screen.id
+                    )
+                    for screen in arch_design.screens
+                ]
+            
+            for screen, (layout, metadata) in zip(arch_design.screens, generated):
                 # Validate layout
                 is_valid, warnings = await layout_validator.validate(layout)
                 
@@ -477,6 +491,7 @@ class LayoutGenerationStage(PipelineStage):
                 
                 # Store layout
                 layouts[screen.id] = layout.dict()
+                layout_models[screen.id] = layout
                 
                 # Collect warnings
                 all_warnings.extend([
@@ -491,6 +506,7 @@ class LayoutGenerationStage(PipelineStage):
             
             # Store results
             context['layout'] = layouts if len(layouts) > 1 else list(layouts.values())[0]
+            context['layout_definitions'] = layout_models
             context['layout_warnings'] = all_warnings
             
             logger.info(f"✅ Generated layouts for {len(layouts)} screen(s)")
@@ -528,22 +544,26 @@ class BlocklyGenerationStage(PipelineStage):
             if not architecture or not layout:
                 raise ValueError("No architecture or layout found in context")
             
-            # Parse architecture
-            from app.models.schemas import ArchitectureDesign
-            arch_design = ArchitectureDesign(**architecture)
-            
-            # Parse layouts
-            from app.models.enhanced_schemas import EnhancedLayoutDefinition
+            # Parse architecture, unless an earlier stage left the model
+            arch_design = context.get('architecture_design')
+            if arch_design is None:
+                from app.models.schemas import ArchitectureDesign
+                arch_design = ArchitectureDesign(**architecture)
             
-            layouts = {}
-            if isinstance(layout, dict):
-                if 'components' in layout:
-                    # Single screen layout
-                    layouts[layout['screen_id']] = EnhancedLayoutDefinition(**layout)
-                else:
-                    # Multiple screens
-                    for screen_id, screen_layout in layout.items():
-                        layouts[screen_id] = EnhancedLayoutDefinition(**screen_layout)
+            # Parse layouts, likewise
+            layouts = context.get('layout_definitions')
+            if layouts is None:
+                from app.models.enhanced_schemas import EnhancedLayoutDefinition
+                
+                layouts = {}
+                if isinstance(layout, dict):
+                    if 'components' in layout:
+                        # Single screen layout
+                        layouts[layout['screen_id']] = EnhancedLayoutDefinition(**layout)
+                    else:
+                        # Multiple screens
+                        for screen_id, screen_layout in layout.items():
+                            layouts[screen_id] = EnhancedLayoutDefinition(**screen_layout)
             
             # Generate Blockly
             blockly, metadata = await blockly_generator.generate(
@@ -551,20 +571,27 @@ class BlocklyGenerationStage(PipelineStage):
                 layouts=layouts
             )
             
-            # Validate Blockly
-            is_valid, warnings = await blockly_validator.validate(blockly)
+            # Reuse the generator's validation; only validate if it was skipped
+            validation = metadata.get('validation')
+            if validation is None:
+                is_valid, warnings = await blockly_validator.validate(blockly)
+                validation = {
+                    'is_valid': is_valid,
+                    'warnings': [w.to_dict() for w in warnings]
+                }
+            warnings = validation['warnings']
             
-            if not is_valid:
-                error_warnings = [w for w in warnings if w.level == "error"]
+            if not validation['is_valid']:
+                error_warnings = [w for w in warnings if w['level'] == "error"]
                 raise ValueError(f"Invalid Blockly: {len(error_warnings)} error(s)")
             
             # Store results
             context['blockly'] = blockly
             context['blockly_metadata'] = metadata
-            context['blockly_warnings'] = [w.to_dict() for w in warnings]
+            context['blockly_warnings'] = warnings
             
             # Log warnings
-            warning_count = sum(1 for w in warnings if w.level == "warning")
+            warning_count = sum(1 for w in warnings if w['level'] == "warning")
             if warning_count > 0:
                 logger.warning(f"Blockly has {warning_count} warning(s)")
             
@@ -625,51 +652,57 @@ class PersistenceStage(PipelineStage):
         """Save conversation and results"""
         logger.info("💾 Persisting data...")
         
-        # Save conversation
-        try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": context['prompt'],
-                    "timestamp": context['start_time']
-                },
-                {
-                    "role": "assistant",
-                    "content": "Generated architecture, layout, and blockly",
-                    "timestamp": time.time(),
-                    "metadata": {
-                        "cache_hit": context.get('cache_hit', False),
-                        "intent": context.get('intent', {}).dict() if hasattr(context.get('intent'), 'dict') else {}
+        async def save_conversation():
+            try:
+                messages = [
+                    {
+                        "role": "user",
+                        "content": context['prompt'],
+                        "timestamp": context['start_time']
+                    },
+                    {
+                        "role": "assistant",
+                        "content": "Generated architecture, layout, and blockly",
+                        "timestamp": time.time(),
+                        "metadata": {
+                            "cache_hit": context.get('cache_hit', False),
+                            "intent": context.get('intent', {}).dict() if hasattr(context.get('intent'), 'dict') else {}
+                        }
                     }
-                }
-            ]
-            
-            conversation_id = await db_manager.save_conversation(
-                user_id=context['user_id'],
-                session_id=context['session_id'],
-                messages=messages
-            )
-            
-            context['conversation_id'] = conversation_id
-            logger.info(f"✅ Conversation saved: {conversation_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save conversation: {e}")
-            # Non-critical, continue
-        
-        # Save metrics
-        try:
-            for stage_name, duration in context['stage_times'].items():
-                await db_manager.save_request_metric(
-                    task_id=context['task_id'],
+                ]
+                
+                conversation_id = await db_manager.save_conversation(
                     user_id=context['user_id'],
-                    stage=stage_name,
-                    duration_ms=duration,
-                    success=True,
-                    error_message=None
+                    session_id=context['session_id'],
+                    messages=messages
                 )
-        except Exception as e:
-            logger.error(f"Failed to save metrics: {e}")
+                
+                context['conversation_id'] = conversation_id
+                logger.info(f"✅ Conversation saved: {conversation_id}")
+                
+            except Exception as e:
+                logger.error(f"Failed to save conversation: {e}")
+                # Non-critical, continue
+        
+        async def save_metrics():
+            # One row per stage, written in a single COPY on one connection
+            try:
+                await db_manager.bulk_import_metrics([
+                    {
+                        'task_id': context['task_id'],
+                        'user_id': context['user_id'],
+                        'stage': stage_name,
+                        'duration_ms': duration,
+                        'success': True
+                    }
+                    for stage_name, duration in context['stage_times'].items()
+                ])
+            except Exception as e:
+                logger.error(f"Failed to save metrics: {e}")
+        
+        # The conversation and the metrics go to separate tables, so the
+        # two writes overlap on two pool connections
+        await asyncio.gather(save_conversation(), save_metrics())
         
         return context
 
@@ -11,6 +11,28 @@ from app.core.cache import cache_manager
 from app.config import settings
 
 
+# Fixed-window check in one round-trip. A request under the limit bumps the
+# counter; one at or over it is rejected without counting, so the stored
+# count never exceeds the limit. The limit checked against is recorded, and
+# the window starts on the first hit (or if the TTL was ever lost).
+# Returns {allowed, count, ttl_seconds}.
+RATE_LIMIT_SCRIPT = """
+local count = tonumber(redis.call('HGET', KEYS[1], 'count') or '0')
+local allowed = 0
+if count < tonumber(ARGV[2]) then
+    count = redis.call('HINCRBY', KEYS[1], 'count', 1)
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'limit', ARGV[2])
+local ttl = redis.call('TTL', KEYS[1])
+if ttl < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    ttl = tonumber(ARGV[1])
+end
+return {allowed, count, ttl}
+"""
+
+
 class RateLimiter:
     """
     Fixed window rate limiter using Redis.
@@ -19,11 +41,17 @@ class RateLimiter:
     - Per-user rate limiting
     - Configurable limits
     - Distributed across instances
-    - Automatic token refill
+    - Counter resets when the window expires
+    
+    Each window is a small Redis hash ({count, limit}) checked and bumped
+    by a Lua script, so each check is one atomic round-trip and concurrent
+    checks (from parallel pipelines or other instances) never lose an
+    update. Rejected requests are not counted. The key's TTL is the
+    window, and the stored limit is the one the last check ran against.
     """
     
     def __init__(self):
-        self.prefix = "rate_limit:"
+        self.prefix = "rate_limit:window:"
         self.window_seconds = 3600  # 1 hour window TODO: Make configurable if needed
     
     async def check_rate_limit(
@@ -51,70 +79,38 @@ class RateLimiter:
         try:
             key = f"{self.prefix}{user_id}"
             
-            # Get current count
-            current_data = await cache_manager.get(key)
+            # Atomic check-and-increment + window TTL in a single EVALSHA
+            allowed, count, ttl = await cache_manager.run_script(
+                RATE_LIMIT_SCRIPT,
+                keys=[key],
+                args=[self.window_seconds, limit]
+            )
+            count, ttl = int(count), int(ttl)
             
-            if current_data is None:
-                # First request - initialize
-                data = {
-                    'count': 1,
-                    'reset_at': int(time.time()) + self.window_seconds,
-                    'limit': limit
-                }
-                await cache_manager.set(key, data, ttl=self.window_seconds)
-                
+            if count == 1:
                 logger.debug(f"Rate limit initialized for {user_id}: 1/{limit}")
-                
-                return True, {
-                    'limited': False,
-                    'remaining': limit - 1,
-                    'limit': limit,
-                    'reset_at': data['reset_at']
-                }
             
-            # Check if window has expired
-            current_time = int(time.time())
-            if current_time >= current_data['reset_at']:
-                # Window expired - reset
-                data = {
-                    'count': 1,
-                    'reset_at': current_time + self.window_seconds,
-                    'limit': limit
-                }
-                await cache_manager.set(key, data, ttl=self.window_seconds)
-                
-                logger.debug(f"Rate limit window reset for {user_id}")
-                
-                return True, {
-                    'limited': False,
-                    'remaining': limit - 1,
-                    'limit': limit,
-                    'reset_at': data['reset_at']
-                }
+            reset_at = int(time.time()) + ttl
             
             # Check if limit exceeded
-            if current_data['count'] >= limit:
-                logger.warning(f"Rate limit exceeded for {user_id}: {current_data['count']}/{limit}")
+            if not int(allowed):
+                logger.warning(f"Rate limit exceeded for {user_id}: {count}/{limit}")
                 
                 return False, {
                     'limited': True,
                     'remaining': 0,
                     'limit': limit,
-                    'reset_at': current_data['reset_at'],
-                    'retry_after': current_data['reset_at'] - current_time
+                    'reset_at': reset_at,
+                    'retry_after': ttl
                 }
             
-            # Increment count
-            current_data['count'] += 1
-            await cache_manager.set(key, current_data, ttl=self.window_seconds)
-            
-            logger.debug(f"Rate limit check for {user_id}: {current_data['count']}/{limit}")
+            logger.debug(f"Rate limit check for {user_id}: {count}/{limit}")
             
             return True, {
                 'limited': False,
-                'remaining': limit - current_data['count'],
+                'remaining': limit - count,
                 'limit': limit,
-                'reset_at': current_data['reset_at']
+                'reset_at': reset_at
             }
             
         except Exception as e:
@@ -122,33 +118,43 @@ class RateLimiter:
             # Fail open - allow request if rate limiter fails
             return True, {'limited': False, 'error': str(e)}
     
-    async def get_rate_limit_info(self, user_id: str) -> Dict[str, Any]:
+    async def get_rate_limit_info(
+        self,
+        user_id: str,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Get current rate limit information for user.
         
         Args:
             user_id: User identifier
+            limit: Optional limit to report against; defaults to the limit
+                stored with the current window, then to settings
             
         Returns:
             Rate limit info dictionary
         """
         try:
             key = f"{self.prefix}{user_id}"
-            data = await cache_manager.get(key)
+            window = await cache_manager.get_counters(key)
+            limit = limit or window.get('limit') or settings.rate_limit_requests_per_hour
+            count = window.get('count')
             
-            if data is None:
+            if count is None:
                 return {
                     'count': 0,
-                    'remaining': settings.rate_limit_requests_per_hour,
-                    'limit': settings.rate_limit_requests_per_hour,
+                    'remaining': limit,
+                    'limit': limit,
                     'reset_at': int(time.time()) + self.window_seconds
                 }
             
+            ttl = await cache_manager.ttl(key)
+            
             return {
-                'count': data['count'],
-                'remaining': data['limit'] - data['count'],
-                'limit': data['limit'],
-                'reset_at': data['reset_at']
+                'count': count,
+                'remaining': max(limit - count, 0),
+                'limit': limit,
+                'reset_at': int(time.time()) + max(ttl, 0)
             }
             
         except Exception as e:
@@ -0,0 +1,256 @@
+"""
+Shared infrastructure fixture for the phase test scripts.
+
+Connecting to Redis, PostgreSQL and RabbitMQ is the slowest part of a
+suite's start-up. `infrastructure()` opens them once per process: nested
+uses (e.g. a driver running several phase suites back to back) reuse the
+outer connections, and only the outermost exit disconnects.
+
+`PhaseTestRunner` is the pass/fail bookkeeping and buffered output the
+phase scripts' runners share.
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.cache import cache_manager
+from app.core.database import db_manager
+from app.core.messaging import queue_manager
+from app.llm.llama3_provider import close_shared_client
+
+
+# Seconds to wait for each service to close before giving up on it
+DISCONNECT_TIMEOUT = 2.0
+
+_depth = 0
+
+# Output of a suite running under run_concurrently(); None prints directly
+_suite_output: ContextVar[Optional[List[str]]] = ContextVar("suite_output", default=None)
+
+
+@asynccontextmanager
+async def infrastructure():
+    """
+    Session-scoped infrastructure connections.
+    
+    Usage:
+        async with infrastructure():
+            await run_suites()
+    """
+    global _depth
+    
+    if _depth == 0:
+        await _connect_all()
+    
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        if _depth == 0:
+            await _disconnect_all()
+
+
+async def _connect_all():
+    """
+    Connect every service concurrently.
+    
+    Every failed connect is logged, so one run reports each service that
+    is down; whatever did connect is released before the first error is
+    re-raised.
+    """
+    services = {"redis": cache_manager, "postgres": db_manager, "rabbitmq": queue_manager}
+    
+    results = await asyncio.gather(
+        *(manager.connect() for manager in services.values()),
+        return_exceptions=True
+    )
+    errors = []
+    for name, result in zip(services, results):
+        if isinstance(result, Exception):
+            logger.error(f"Infrastructure connect failed: {name}: {result!r}")
+            errors.append(result)
+    
+    if errors:
+        await _disconnect_all()
+        raise errors[0]
+
+
+async def _disconnect_all():
+    """
+    Disconnect every service concurrently.
+    
+    One failing close doesn't skip the others, and each close is bounded
+    by DISCONNECT_TIMEOUT so a stuck backend can't hang teardown.
+    """
+    closers = {
+        "redis": cache_manager.disconnect,
+        "postgres": db_manager.disconnect,
+        "rabbitmq": queue_manager.disconnect,
+        "llama3 http client": close_shared_client,
+    }
+    
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(close(), DISCONNECT_TIMEOUT)
+            for close in closers.values()
+        ),
+        return_exceptions=True
+    )
+    for name, result in zip(closers, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning(f"Infrastructure disconnect timed out: {name}")
+        elif isinstance(result, Exception):
+            logger.warning(f"Infrastructure disconnect failed: {name}: {result!r}")
+
+
+class PhaseTestRunner:
+    """
+    Pass/fail bookkeeping and buffered output for the phase test scripts.
+    
+    Output is collected and written once per suite; suites run under
+    run_concurrently() each get their own buffer so reports never
+    interleave.
+    """
+    
+    def __init__(self):
+        self.tests_passed = 0
+        self.tests_failed = 0
+        self.test_results = []
+        # Output is collected here and written once per suite
+        self._buf: List[str] = []
+    
+    def log(self, text: str = "", end: str = "\n", flush: bool = False):
+        """
+        Buffer output.
+        
+        Suites running under run_concurrently() write to their own buffer;
+        otherwise output goes to the runner's buffer, written on flush.
+        """
+        buffer = _suite_output.get()
+        if buffer is None:
+            self._buf.append(text + end)
+            if flush:
+                self.flush()
+        else:
+            buffer.append(text + end)
+    
+    def flush(self):
+        """Write buffered output in a single call"""
+        if self._buf:
+            sys.stdout.write("".join(self._buf))
+            self._buf.clear()
+        sys.stdout.flush()
+    
+    async def run_concurrently(self, *suites: Callable[[], Awaitable[Any]]) -> List[Any]:
+        """
+        Run independent test suites concurrently.
+        
+        Each suite's output is captured separately and printed in argument
+        order once all of them finish, so reports never interleave.
+        
+        Args:
+            suites: Suite coroutine functions taking no arguments
+            
+        Returns:
+            Suite return values, in argument order
+        """
+        buffers: List[List[str]] = [[] for _ in suites]
+        
+        async def capture(suite, buffer):
+            # gather() runs each coroutine in its own task, so this
+            # binding is private to the suite
+            _suite_output.set(buffer)
+            return await suite()
+        
+        results = await asyncio.gather(
+            *(capture(suite, buffer) for suite, buffer in zip(suites, buffers)),
+            return_exceptions=True
+        )
+        
+        for buffer in buffers:
+            self._buf.extend(buffer)
+        self.flush()
+        
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+    
+    def print_header(self, title: str):
+        """Print test section header"""
+        self.log("\n" + "=" * 60)
+        self.log(f"  {title}")
+        # Suite boundary: earlier results go out in one write, and the
+        # header shows while this suite runs
+        self.log("=" * 60 + "\n", flush=True)
+    
+    def print_test(self, name: str):
+        """Print test name"""
+        self.log(f"[TEST] {name}...", end=" ")
+    
+    def pass_test(self, name: str, duration_ms: int = 0):
+        """Mark test as passed"""
+        self.tests_passed += 1
+        self.test_results.append(("PASS", name, duration_ms))
+        if duration_ms > 0:
+            self.log(f"✅ PASS ({duration_ms}ms)")
+        else:
+            self.log("✅ PASS")
+    
+    def fail_test(self, name: str, error: str):
+        """Mark test as failed"""
+        self.tests_failed += 1
+        self.test_results.append(("FAIL", name, error))
+        self.log(f"❌ FAIL")
+        self.log(f"   Error: {error}")
+    
+    def print_summary(self):
+        """Print test summary"""
+        total = self.tests_passed + self.tests_failed
+        
+        self.log("\n" + "=" * 60)
+        self.log("  TEST SUMMARY")
+        self.log("=" * 60)
+        
+        if total == 0:
+            # Crashed before any test ran; nothing to report a rate for
+            self.log("\nNo tests executed")
+            self.log("=" * 60 + "\n")
+            self.flush()
+            return 1
+        
+        pass_rate = self.tests_passed * 100.0 / total
+        fail_rate = 100.0 - pass_rate
+        
+        self.log(f"\nTotal Tests: {total}")
+        self.log(f"Passed: {self.tests_passed} ({pass_rate:.1f}%)")
+        self.log(f"Failed: {self.tests_failed} ({fail_rate:.1f}%)")
+        
+        if self.tests_failed > 0:
+            self.log("\n❌ Failed Tests:")
+            self.log("\n".join(
+                f"   - {name}: {error}"
+                for status, name, error in self.test_results
+                if status == "FAIL"
+            ))
+        
+        self.log("\n" + "=" * 60)
+        
+        if self.tests_failed == 0:
+            self.log("✅ ALL TESTS PASSED!")
+            self.log("=" * 60 + "\n")
+            self.flush()
+            return 0
+        else:
+            self.log(f"❌ {self.tests_failed} TEST(S) FAILED")
+            self.log("=" * 60 + "\n")
+            self.flush()
+            return 1
@@ -13,6 +13,7 @@ import sys
 sys.path.insert(0, '..')
 
 from app.config import settings
+from app.core.database import db_manager
 
 
 async def create_tables(conn: asyncpg.Connection) -> None:
@@ -23,10 +24,35 @@ async def create_tables(conn: asyncpg.Connection) -> None:
     # Enable UUID extension
     await conn.execute("CREATE EXTENSION IF NOT EXISTS \"uuid-ossp\";")
     
+    # Time-ordered UUIDv7: 48-bit millisecond timestamp prefix over a random
+    # v4, with the version nibble flipped to 7. Sequential keys append to the
+    # rightmost B-tree leaf instead of splitting random pages.
+    await conn.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            placing substring(
+                                int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint)
+                                FROM 3
+                            )
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid;
+        $$ LANGUAGE sql VOLATILE;
+    """)
+    
     # Conversations table
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS conversations (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
             user_id VARCHAR(255) NOT NULL,
             session_id VARCHAR(255) NOT NULL,
             messages JSONB NOT NULL,
@@ -62,7 +88,7 @@ async def create_tables(conn: asyncpg.Connection) -> None:
     # Request metrics table
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS request_metrics (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
             task_id VARCHAR(255) NOT NULL,
             user_id VARCHAR(255) NOT NULL,
             stage VARCHAR(50) NOT NULL,
@@ -73,18 +99,55 @@ async def create_tables(conn: asyncpg.Connection) -> None:
         );
     """)
     
+    # Move tables created before UUIDv7 onto the new default
+    await conn.execute("""
+        ALTER TABLE conversations ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+    """)
+    await conn.execute("""
+        ALTER TABLE request_metrics ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+    """)
+    
     logger.info("✅ Tables created")
 
 
+async def drop_invalid_index(conn: asyncpg.Connection, index_name: str) -> None:
+    """
+    Drop an index left INVALID by an interrupted CREATE INDEX CONCURRENTLY.
+    
+    A failed concurrent build leaves the index in the catalog, so a later
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS would skip it and the planner
+    would never use it. Dropping it lets the next create rebuild it.
+    
+    Args:
+        index_name: Name of an index this script creates
+    """
+    is_valid = await conn.fetchval(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)",
+        index_name
+    )
+    
+    if is_valid is False:
+        logger.warning(f"⚠️  Rebuilding invalid index {index_name}")
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+
+
 async def create_indexes(conn: asyncpg.Connection) -> None:
     """Create database indexes for performance."""
     
     logger.info("Creating indexes...")
     
     # Conversations indexes
+    # get_conversation_history filters on (user_id, session_id) and orders by
+    # created_at DESC with a LIMIT, so the trailing sort key lets the planner
+    # read the newest rows straight off the index without a sort step.
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_conversations_user_session_created 
+        ON conversations(user_id, session_id, created_at DESC);
+    """)
+    
+    # Superseded by the index above (same leading columns)
     await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_conversations_user_session 
-        ON conversations(user_id, session_id);
+        DROP INDEX IF EXISTS idx_conversations_user_session;
     """)
     
     await conn.execute("""
@@ -109,9 +172,18 @@ async def create_indexes(conn: asyncpg.Connection) -> None:
         ON request_metrics(task_id);
     """)
     
+    # request_metrics is append-only, so created_at follows physical row
+    # order and a BRIN summary (min/max per block range) serves time-range
+    # scans at a fraction of a B-tree's size and insert cost.
     await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_metrics_created_at 
-        ON request_metrics(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_metrics_created_at_brin 
+        ON request_metrics USING BRIN (created_at) 
+        WITH (pages_per_range = 32);
+    """)
+    
+    # Replaced by the BRIN index above
+    await conn.execute("""
+        DROP INDEX IF EXISTS idx_metrics_created_at;
     """)
     
     await conn.execute("""
@@ -119,6 +191,22 @@ async def create_indexes(conn: asyncpg.Connection) -> None:
         ON request_metrics(user_id);
     """)
     
+    # Partial index: failure dashboards only ever scan failed requests.
+    # CONCURRENTLY so re-running against a live table does not block writes.
+    await drop_invalid_index(conn, "idx_metrics_failures")
+    await conn.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_failures 
+        ON request_metrics(created_at DESC) 
+        WHERE success = false;
+    """)
+    
+    # Per-stage latency percentiles can be answered from the index alone
+    await drop_invalid_index(conn, "idx_metrics_stage_duration")
+    await conn.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_stage_duration 
+        ON request_metrics(stage, duration_ms);
+    """)
+    
     logger.info("✅ Indexes created")
 
 
@@ -127,17 +215,15 @@ async def seed_test_data(conn: asyncpg.Connection) -> None:
     
     logger.info("Seeding test data...")
     
-    import json
-    
-    # Test user preferences
+    # Test user preferences (pooled connections carry the JSONB codec)
     await conn.execute("""
         INSERT INTO user_preferences (user_id, preferences)
         VALUES ($1, $2)
         ON CONFLICT (user_id) DO NOTHING
-    """, "test_user_1", json.dumps({
+    """, "test_user_1", {
         "theme": "dark",
         "component_style": "minimal"
-    }))
+    })
     
     logger.info("✅ Test data seeded")
 
@@ -147,14 +233,16 @@ async def verify_tables(conn: asyncpg.Connection) -> None:
     
     logger.info("Verifying tables...")
     
+    expected = {'conversations', 'projects', 'user_preferences', 'request_metrics'}
+    
+    # Filter server-side so only the expected tables come back
     tables = await conn.fetch("""
         SELECT table_name 
         FROM information_schema.tables 
         WHERE table_schema = 'public'
-        ORDER BY table_name
-    """)
+          AND table_name = ANY($1::text[])
+    """, list(expected))
     
-    expected = {'conversations', 'projects', 'user_preferences', 'request_metrics'}
     found = {row['table_name'] for row in tables}
     
     if expected.issubset(found):
@@ -176,31 +264,27 @@ async def main():
         # Connect to database
         logger.info(f"Connecting to {settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}")
         
-        conn = await asyncpg.connect(
-            host=settings.postgres_host,
-            port=settings.postgres_port,
-            database=settings.postgres_db,
-            user=settings.postgres_user,
-            password=settings.postgres_password
-        )
+        # Share the service pool rather than opening a standalone connection
+        await db_manager.connect()
         
         logger.info("✅ Connected to PostgreSQL")
         
-        # Create tables
-        await create_tables(conn)
-        
-        # Create indexes
-        await create_indexes(conn)
-        
-        # Seed test data (optional)
-        if settings.debug:
-            await seed_test_data(conn)
-        
-        # Verify
-        await verify_tables(conn)
+        async with db_manager.acquire() as conn:
+            # Create tables
+            await create_tables(conn)
+            
+            # Create indexes
+            await create_indexes(conn)
+            
+            # Seed test data (optional)
+            if settings.debug:
+                await seed_test_data(conn)
+            
+            # Verify
+            await verify_tables(conn)
         
-        # Close connection
-        await conn.close()
+        # Close pool
+        await db_manager.disconnect()
         
         print("\n" + "=" * 60)
         print("✅ DATABASE INITIALIZATION COMPLETE!")
@@ -220,6 +304,7 @@ async def main():
         print("  2. Check connection settings in .env")
         print("  3. Verify database exists: psql -U admin -d appbuilder")
         print("\n" + "=" * 60 + "\n")
+        await db_manager.disconnect()
         sys.exit(1)
 
 
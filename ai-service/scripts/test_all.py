@@ -0,0 +1,110 @@
+"""
+Run the Phase 2-5 test suites.
+
+By default the suites share a single event loop and one set of
+infrastructure connections: each suite's `main()` enters
+`infrastructure()`, which is re-entrant, so only this driver actually
+connects and disconnects. uvloop is used for the loop when it is installed.
+
+With `--processes`, each suite runs as its own script in a separate
+process instead. The suites then overlap end to end, so wall time drops to
+roughly the slowest suite, at the cost of one set of connections per
+process. Output is captured and printed in suite order.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harness import infrastructure
+import test_phase2
+import test_phase3
+import test_phase4
+import test_phase5
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+SUITES = [
+    ("Phase 2", test_phase2),
+    ("Phase 3", test_phase3),
+    ("Phase 4", test_phase4),
+    ("Phase 5", test_phase5),
+]
+
+
+async def run_in_process() -> list:
+    """Run every suite in the current process, one after another"""
+    results = []
+    
+    async with infrastructure():
+        for name, suite in SUITES:
+            results.append((name, await suite.main()))
+    
+    return results
+
+
+async def run_in_subprocesses() -> list:
+    """Run every suite as its own script, all at once"""
+    
+    async def run_script(suite):
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, suite.__file__,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        output, _ = await proc.communicate()
+        return output, proc.returncode
+    
+    outcomes = await asyncio.gather(*(run_script(suite) for _, suite in SUITES))
+    
+    results = []
+    for (name, _), (output, code) in zip(SUITES, outcomes):
+        # Printed whole and in suite order, so reports never interleave
+        sys.stdout.write(output.decode(errors="replace"))
+        results.append((name, code))
+    sys.stdout.flush()
+    
+    return results
+
+
+async def main(processes: bool = False) -> int:
+    """Run all suites; exit code is non-zero if any suite failed"""
+    start_time = time.perf_counter_ns()
+    
+    if processes:
+        results = await run_in_subprocesses()
+    else:
+        results = await run_in_process()
+    
+    print("\n" + "=" * 60)
+    print("  ALL SUITES")
+    print("=" * 60)
+    for name, code in results:
+        print(f"  {'✅' if code == 0 else '❌'} {name}")
+    print(f"\n⏱️  Total time: {(time.perf_counter_ns() - start_time) / 1e9:.2f}s")
+    
+    return max(code for _, code in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the phase test suites")
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="run each suite in its own process"
+    )
+    args = parser.parse_args()
+    
+    # A loop policy rather than asyncio.Runner(loop_factory=...), which
+    # needs Python 3.11
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    exit_code = asyncio.run(main(processes=args.processes))
+    sys.exit(exit_code)
@@ -29,6 +29,11 @@ from app.models.enhanced_schemas import (
 from app.services.pipeline import default_pipeline
 
 
+def emit(text: str = "", end: str = "\n") -> None:
+    """Write runner output to stdout"""
+    sys.stdout.write(text + end)
+
+
 class TestRunner:
     """Test runner for Phase 1 validation"""
     
@@ -39,92 +44,93 @@ class TestRunner:
     
     def print_header(self, title: str):
         """Print test section header"""
-        print("\n" + "=" * 60)
-        print(f"  {title}")
-        print("=" * 60 + "\n")
+        emit("\n" + "=" * 60)
+        emit(f"  {title}")
+        emit("=" * 60 + "\n")
     
     def print_test(self, name: str):
         """Print test name"""
-        print(f"[TEST] {name}...", end=" ", flush=True)
+        emit(f"[TEST] {name}...", end=" ")
     
     def pass_test(self, name: str, duration_ms: int = 0):
         """Mark test as passed"""
         self.tests_passed += 1
         self.test_results.append(("PASS", name, duration_ms))
         if duration_ms > 0:
-            print(f"✅ PASS ({duration_ms}ms)")
+            emit(f"✅ PASS ({duration_ms}ms)")
         else:
-            print("✅ PASS")
+            emit("✅ PASS")
     
     def fail_test(self, name: str, error: str):
         """Mark test as failed"""
         self.tests_failed += 1
         self.test_results.append(("FAIL", name, error))
-        print(f"❌ FAIL")
-        print(f"   Error: {error}")
+        emit(f"❌ FAIL")
+        emit(f"   Error: {error}")
     
     def print_summary(self):
         """Print test summary"""
         total = self.tests_passed + self.tests_failed
         
-        print("\n" + "=" * 60)
-        print("  TEST SUMMARY")
-        print("=" * 60)
+        emit("\n" + "=" * 60)
+        emit("  TEST SUMMARY")
+        emit("=" * 60)
         
-        print(f"\nTotal Tests: {total}")
-        print(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}%)")
-        print(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}%)")
+        emit(f"\nTotal Tests: {total}")
+        emit(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}%)")
+        emit(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}%)")
         
         if self.tests_failed > 0:
-            print("\n❌ Failed Tests:")
+            emit("\n❌ Failed Tests:")
             for status, name, error in self.test_results:
                 if status == "FAIL":
-                    print(f"   - {name}: {error}")
+                    emit(f"   - {name}: {error}")
         
-        print("\n" + "=" * 60)
+        emit("\n" + "=" * 60)
         
         if self.tests_failed == 0:
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60 + "\n")
+            emit("✅ ALL TESTS PASSED!")
+            emit("=" * 60 + "\n")
             return 0
         else:
-            print(f"❌ {self.tests_failed} TEST(S) FAILED")
-            print("=" * 60 + "\n")
+            emit(f"❌ {self.tests_failed} TEST(S) FAILED")
+            emit("=" * 60 + "\n")
             return 1
 
 
 runner = TestRunner()
 
 
+async def timed(coro):
+    """Await a coroutine and return (result, elapsed_ms) on a monotonic clock"""
+    start = time.perf_counter_ns()
+    result = await coro
+    return result, (time.perf_counter_ns() - start) // 1_000_000
+
+
 async def test_database_operations():
     """Test database operations"""
     runner.print_header("DATABASE OPERATIONS")
     
-    # Test 1: Connection
+    # Test 1: Connection (shared pool is opened once in main)
     runner.print_test("Database connection")
-    try:
-        await db_manager.connect()
-        if db_manager.is_connected:
-            runner.pass_test("Database connection")
-        else:
-            runner.fail_test("Database connection", "Not connected")
-    except Exception as e:
-        runner.fail_test("Database connection", str(e))
+    if db_manager.is_connected:
+        runner.pass_test("Database connection")
+    else:
+        runner.fail_test("Database connection", "Not connected")
         return
     
     # Test 2: Save conversation
     runner.print_test("Save conversation")
     try:
-        start = time.time()
-        conv_id = await db_manager.save_conversation(
+        conv_id, duration = await timed(db_manager.save_conversation(
             user_id="test_user_phase1",
             session_id="test_session_phase1",
             messages=[
                 {"role": "user", "content": "Test message"},
                 {"role": "assistant", "content": "Test response"}
             ]
-        )
-        duration = int((time.time() - start) * 1000)
+        ))
         
         if conv_id:
             runner.pass_test("Save conversation", duration)
@@ -136,13 +142,11 @@ async def test_database_operations():
     # Test 3: Retrieve conversation
     runner.print_test("Retrieve conversation history")
     try:
-        start = time.time()
-        history = await db_manager.get_conversation_history(
+        history, duration = await timed(db_manager.get_conversation_history(
             user_id="test_user_phase1",
             session_id="test_session_phase1",
             limit=5
-        )
-        duration = int((time.time() - start) * 1000)
+        ))
         
         if len(history) > 0:
             runner.pass_test("Retrieve conversation history", duration)
@@ -154,15 +158,13 @@ async def test_database_operations():
     # Test 4: Save project
     runner.print_test("Save project")
     try:
-        start = time.time()
-        project_id = await db_manager.save_project(
+        project_id, duration = await timed(db_manager.save_project(
             user_id="test_user_phase1",
             project_name="Test Project Phase 1",
             architecture={"app_type": "single-page"},
             layout={"screen_id": "screen_1"},
             blockly={"blocks": {"languageVersion": 0, "blocks": []}}
-        )
-        duration = int((time.time() - start) * 1000)
+        ))
         
         if project_id:
             runner.pass_test("Save project", duration)
@@ -309,11 +311,8 @@ async def test_pipeline_execution():
     await queue_manager.connect()
     await cache_manager.connect()
     
-    # Test 1: Simple request
-    runner.print_test("Pipeline with simple request")
-    try:
-        start = time.time()
-        
+    # Each case returns (duration_ms, error); error is None on success
+    async def simple_request():
         request = AIRequest(
             user_id="test_user_phase1",
             session_id="test_session_phase1",
@@ -321,21 +320,13 @@ async def test_pipeline_execution():
             prompt="Create a simple button that says hello"
         )
         
-        result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+        result, duration = await timed(default_pipeline.execute(request))
         
         if 'architecture' in result and 'layout' in result and 'blockly' in result:
-            runner.pass_test("Pipeline with simple request", duration)
-        else:
-            runner.fail_test("Pipeline with simple request", "Missing output components")
-    except Exception as e:
-        runner.fail_test("Pipeline with simple request", str(e))
+            return duration, None
+        return duration, "Missing output components"
     
-    # Test 2: Complex request
-    runner.print_test("Pipeline with complex request")
-    try:
-        start = time.time()
-        
+    async def complex_request():
         request = AIRequest(
             user_id="test_user_phase1",
             session_id="test_session_phase1",
@@ -344,37 +335,58 @@ async def test_pipeline_execution():
                    "including input field, buttons, and list display"
         )
         
-        result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+        result, duration = await timed(default_pipeline.execute(request))
         
         if result.get('intent', {}).get('complexity') == "complex":
-            runner.pass_test("Pipeline with complex request", duration)
-        else:
-            runner.fail_test("Pipeline with complex request", "Complexity not detected")
-    except Exception as e:
-        runner.fail_test("Pipeline with complex request", str(e))
+            return duration, None
+        return duration, "Complexity not detected"
     
-    # Test 3: Error handling
-    runner.print_test("Pipeline error handling")
-    try:
-        # Request with invalid prompt (too short)
-        request = AIRequest(
-            user_id="test_user_phase1",
-            session_id="test_session_phase1",
-            socket_id="test_socket_phase1",
-            prompt="Hi"
-        )
-        
+    async def invalid_request():
+        # Invalid prompt (too short) is rejected by AIRequest before dispatch
         try:
-            result = await default_pipeline.execute(request)
-            runner.fail_test("Pipeline error handling", "Validation should have failed")
+            request = AIRequest(
+                user_id="test_user_phase1",
+                session_id="test_session_phase1",
+                socket_id="test_socket_phase1",
+                prompt="Hi"
+            )
+            await default_pipeline.execute(request)
         except ValueError as validation_error:
             if "at least 10 characters" in str(validation_error):
-                runner.pass_test("Pipeline error handling")
-            else:
-                runner.fail_test("Pipeline error handling", f"Wrong error: {validation_error}")
-    except Exception as e:
-        runner.fail_test("Pipeline error handling", str(e))
+                return 0, None
+            return 0, f"Wrong error: {validation_error}"
+        return 0, "Validation should have failed"
+    
+    cases = [
+        ("Pipeline with simple request", simple_request),
+        ("Pipeline with complex request", complex_request),
+        ("Pipeline error handling", invalid_request),
+    ]
+    
+    # Cases are independent: overlap them (at most two pipelines in flight)
+    # and report serially afterwards, since runner output is not task-safe
+    semaphore = asyncio.Semaphore(2)
+    
+    async def bounded(case):
+        async with semaphore:
+            return await case()
+    
+    outcomes = await asyncio.gather(
+        *(bounded(case) for _, case in cases),
+        return_exceptions=True
+    )
+    
+    for (name, _), outcome in zip(cases, outcomes):
+        runner.print_test(name)
+        if isinstance(outcome, Exception):
+            runner.fail_test(name, str(outcome))
+            continue
+        
+        duration, error = outcome
+        if error:
+            runner.fail_test(name, error)
+        else:
+            runner.pass_test(name, duration)
     
     # Disconnect
     await queue_manager.disconnect()
@@ -385,78 +397,68 @@ async def test_infrastructure():
     """Test infrastructure connections"""
     runner.print_header("INFRASTRUCTURE")
     
-    # Test 1: RabbitMQ
-    runner.print_test("RabbitMQ connection")
-    try:
-        if not queue_manager.is_connected:
-            await queue_manager.connect()
-        
-        if queue_manager.is_connected:
-            runner.pass_test("RabbitMQ connection")
-        else:
-            runner.fail_test("RabbitMQ connection", "Not connected")
-    except Exception as e:
-        runner.fail_test("RabbitMQ connection", str(e))
-    
-    # Test 2: Redis
-    runner.print_test("Redis connection")
-    try:
-        if not cache_manager._connected:
-            await cache_manager.connect()
-        
-        if cache_manager._connected:
-            runner.pass_test("Redis connection")
-        else:
-            runner.fail_test("Redis connection", "Not connected")
-    except Exception as e:
-        runner.fail_test("Redis connection", str(e))
+    # Connect all three concurrently; each connect() is a no-op if already up
+    managers = [
+        ("RabbitMQ connection", queue_manager),
+        ("Redis connection", cache_manager),
+        ("PostgreSQL connection", db_manager),
+    ]
+    results = await asyncio.gather(
+        *(manager.connect() for _, manager in managers),
+        return_exceptions=True
+    )
     
-    # Test 3: PostgreSQL
-    runner.print_test("PostgreSQL connection")
-    try:
-        if not db_manager.is_connected:
-            await db_manager.connect()
-        
-        if db_manager.is_connected:
-            runner.pass_test("PostgreSQL connection")
+    for (name, manager), result in zip(managers, results):
+        runner.print_test(name)
+        if isinstance(result, Exception):
+            runner.fail_test(name, str(result))
+        elif manager._connected:
+            runner.pass_test(name)
         else:
-            runner.fail_test("PostgreSQL connection", "Not connected")
-    except Exception as e:
-        runner.fail_test("PostgreSQL connection", str(e))
+            runner.fail_test(name, "Not connected")
 
 
 async def main():
     """Run all tests"""
-    print("\n" + "=" * 60)
-    print("  PHASE 1 COMPREHENSIVE TEST SUITE")
-    print("=" * 60)
-    print(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    emit("\n" + "=" * 60)
+    emit("  PHASE 1 COMPREHENSIVE TEST SUITE")
+    emit("=" * 60)
+    emit(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    emit("=" * 60)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
+        # One shared pool for every suite
+        await db_manager.connect()
+        
         # Run test suites
         await test_infrastructure()
         await test_database_operations()
         await test_schema_validation()
         await test_pipeline_execution()
         
-        # Cleanup
-        await db_manager.disconnect()
-        
     except Exception as e:
         logger.error(f"Test suite failed: {e}")
-        print(f"\n❌ Test suite crashed: {e}\n")
+        emit(f"\n❌ Test suite crashed: {e}\n")
         return 1
+    finally:
+        # Cleanup
+        await db_manager.disconnect()
     
     # Print summary
-    total_time = time.time() - start_time
-    print(f"\n⏱️  Total test time: {total_time:.2f}s")
+    total_time = time.perf_counter() - start_time
+    emit(f"\n⏱️  Total test time: {total_time:.2f}s")
     
     return runner.print_summary()
 
 
 if __name__ == "__main__":
+    # Standalone run: service logs go to stdout too, so they and the
+    # report share one stream and stay in order. Importers keep their
+    # own loguru configuration
+    logger.remove()
+    logger.add(sys.stdout, level="INFO")
+    
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
\ No newline at end of file
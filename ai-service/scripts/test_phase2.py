@@ -11,15 +11,16 @@ Tests all Phase 2 components:
 import asyncio
 import sys
 import time
+import uuid
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
+from harness import PhaseTestRunner, infrastructure
 from app.core.database import db_manager
-from app.core.messaging import queue_manager
-from app.core.cache import cache_manager
 from app.models.schemas import AIRequest
+from app.models.enhanced_schemas import IntentAnalysis
 from app.services.analysis.intent_analyzer import intent_analyzer
 from app.services.analysis.context_builder import context_builder
 from app.services.generation.cache_manager import semantic_cache
@@ -27,68 +28,22 @@ from app.utils.rate_limiter import rate_limiter
 from app.services.pipeline import default_pipeline
 
 
-class Phase2TestRunner:
+# Upper bound on concurrent LLM calls when test cases run in parallel
+LLM_CONCURRENCY = 4
+
+# Fixed fixture: built once, without re-running field validation
+FIXED_INTENT = IntentAnalysis.model_construct(
+    intent_type="new_app",
+    complexity="medium",
+    confidence=0.9,
+    extracted_entities={"components": ["Button"]},
+    requires_context=False,
+    multi_turn=False
+)
+
+
+class Phase2TestRunner(PhaseTestRunner):
     """Test runner for Phase 2"""
-    
-    def __init__(self):
-        self.tests_passed = 0
-        self.tests_failed = 0
-        self.test_results = []
-    
-    def print_header(self, title: str):
-        """Print test section header"""
-        print("\n" + "=" * 60)
-        print(f"  {title}")
-        print("=" * 60 + "\n")
-    
-    def print_test(self, name: str):
-        """Print test name"""
-        print(f"[TEST] {name}...", end=" ", flush=True)
-    
-    def pass_test(self, name: str, duration_ms: int = 0):
-        """Mark test as passed"""
-        self.tests_passed += 1
-        self.test_results.append(("PASS", name, duration_ms))
-        if duration_ms > 0:
-            print(f"✅ PASS ({duration_ms}ms)")
-        else:
-            print("✅ PASS")
-    
-    def fail_test(self, name: str, error: str):
-        """Mark test as failed"""
-        self.tests_failed += 1
-        self.test_results.append(("FAIL", name, error))
-        print(f"❌ FAIL")
-        print(f"   Error: {error}")
-    
-    def print_summary(self):
-        """Print test summary"""
-        total = self.tests_passed + self.tests_failed
-        
-        print("\n" + "=" * 60)
-        print("  TEST SUMMARY")
-        print("=" * 60)
-        
-        print(f"\nTotal Tests: {total}")
-        print(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}%)")
-        print(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}%)")
-        
-        if self.tests_failed > 0:
-            print("\n❌ Failed Tests:")
-            for status, name, error in self.test_results:
-                if status == "FAIL":
-                    print(f"   - {name}: {error}")
-        
-        print("\n" + "=" * 60)
-        
-        if self.tests_failed == 0:
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60 + "\n")
-            return 0
-        else:
-            print(f"❌ {self.tests_failed} TEST(S) FAILED")
-            print("=" * 60 + "\n")
-            return 1
 
 
 runner = Phase2TestRunner()
@@ -105,60 +60,65 @@ async def test_intent_analyzer():
         ("Change the button color to blue", "modify_app", "simple")
     ]
     
-    for prompt, expected_intent, expected_complexity in test_cases:
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    
+    async def run_case(prompt):
+        async with semaphore:
+            start = time.perf_counter_ns()
+            intent = await intent_analyzer.analyze(prompt)
+            return intent, (time.perf_counter_ns() - start) // 1_000_000
+    
+    # Cases are independent LLM round-trips: run them concurrently, then
+    # report serially since runner output is not task-safe
+    results = await asyncio.gather(
+        *(run_case(prompt) for prompt, _, _ in test_cases),
+        return_exceptions=True
+    )
+    
+    for (prompt, expected_intent, expected_complexity), outcome in zip(test_cases, results):
         runner.print_test(f"Analyze: '{prompt[:40]}...'")
         
-        try:
-            start = time.time()
-            intent = await intent_analyzer.analyze(prompt)
-            duration = int((time.time() - start) * 1000)
-            
-            if intent.intent_type == expected_intent and intent.complexity == expected_complexity:
-                runner.pass_test(f"Analyze: '{prompt[:40]}...'", duration)
-            else:
-                runner.fail_test(
-                    f"Analyze: '{prompt[:40]}...'",
-                    f"Expected {expected_intent}/{expected_complexity}, got {intent.intent_type}/{intent.complexity}"
-                )
-        except Exception as e:
-            runner.fail_test(f"Analyze: '{prompt[:40]}...'", str(e))
+        if isinstance(outcome, Exception):
+            runner.fail_test(f"Analyze: '{prompt[:40]}...'", str(outcome))
+            continue
+        
+        intent, duration = outcome
+        if intent.intent_type == expected_intent and intent.complexity == expected_complexity:
+            runner.pass_test(f"Analyze: '{prompt[:40]}...'", duration)
+        else:
+            runner.fail_test(
+                f"Analyze: '{prompt[:40]}...'",
+                f"Expected {expected_intent}/{expected_complexity}, got {intent.intent_type}/{intent.complexity}"
+            )
 
 
 async def test_context_builder():
     """Test enhanced context builder"""
     runner.print_header("CONTEXT BUILDER (Enhanced)")
     
-    # Save test data first
-    await db_manager.save_conversation(
-        user_id="test_user_phase2_ctx",
-        session_id="test_session_phase2_ctx",
-        messages=[
-            {"role": "user", "content": "Previous message 1"},
-            {"role": "assistant", "content": "Response 1"}
-        ]
-    )
-    
-    await db_manager.save_user_preferences(
-        user_id="test_user_phase2_ctx",
-        preferences={"theme": "dark", "component_style": "minimal"}
+    # Save test data first (independent writes, so overlap them)
+    await asyncio.gather(
+        db_manager.save_conversation(
+            user_id="test_user_phase2_ctx",
+            session_id="test_session_phase2_ctx",
+            messages=[
+                {"role": "user", "content": "Previous message 1"},
+                {"role": "assistant", "content": "Response 1"}
+            ]
+        ),
+        db_manager.save_user_preferences(
+            user_id="test_user_phase2_ctx",
+            preferences={"theme": "dark", "component_style": "minimal"}
+        )
     )
     
     # Test 1: Build context
     runner.print_test("Build enriched context")
     
     try:
-        from app.models.enhanced_schemas import IntentAnalysis
-        
-        intent = IntentAnalysis(
-            intent_type="new_app",
-            complexity="medium",
-            confidence=0.9,
-            extracted_entities={"components": ["Button"]},
-            requires_context=False,
-            multi_turn=False
-        )
+        intent = FIXED_INTENT
         
-        start = time.time()
+        start = time.perf_counter_ns()
         context = await context_builder.build_context(
             user_id="test_user_phase2_ctx",
             session_id="test_session_phase2_ctx",
@@ -166,7 +126,7 @@ async def test_context_builder():
             intent=intent,
             original_request={"prompt": "Create a todo app"}
         )
-        duration = int((time.time() - start) * 1000)
+        duration = (time.perf_counter_ns() - start) // 1_000_000
         
         if len(context.conversation_history) > 0 and len(context.user_preferences) > 0:
             runner.pass_test("Build enriched context", duration)
@@ -321,27 +281,40 @@ async def test_rate_limiter():
         runner.fail_test("Rate limit reset", str(e))
 
 
+PIPELINE_USER = "test_user_pipeline_phase2"
+PIPELINE_PROMPT = "Create a simple todo list with add and delete features"
+
+
+def _pipeline_request(prompt: str, user_id: str = PIPELINE_USER) -> AIRequest:
+    """Build a pipeline request for the Phase 2 pipeline tests"""
+    return AIRequest(
+        user_id=user_id,
+        session_id="test_session_pipeline_phase2",
+        socket_id="test_socket_pipeline_phase2",
+        prompt=prompt
+    )
+
+
 async def test_complete_pipeline():
     """Test complete Phase 2 pipeline"""
     runner.print_header("COMPLETE PIPELINE (Phase 2)")
     
+    async def run_timed(request):
+        start = time.perf_counter_ns()
+        result = await default_pipeline.execute(request)
+        return result, (time.perf_counter_ns() - start) // 1_000_000
+    
+    # A user id unique to this run can't hit an entry from an earlier run,
+    # so the first request is a genuine miss and the repeat the hit
+    user_id = f"{PIPELINE_USER}_{uuid.uuid4().hex[:8]}"
+    
     # Test 1: First request (no cache)
     runner.print_test("Pipeline execution (no cache)")
     
     try:
-        start = time.time()
-        
-        request = AIRequest(
-            user_id="test_user_pipeline_phase2",
-            session_id="test_session_pipeline_phase2",
-            socket_id="test_socket_pipeline_phase2",
-            prompt="Create a simple todo list with add and delete features"
-        )
-        
-        result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+        result, duration = await run_timed(_pipeline_request(PIPELINE_PROMPT, user_id))
         
-        if 'architecture' in result and 'intent' in result:
+        if 'architecture' in result and 'intent' in result and not result.get('cache_hit'):
             runner.pass_test("Pipeline execution (no cache)", duration)
         else:
             runner.fail_test("Pipeline execution (no cache)", "Missing outputs")
@@ -352,17 +325,7 @@ async def test_complete_pipeline():
     runner.print_test("Pipeline execution (with cache)")
     
     try:
-        start = time.time()
-        
-        request2 = AIRequest(
-            user_id="test_user_pipeline_phase2",
-            session_id="test_session_pipeline_phase2",
-            socket_id="test_socket_pipeline_phase2",
-            prompt="Create a simple todo list with add and delete features"
-        )
-        
-        result2 = await default_pipeline.execute(request2)
-        duration2 = int((time.time() - start) * 1000)
+        result2, duration2 = await run_timed(_pipeline_request(PIPELINE_PROMPT, user_id))
         
         if result2.get('cache_hit'):
             runner.pass_test("Pipeline execution (with cache)", duration2)
@@ -374,40 +337,33 @@ async def test_complete_pipeline():
 
 async def main():
     """Run all Phase 2 tests"""
-    print("\n" + "=" * 60)
-    print("  PHASE 2 COMPREHENSIVE TEST SUITE")
-    print("=" * 60)
-    print(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    runner.log("\n" + "=" * 60)
+    runner.log("  PHASE 2 COMPREHENSIVE TEST SUITE")
+    runner.log("=" * 60)
+    runner.log(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    runner.log("=" * 60)
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
-        # Connect to infrastructure
-        await cache_manager.connect()
-        await db_manager.connect()
-        await queue_manager.connect()
-        
-        # Run test suites
-        await test_intent_analyzer()
-        await test_context_builder()
-        await test_semantic_cache()
-        await test_rate_limiter()
-        await test_complete_pipeline()
-        
-        # Cleanup
-        await cache_manager.disconnect()
-        await db_manager.disconnect()
-        await queue_manager.disconnect()
+        # Connect once per process; reused if a driver already connected
+        async with infrastructure():
+            # Run test suites
+            await test_intent_analyzer()
+            await test_context_builder()
+            await test_semantic_cache()
+            await test_rate_limiter()
+            await test_complete_pipeline()
         
     except Exception as e:
         logger.error(f"Test suite failed: {e}")
-        print(f"\n❌ Test suite crashed: {e}\n")
+        runner.log(f"\n❌ Test suite crashed: {e}\n")
+        runner.flush()
         return 1
     
     # Print summary
-    total_time = time.time() - start_time
-    print(f"\n⏱️  Total test time: {total_time:.2f}s")
+    total_time = (time.perf_counter_ns() - start_time) / 1e9
+    runner.log(f"\n⏱️  Total test time: {total_time:.2f}s")
     
     return runner.print_summary()
 
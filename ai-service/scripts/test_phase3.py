@@ -10,82 +10,80 @@ Tests Phase 3 components:
 import asyncio
 import sys
 import time
+from typing import Any, Dict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
-from app.core.database import db_manager
-from app.core.messaging import queue_manager
-from app.core.cache import cache_manager
-from app.models.schemas import AIRequest
+from harness import PhaseTestRunner, infrastructure
+from app.models.schemas import (
+    AIRequest,
+    ArchitectureDesign,
+    ScreenDefinition,
+    NavigationStructure,
+    StateDefinition,
+    DataFlowDiagram
+)
 from app.services.generation.architecture_generator import architecture_generator
 from app.services.generation.architecture_validator import architecture_validator
 from app.services.pipeline import default_pipeline
 
 
-class Phase3TestRunner:
+# Upper bound on concurrent LLM calls when test cases run in parallel
+LLM_CONCURRENCY = 4
+
+# Fixed validator fixtures: built once, without re-running top-level validation
+VALID_ARCH = ArchitectureDesign.model_construct(
+    app_type="single-page",
+    screens=[
+        ScreenDefinition(
+            id="screen_1",
+            name="Counter",
+            purpose="Simple counter with increment and decrement buttons",
+            components=["Text", "Button", "Button"],
+            navigation=[]
+        )
+    ],
+    navigation=NavigationStructure(type="stack", routes=[]),
+    state_management=[
+        StateDefinition(
+            name="count",
+            type="local-state",
+            scope="screen",
+            initial_value=0
+        )
+    ],
+    data_flow=DataFlowDiagram(
+        user_interactions=["increment", "decrement"],
+        api_calls=[],
+        local_storage=[]
+    )
+)
+
+INVALID_ARCH = ArchitectureDesign.model_construct(
+    app_type="single-page",
+    screens=[
+        ScreenDefinition(
+            id="screen_1",
+            name="Test",
+            purpose="",  # Empty purpose
+            components=["InvalidComponent"],  # Unsupported
+            navigation=["screen_999"]  # Non-existent
+        )
+    ],
+    navigation=NavigationStructure(type="stack", routes=[]),
+    state_management=[],
+    data_flow=DataFlowDiagram(
+        user_interactions=[],
+        api_calls=[],
+        local_storage=[]
+    )
+)
+
+
+class Phase3TestRunner(PhaseTestRunner):
     """Test runner for Phase 3"""
-    
-    def __init__(self):
-        self.tests_passed = 0
-        self.tests_failed = 0
-        self.test_results = []
-    
-    def print_header(self, title: str):
-        """Print test section header"""
-        print("\n" + "=" * 60)
-        print(f"  {title}")
-        print("=" * 60 + "\n")
-    
-    def print_test(self, name: str):
-        """Print test name"""
-        print(f"[TEST] {name}...", end=" ", flush=True)
-    
-    def pass_test(self, name: str, duration_ms: int = 0):
-        """Mark test as passed"""
-        self.tests_passed += 1
-        self.test_results.append(("PASS", name, duration_ms))
-        if duration_ms > 0:
-            print(f"✅ PASS ({duration_ms}ms)")
-        else:
-            print("✅ PASS")
-    
-    def fail_test(self, name: str, error: str):
-        """Mark test as failed"""
-        self.tests_failed += 1
-        self.test_results.append(("FAIL", name, error))
-        print(f"❌ FAIL")
-        print(f"   Error: {error}")
-    
-    def print_summary(self):
-        """Print test summary"""
-        total = self.tests_passed + self.tests_failed
-        
-        print("\n" + "=" * 60)
-        print("  TEST SUMMARY")
-        print("=" * 60)
-        
-        print(f"\nTotal Tests: {total}")
-        print(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}%)")
-        print(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}%)")
-        
-        if self.tests_failed > 0:
-            print("\n❌ Failed Tests:")
-            for status, name, error in self.test_results:
-                if status == "FAIL":
-                    print(f"   - {name}: {error}")
-        
-        print("\n" + "=" * 60)
-        
-        if self.tests_failed == 0:
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60 + "\n")
-            return 0
-        else:
-            print(f"❌ {self.tests_failed} TEST(S) FAILED")
-            print("=" * 60 + "\n")
-            return 1
 
 
 runner = Phase3TestRunner()
@@ -101,13 +99,29 @@ async def test_architecture_generator():
         ("Make a weather app with multiple cities", "multi-page", 2),
     ]
     
-    for prompt, expected_type, expected_screens in test_cases:
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    
+    async def run_case(prompt):
+        async with semaphore:
+            start = time.perf_counter_ns()
+            architecture, metadata = await architecture_generator.generate(prompt)
+            return architecture, metadata, (time.perf_counter_ns() - start) // 1_000_000
+    
+    # Cases are independent LLM round-trips: run them concurrently, then
+    # report serially since runner output is not task-safe
+    results = await asyncio.gather(
+        *(run_case(prompt) for prompt, _, _ in test_cases),
+        return_exceptions=True
+    )
+    
+    for (prompt, expected_type, expected_screens), outcome in zip(test_cases, results):
         runner.print_test(f"Generate: '{prompt[:40]}...'")
         
         try:
-            start = time.time()
-            architecture, metadata = await architecture_generator.generate(prompt)
-            duration = int((time.time() - start) * 1000)
+            if isinstance(outcome, Exception):
+                raise outcome
+            
+            architecture, metadata, duration = outcome
             
             # Verify architecture
             if architecture.app_type == expected_type:
@@ -119,10 +133,10 @@ async def test_architecture_generator():
                 )
             
             # Log details
-            print(f"      Type: {architecture.app_type}")
-            print(f"      Screens: {len(architecture.screens)}")
-            print(f"      API time: {metadata['api_duration_ms']}ms")
-            print(f"      Tokens: {metadata['tokens_used']}")
+            runner.log(f"      Type: {architecture.app_type}")
+            runner.log(f"      Screens: {len(architecture.screens)}")
+            runner.log(f"      API time: {metadata['api_duration_ms']}ms")
+            runner.log(f"      Tokens: {metadata['tokens_used']}")
             
         except Exception as e:
             runner.fail_test(f"Generate: '{prompt[:40]}...'", str(e))
@@ -136,46 +150,11 @@ async def test_architecture_validator():
     runner.print_test("Validate correct architecture")
     
     try:
-        from app.models.schemas import (
-            ArchitectureDesign,
-            ScreenDefinition,
-            NavigationStructure,
-            StateDefinition,
-            DataFlowDiagram
-        )
-        
-        valid_arch = ArchitectureDesign(
-            app_type="single-page",
-            screens=[
-                ScreenDefinition(
-                    id="screen_1",
-                    name="Counter",
-                    purpose="Simple counter with increment and decrement buttons",
-                    components=["Text", "Button", "Button"],
-                    navigation=[]
-                )
-            ],
-            navigation=NavigationStructure(type="stack", routes=[]),
-            state_management=[
-                StateDefinition(
-                    name="count",
-                    type="local-state",
-                    scope="screen",
-                    initial_value=0
-                )
-            ],
-            data_flow=DataFlowDiagram(
-                user_interactions=["increment", "decrement"],
-                api_calls=[],
-                local_storage=[]
-            )
-        )
-        
-        is_valid, warnings = await architecture_validator.validate(valid_arch)
+        is_valid, warnings = await architecture_validator.validate(VALID_ARCH)
         
         if is_valid:
             runner.pass_test("Validate correct architecture")
-            print(f"      Warnings: {len(warnings)}")
+            runner.log(f"      Warnings: {len(warnings)}")
         else:
             runner.fail_test("Validate correct architecture", "Should be valid")
             
@@ -186,32 +165,12 @@ async def test_architecture_validator():
     runner.print_test("Detect invalid architecture")
     
     try:
-        invalid_arch = ArchitectureDesign(
-            app_type="single-page",
-            screens=[
-                ScreenDefinition(
-                    id="screen_1",
-                    name="Test",
-                    purpose="",  # Empty purpose
-                    components=["InvalidComponent"],  # Unsupported
-                    navigation=["screen_999"]  # Non-existent
-                )
-            ],
-            navigation=NavigationStructure(type="stack", routes=[]),
-            state_management=[],
-            data_flow=DataFlowDiagram(
-                user_interactions=[],
-                api_calls=[],
-                local_storage=[]
-            )
-        )
-        
-        is_valid, warnings = await architecture_validator.validate(invalid_arch)
+        is_valid, warnings = await architecture_validator.validate(INVALID_ARCH)
         
         if not is_valid:
             errors = [w for w in warnings if w.level == "error"]
             runner.pass_test("Detect invalid architecture")
-            print(f"      Errors detected: {len(errors)}")
+            runner.log(f"      Errors detected: {len(errors)}")
         else:
             runner.fail_test("Detect invalid architecture", "Should be invalid")
             
@@ -272,33 +231,56 @@ async def test_error_handling():
         runner.fail_test("Auto-correct JSON", str(e))
 
 
-async def test_complete_pipeline():
-    """Test complete Phase 3 pipeline"""
-    runner.print_header("COMPLETE PIPELINE (Phase 3)")
+async def test_complete_pipeline() -> int:
+    """
+    Test complete Phase 3 pipeline.
     
-    # Test 1: Simple app
-    runner.print_test("Pipeline with simple prompt")
+    Returns:
+        Number of pipeline runs that generated a fresh architecture
+        (cache hits skip the generator)
+    """
+    runner.print_header("COMPLETE PIPELINE (Phase 3)")
     
-    try:
-        start = time.time()
+    async def run_pipeline(prompt):
+        start = time.perf_counter_ns()
         
         request = AIRequest(
             user_id="test_user_phase3",
             session_id="test_session_phase3",
             socket_id="test_socket_phase3",
-            prompt="Create a simple counter app with + and - buttons"
+            prompt=prompt
         )
         
         result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+        return result, (time.perf_counter_ns() - start) // 1_000_000
+    
+    # The simple and complex prompts are independent: run both pipelines
+    # concurrently and check the outcomes in order below
+    simple_outcome, complex_outcome = await asyncio.gather(
+        run_pipeline("Create a simple counter app with + and - buttons"),
+        run_pipeline(
+            "Build a todo list app with input field, add button, list of todos, "
+            "delete button for each item, and mark complete functionality"
+        ),
+        return_exceptions=True
+    )
+    
+    # Test 1: Simple app
+    runner.print_test("Pipeline with simple prompt")
+    
+    try:
+        if isinstance(simple_outcome, Exception):
+            raise simple_outcome
+        
+        result, duration = simple_outcome
         
         # Verify architecture was generated
         if 'architecture' in result:
             arch = result['architecture']
             if arch.get('app_type') and len(arch.get('screens', [])) > 0:
                 runner.pass_test("Pipeline with simple prompt", duration)
-                print(f"      Architecture: {arch['app_type']}")
-                print(f"      Screens: {len(arch['screens'])}")
+                runner.log(f"      Architecture: {arch['app_type']}")
+                runner.log(f"      Screens: {len(arch['screens'])}")
             else:
                 runner.fail_test("Pipeline with simple prompt", "Invalid architecture")
         else:
@@ -311,18 +293,10 @@ async def test_complete_pipeline():
     runner.print_test("Pipeline with complex prompt")
     
     try:
-        start = time.time()
+        if isinstance(complex_outcome, Exception):
+            raise complex_outcome
         
-        request = AIRequest(
-            user_id="test_user_phase3",
-            session_id="test_session_phase3",
-            socket_id="test_socket_phase3",
-            prompt="Build a todo list app with input field, add button, list of todos, "
-                   "delete button for each item, and mark complete functionality"
-        )
-        
-        result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+        result, duration = complex_outcome
         
         # Verify architecture
         if 'architecture' in result:
@@ -332,8 +306,8 @@ async def test_complete_pipeline():
             
             if len(screens) > 0 and len(state) > 0:
                 runner.pass_test("Pipeline with complex prompt", duration)
-                print(f"      Screens: {len(screens)}")
-                print(f"      State variables: {len(state)}")
+                runner.log(f"      Screens: {len(screens)}")
+                runner.log(f"      State variables: {len(state)}")
             else:
                 runner.fail_test("Pipeline with complex prompt", "Incomplete architecture")
         else:
@@ -349,20 +323,33 @@ async def test_complete_pipeline():
         if 'architecture_warnings' in result:
             warnings = result['architecture_warnings']
             runner.pass_test("Architecture warnings captured")
-            print(f"      Warnings: {len(warnings)}")
+            runner.log(f"      Warnings: {len(warnings)}")
             
             if warnings:
                 for w in warnings[:3]:  # Show first 3
-                    print(f"         - {w['level']}: {w['message'][:50]}...")
+                    runner.log(f"         - {w['level']}: {w['message'][:50]}...")
         else:
             runner.fail_test("Architecture warnings captured", "No warnings field")
             
     except Exception as e:
         runner.fail_test("Architecture warnings captured", str(e))
+    
+    return sum(
+        1 for outcome in (simple_outcome, complex_outcome)
+        if not isinstance(outcome, Exception)
+        and 'architecture' in outcome[0]
+        and not outcome[0].get('cache_hit')
+    )
 
 
-async def test_statistics():
-    """Test generator statistics"""
+async def test_statistics(stats_before: Dict[str, Any], expected_delta: int):
+    """
+    Test generator statistics against a snapshot, without extra LLM calls.
+    
+    Args:
+        stats_before: Generator statistics taken before the pipeline tests
+        expected_delta: Generations the pipeline tests should have recorded
+    """
     runner.print_header("STATISTICS (Phase 3)")
     
     runner.print_test("Generator statistics tracking")
@@ -370,15 +357,25 @@ async def test_statistics():
     try:
         stats = architecture_generator.get_statistics()
         
-        if 'total_requests' in stats and 'successful' in stats:
+        if 'total_requests' not in stats or 'successful' not in stats:
+            runner.fail_test("Generator statistics tracking", "Missing stats")
+            return
+        
+        delta = stats['total_requests'] - stats_before['total_requests']
+        
+        if delta == expected_delta:
             runner.pass_test("Generator statistics tracking")
-            print(f"      Total requests: {stats['total_requests']}")
-            print(f"      Successful: {stats['successful']}")
-            print(f"      Failed: {stats['failed']}")
-            print(f"      Success rate: {stats['success_rate']:.1f}%")
-            print(f"      Auto-corrections: {stats['corrections']}")
+            runner.log(f"      Requests during pipeline tests: {delta}")
+            runner.log(f"      Total requests: {stats['total_requests']}")
+            runner.log(f"      Successful: {stats['successful']}")
+            runner.log(f"      Failed: {stats['failed']}")
+            runner.log(f"      Success rate: {stats['success_rate']:.1f}%")
+            runner.log(f"      Auto-corrections: {stats['corrections']}")
         else:
-            runner.fail_test("Generator statistics tracking", "Missing stats")
+            runner.fail_test(
+                "Generator statistics tracking",
+                f"Expected {expected_delta} new request(s), got {delta}"
+            )
             
     except Exception as e:
         runner.fail_test("Generator statistics tracking", str(e))
@@ -386,41 +383,36 @@ async def test_statistics():
 
 async def main():
     """Run all Phase 3 tests"""
-    print("\n" + "=" * 60)
-    print("  PHASE 3 COMPREHENSIVE TEST SUITE")
-    print("  Architecture Generation with Claude")
-    print("=" * 60)
-    print(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    runner.log("\n" + "=" * 60)
+    runner.log("  PHASE 3 COMPREHENSIVE TEST SUITE")
+    runner.log("  Architecture Generation with Claude")
+    runner.log("=" * 60)
+    runner.log(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    runner.log("=" * 60)
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
-        # Connect to infrastructure
-        await cache_manager.connect()
-        await db_manager.connect()
-        await queue_manager.connect()
-        
-        # Run test suites
-        await test_architecture_generator()
-        await test_architecture_validator()
-        await test_error_handling()
-        await test_complete_pipeline()
-        await test_statistics()
-        
-        # Cleanup
-        await cache_manager.disconnect()
-        await db_manager.disconnect()
-        await queue_manager.disconnect()
+        # Connect once per process; reused if a driver already connected
+        async with infrastructure():
+            # Run test suites
+            await test_architecture_generator()
+            await test_architecture_validator()
+            await test_error_handling()
+            
+            stats_before = architecture_generator.get_statistics()
+            generated = await test_complete_pipeline()
+            await test_statistics(stats_before, generated)
         
     except Exception as e:
         logger.error(f"Test suite failed: {e}")
-        print(f"\n❌ Test suite crashed: {e}\n")
+        runner.log(f"\n❌ Test suite crashed: {e}\n")
+        runner.flush()
         return 1
     
     # Print summary
-    total_time = time.time() - start_time
-    print(f"\n⏱️  Total test time: {total_time:.2f}s")
+    total_time = (time.perf_counter_ns() - start_time) / 1e9
+    runner.log(f"\n⏱️  Total test time: {total_time:.2f}s")
     
     return runner.print_summary()
 
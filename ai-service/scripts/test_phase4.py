@@ -6,86 +6,264 @@ Tests Phase 4 components:
 2. Layout Validator
 3. Collision detection and resolution
 4. Complete pipeline with real layout generation
+
+Raw Llama3 replies for the fixed test inputs are recorded under
+scripts/.phase4_cache/ and replayed on later runs. Only the provider call
+is replayed: layout parsing, collision resolution, validation and every
+pipeline stage still run. Set PHASE4_USE_LIVE=1 to call the real API (and
+refresh the recordings).
 """
 import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import os
 import sys
 import time
+import uuid
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
-from app.core.database import db_manager
-from app.core.messaging import queue_manager
-from app.core.cache import cache_manager
-from app.models.schemas import AIRequest, ArchitectureDesign, ScreenDefinition
+from harness import PhaseTestRunner, infrastructure
+from app.models.schemas import (
+    AIRequest,
+    ArchitectureDesign,
+    ScreenDefinition,
+    NavigationStructure,
+    StateDefinition,
+    DataFlowDiagram
+)
+from app.models.enhanced_schemas import (
+    EnhancedLayoutDefinition,
+    EnhancedComponentDefinition,
+    PropertyValue
+)
 from app.services.generation.layout_generator import layout_generator
-from app.services.generation.layout_validator import layout_validator
+from app.services.generation.layout_validator import layout_validator, WarningCode
 from app.services.pipeline import default_pipeline
+from app.llm.base import LLMMessage, LLMProvider, LLMResponse
+from app.llm.llama3_provider import Llama3Provider
 
 
-class Phase4TestRunner:
-    """Test runner for Phase 4"""
+# Recorded Llama3 replies, keyed by the request they answer. Set
+# PHASE4_USE_LIVE=1 to bypass (and refresh) them so the real API is exercised
+RESPONSE_CACHE_DIR = Path(__file__).parent / ".phase4_cache"
+USE_LIVE = os.getenv("PHASE4_USE_LIVE") == "1"
+
+# Upper bound on concurrent LLM calls now that suites run in parallel;
+# staying under the provider's rate limit avoids retry backoff
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+@functools.lru_cache(maxsize=256)
+def _style(left: int, top: int, width: int, height: int) -> PropertyValue:
+    """
+    Shared literal style for validator fixtures.
+    
+    Cached instances are shared, so only use this where the layout is never
+    mutated (collision resolution rewrites positions in place).
+    """
+    return PropertyValue(type="literal", value={
+        "left": left,
+        "top": top,
+        "width": width,
+        "height": height
+    })
+
+
+@functools.lru_cache(maxsize=256)
+def _literal(value: str) -> PropertyValue:
+    """Shared literal text property for validator fixtures"""
+    return PropertyValue(type="literal", value=value)
+
+
+def _response_path(*parts: str) -> Path:
+    """Cache file for a recorded response, keyed by a hash of its inputs"""
+    key = hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+    return RESPONSE_CACHE_DIR / f"{key}.json"
+
+
+def _read_response(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a recorded response, or None in live mode / on a miss"""
+    if USE_LIVE or not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable recorded response {path.name}: {e}")
+        return None
+
+
+def _write_response(path: Path, payload: Dict[str, Any]) -> None:
+    """Record a response for later runs"""
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps(payload, default=str))
+    except OSError as e:
+        logger.warning(f"Could not record response {path.name}: {e}")
+
+
+_live_generate = Llama3Provider.generate
+
+
+async def _replayed_generate(
+    self: Llama3Provider,
+    messages: List[LLMMessage],
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> LLMResponse:
+    """Llama3Provider.generate(), replayed from disk for known requests"""
+    path = _response_path(
+        self.model,
+        json.dumps([[m.role, m.content] for m in messages]),
+        str(temperature),
+        str(max_tokens),
+        json.dumps(kwargs, sort_keys=True, default=str)
+    )
     
-    def __init__(self):
-        self.tests_passed = 0
-        self.tests_failed = 0
-        self.test_results = []
-    
-    def print_header(self, title: str):
-        """Print test section header"""
-        print("\n" + "=" * 60)
-        print(f"  {title}")
-        print("=" * 60 + "\n")
-    
-    def print_test(self, name: str):
-        """Print test name"""
-        print(f"[TEST] {name}...", end=" ", flush=True)
-    
-    def pass_test(self, name: str, duration_ms: int = 0):
-        """Mark test as passed"""
-        self.tests_passed += 1
-        self.test_results.append(("PASS", name, duration_ms))
-        if duration_ms > 0:
-            print(f"✅ PASS ({duration_ms}ms)")
-        else:
-            print("✅ PASS")
-    
-    def fail_test(self, name: str, error: str):
-        """Mark test as failed"""
-        self.tests_failed += 1
-        self.test_results.append(("FAIL", name, error))
-        print(f"❌ FAIL")
-        print(f"   Error: {error}")
-    
-    def print_summary(self):
-        """Print test summary"""
-        total = self.tests_passed + self.tests_failed
-        
-        print("\n" + "=" * 60)
-        print("  TEST SUMMARY")
-        print("=" * 60)
-        
-        print(f"\nTotal Tests: {total}")
-        print(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}%)")
-        print(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}%)")
-        
-        if self.tests_failed > 0:
-            print("\n❌ Failed Tests:")
-            for status, name, error in self.test_results:
-                if status == "FAIL":
-                    print(f"   - {name}: {error}")
-        
-        print("\n" + "=" * 60)
-        
-        if self.tests_failed == 0:
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60 + "\n")
-            return 0
-        else:
-            print(f"❌ {self.tests_failed} TEST(S) FAILED")
-            print("=" * 60 + "\n")
-            return 1
+    recorded = _read_response(path)
+    if recorded is not None:
+        try:
+            return LLMResponse(
+                content=recorded["content"],
+                provider=LLMProvider(recorded["provider"]),
+                tokens_used=recorded.get("tokens_used"),
+                finish_reason=recorded.get("finish_reason"),
+                model=recorded.get("model"),
+                metadata=recorded.get("metadata")
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Recorded reply no longer valid, calling the API: {e}")
+    
+    async with _llm_semaphore:
+        response = await _live_generate(self, messages, temperature, max_tokens, **kwargs)
+    _write_response(path, {
+        "content": response.content,
+        "provider": response.provider.value,
+        "tokens_used": response.tokens_used,
+        "finish_reason": response.finish_reason,
+        "model": response.model,
+        "metadata": response.metadata
+    })
+    return response
+
+
+@contextlib.contextmanager
+def _replay_llm_responses():
+    """Serve Llama3 calls from the recordings while the suite runs"""
+    Llama3Provider.generate = _replayed_generate
+    try:
+        yield
+    finally:
+        Llama3Provider.generate = _live_generate
+
+
+# Pipeline request: validated once; cases copy it with their own prompt
+PIPELINE_PROMPT = "Create a counter app with a text showing count and + - buttons"
+
+_BASE_REQUEST = AIRequest(
+    user_id="test_user_phase4",
+    session_id="test_session_phase4",
+    socket_id="test_socket_phase4",
+    prompt=PIPELINE_PROMPT
+)
+
+
+def _pipeline_request(prompt: str) -> AIRequest:
+    """
+    Copy of the base request carrying `prompt`.
+    
+    model_copy skips validation, so prompts passed here must already
+    satisfy AIRequest's length rules. Each copy gets its own task_id.
+    """
+    return _BASE_REQUEST.model_copy(
+        update={"prompt": prompt, "task_id": str(uuid.uuid4())}
+    )
+
+
+# Generator fixtures: validated once per process, shared by every run
+COUNTER_ARCH = ArchitectureDesign(
+    app_type="single-page",
+    screens=[
+        ScreenDefinition(
+            id="screen_1",
+            name="Counter",
+            purpose="Simple counter with buttons",
+            components=["Text", "Button", "Button"],
+            navigation=[]
+        )
+    ],
+    navigation=NavigationStructure(type="stack", routes=[]),
+    state_management=[
+        StateDefinition(
+            name="count",
+            type="local-state",
+            scope="screen",
+            initial_value=0
+        )
+    ],
+    data_flow=DataFlowDiagram(
+        user_interactions=["increment", "decrement"],
+        api_calls=[],
+        local_storage=[]
+    )
+)
+
+NOTES_ARCH = ArchitectureDesign(
+    app_type="multi-page",
+    screens=[
+        ScreenDefinition(
+            id="screen_1",
+            name="Notes",
+            purpose="List of saved notes with an add button",
+            components=["Text", "List", "Button"],
+            navigation=["screen_2", "screen_3"]
+        ),
+        ScreenDefinition(
+            id="screen_2",
+            name="Editor",
+            purpose="Edit a note's title and body and save it",
+            components=["InputText", "TextArea", "Button"],
+            navigation=["screen_1"]
+        ),
+        ScreenDefinition(
+            id="screen_3",
+            name="Settings",
+            purpose="Toggle dark mode and pick the font size",
+            components=["Switch", "Slider"],
+            navigation=["screen_1"]
+        )
+    ],
+    navigation=NavigationStructure(
+        type="stack",
+        routes=[
+            {"from": "screen_1", "to": "screen_2"},
+            {"from": "screen_1", "to": "screen_3"}
+        ]
+    ),
+    state_management=[
+        StateDefinition(
+            name="notes",
+            type="global-state",
+            scope="global",
+            initial_value=[]
+        )
+    ],
+    data_flow=DataFlowDiagram(
+        user_interactions=["add_note", "save_note", "toggle_theme"],
+        api_calls=[],
+        local_storage=["notes"]
+    )
+)
+
+
+class Phase4TestRunner(PhaseTestRunner):
+    """Test runner for Phase 4"""
 
 
 runner = Phase4TestRunner()
@@ -95,51 +273,22 @@ async def test_layout_generator():
     """Test Claude-powered layout generation"""
     runner.print_header("LAYOUT GENERATOR (Phase 4)")
     
-    from app.models.schemas import NavigationStructure, StateDefinition, DataFlowDiagram
-    
-    # Create test architecture
-    architecture = ArchitectureDesign(
-        app_type="single-page",
-        screens=[
-            ScreenDefinition(
-                id="screen_1",
-                name="Counter",
-                purpose="Simple counter with buttons",
-                components=["Text", "Button", "Button"],
-                navigation=[]
-            )
-        ],
-        navigation=NavigationStructure(type="stack", routes=[]),
-        state_management=[
-            StateDefinition(
-                name="count",
-                type="local-state",
-                scope="screen",
-                initial_value=0
-            )
-        ],
-        data_flow=DataFlowDiagram(
-            user_interactions=["increment", "decrement"],
-            api_calls=[],
-            local_storage=[]
-        )
-    )
-    
     # Test 1: Generate layout
     runner.print_test("Generate layout for counter screen")
     
     try:
-        start = time.time()
+        start = time.perf_counter_ns()
         layout, metadata = await layout_generator.generate(
-            architecture=architecture,
+            architecture=COUNTER_ARCH,
             screen_id="screen_1"
         )
-        duration = int((time.time() - start) * 1000)
+        duration = (time.perf_counter_ns() - start) // 1_000_000
         
         if len(layout.components) == 3:
             runner.pass_test("Generate layout for counter screen", duration)
-            print(f"      Components: {len(layout.components)}")
-            print(f"      API time: {metadata['api_duration_ms']}ms")
+            runner.log(f"      Components: {len(layout.components)}")
+            runner.log(f"      API time: {metadata['api_duration_ms']}ms")
+            runner.log(f"      Cached prompt tokens: {metadata.get('cached_prompt_tokens')}")
         else:
             runner.fail_test(
                 "Generate layout for counter screen",
@@ -148,192 +297,203 @@ async def test_layout_generator():
             
     except Exception as e:
         runner.fail_test("Generate layout for counter screen", str(e))
-
-
-async def test_layout_validator():
-    """Test layout validation"""
-    runner.print_header("LAYOUT VALIDATOR (Phase 4)")
     
-    from app.models.enhanced_schemas import (
-        EnhancedLayoutDefinition,
-        EnhancedComponentDefinition,
-        PropertyValue
-    )
+    # Test 2: Several screens in one LLM call
+    runner.print_test("Generate layouts for 3 screens in one call")
     
-    # Test 1: Valid layout
-    runner.print_test("Validate correct layout")
     
     try:
-        valid_layout = EnhancedLayoutDefinition(
-            screen_id="test_screen",
-            components=[
-                EnhancedComponentDefinition(
-                    component_id="text_1",
-                    component_type="Text",
-                    properties={
-                        "text": PropertyValue(type="literal", value="Counter: 0"),
-                        "style": PropertyValue(type="literal", value={
-                            "left": 97,
-                            "top": 100,
-                            "width": 180,
-                            "height": 40
-                        })
-                    }
-                ),
-                EnhancedComponentDefinition(
-                    component_id="btn_1",
-                    component_type="Button",
-                    properties={
-                        "text": PropertyValue(type="literal", value="+"),
-                        "style": PropertyValue(type="literal", value={
-                            "left": 127,
-                            "top": 160,
-                            "width": 120,
-                            "height": 44
-                        })
-                    }
-                )
-            ]
+        start = time.perf_counter_ns()
+        results = await layout_generator.generate_batch(
+            architecture=NOTES_ARCH,
+            screen_ids=["screen_1", "screen_2", "screen_3"]
         )
+        duration = (time.perf_counter_ns() - start) // 1_000_000
         
-        is_valid, warnings = await layout_validator.validate(valid_layout)
-        
-        if is_valid:
-            runner.pass_test("Validate correct layout")
-            print(f"      Warnings: {len(warnings)}")
+        if len(results) == 3:
+            runner.pass_test("Generate layouts for 3 screens in one call", duration)
+            for layout, metadata in results:
+                runner.log(
+                    f"      {layout.screen_id}: {len(layout.components)} component(s) "
+                    f"via {metadata.get('generation_method')}"
+                )
         else:
-            runner.fail_test("Validate correct layout", "Should be valid")
+            runner.fail_test(
+                "Generate layouts for 3 screens in one call",
+                f"Expected 3 layouts, got {len(results)}"
+            )
             
     except Exception as e:
-        runner.fail_test("Validate correct layout", str(e))
+        runner.fail_test("Generate layouts for 3 screens in one call", str(e))
+
+
+# Validator fixtures are built on first use and then reused. Built lazily
+# rather than at import so a fixture the schema rejects fails its own case.
+@functools.lru_cache(maxsize=None)
+def _valid_layout() -> EnhancedLayoutDefinition:
+    """Two well-spaced components"""
+    return EnhancedLayoutDefinition(
+        screen_id="test_screen",
+        components=[
+            EnhancedComponentDefinition(
+                component_id="text_1",
+                component_type="Text",
+                properties={
+                    "text": _literal("Counter: 0"),
+                    "style": _style(97, 100, 180, 40)
+                }
+            ),
+            EnhancedComponentDefinition(
+                component_id="btn_1",
+                component_type="Button",
+                properties={
+                    "text": _literal("+"),
+                    "style": _style(127, 160, 120, 44)
+                }
+            )
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _collision_layout() -> EnhancedLayoutDefinition:
+    """Two overlapping buttons"""
+    return EnhancedLayoutDefinition(
+        screen_id="test_screen",
+        components=[
+            EnhancedComponentDefinition(
+                component_id="btn_1",
+                component_type="Button",
+                properties={
+                    "style": _style(0, 0, 120, 44)
+                }
+            ),
+            EnhancedComponentDefinition(
+                component_id="btn_2",
+                component_type="Button",
+                properties={
+                    "style": _style(50, 20, 120, 44)  # Overlaps!
+                }
+            )
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _small_button_layout() -> EnhancedLayoutDefinition:
+    """A button below the minimum touch size"""
+    return EnhancedLayoutDefinition(
+        screen_id="test_screen",
+        components=[
+            EnhancedComponentDefinition(
+                component_id="btn_small",
+                component_type="Button",
+                properties={
+                    "style": _style(100, 100, 80, 30)  # Too small!
+                }
+            )
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _out_of_bounds_layout() -> EnhancedLayoutDefinition:
+    """A text running past the right canvas edge"""
+    return EnhancedLayoutDefinition(
+        screen_id="test_screen",
+        components=[
+            EnhancedComponentDefinition(
+                component_id="text_1",
+                component_type="Text",
+                properties={
+                    "style": _style(300, 100, 200, 40)  # Extends beyond 375!
+                }
+            )
+        ]
+    )
+
+
+async def _case_valid() -> Tuple[bool, str]:
+    """A well-formed layout validates cleanly"""
+    valid_layout = _valid_layout()
     
-    # Test 2: Detect collisions
-    runner.print_test("Detect component collisions")
+    is_valid, warnings = await layout_validator.validate(valid_layout)
+    return is_valid, (f"Warnings: {len(warnings)}" if is_valid else "Should be valid")
+
+
+async def _case_collision() -> Tuple[bool, str]:
+    """Overlapping buttons are reported as collisions"""
+    collision_layout = _collision_layout()
     
-    try:
-        collision_layout = EnhancedLayoutDefinition(
-            screen_id="test_screen",
-            components=[
-                EnhancedComponentDefinition(
-                    component_id="btn_1",
-                    component_type="Button",
-                    properties={
-                        "style": PropertyValue(type="literal", value={
-                            "left": 0,
-                            "top": 0,
-                            "width": 120,
-                            "height": 44
-                        })
-                    }
-                ),
-                EnhancedComponentDefinition(
-                    component_id="btn_2",
-                    component_type="Button",
-                    properties={
-                        "style": PropertyValue(type="literal", value={
-                            "left": 50,  # Overlaps!
-                            "top": 20,
-                            "width": 120,
-                            "height": 44
-                        })
-                    }
-                )
-            ]
-        )
-        
-        is_valid, warnings = await layout_validator.validate(collision_layout)
-        
-        collision_errors = [w for w in warnings if "overlap" in w.message.lower()]
-        
-        if not is_valid and len(collision_errors) > 0:
-            runner.pass_test("Detect component collisions")
-            print(f"      Collisions detected: {len(collision_errors)}")
-        else:
-            runner.fail_test("Detect component collisions", "Should detect collision")
-            
-    except Exception as e:
-        runner.fail_test("Detect component collisions", str(e))
+    is_valid, warnings = await layout_validator.validate(collision_layout)
     
-    # Test 3: Touch target validation
-    runner.print_test("Validate touch target sizes")
+    collision_errors = [w for w in warnings if w.code is WarningCode.OVERLAP]
     
-    try:
-        small_button_layout = EnhancedLayoutDefinition(
-            screen_id="test_screen",
-            components=[
-                EnhancedComponentDefinition(
-                    component_id="btn_small",
-                    component_type="Button",
-                    properties={
-                        "style": PropertyValue(type="literal", value={
-                            "left": 100,
-                            "top": 100,
-                            "width": 80,
-                            "height": 30  # Too small!
-                        })
-                    }
-                )
-            ]
-        )
-        
-        is_valid, warnings = await layout_validator.validate(small_button_layout)
-        
-        touch_errors = [w for w in warnings if "touch target" in w.message.lower()]
-        
-        if not is_valid and len(touch_errors) > 0:
-            runner.pass_test("Validate touch target sizes")
-            print(f"      Touch target errors: {len(touch_errors)}")
-        else:
-            runner.fail_test("Validate touch target sizes", "Should detect small touch target")
-            
-    except Exception as e:
-        runner.fail_test("Validate touch target sizes", str(e))
+    if not is_valid and collision_errors:
+        return True, f"Collisions detected: {len(collision_errors)}"
+    return False, "Should detect collision"
+
+
+async def _case_touch() -> Tuple[bool, str]:
+    """Buttons under the minimum touch size are rejected"""
+    small_button_layout = _small_button_layout()
     
-    # Test 4: Bounds checking
-    runner.print_test("Validate component bounds")
+    is_valid, warnings = await layout_validator.validate(small_button_layout)
     
-    try:
-        out_of_bounds_layout = EnhancedLayoutDefinition(
-            screen_id="test_screen",
-            components=[
-                EnhancedComponentDefinition(
-                    component_id="text_1",
-                    component_type="Text",
-                    properties={
-                        "style": PropertyValue(type="literal", value={
-                            "left": 300,
-                            "top": 100,
-                            "width": 200,  # Extends beyond 375!
-                            "height": 40
-                        })
-                    }
-                )
-            ]
-        )
-        
-        is_valid, warnings = await layout_validator.validate(out_of_bounds_layout)
+    touch_errors = [w for w in warnings if w.code is WarningCode.TOUCH_TARGET]
+    
+    if not is_valid and touch_errors:
+        return True, f"Touch target errors: {len(touch_errors)}"
+    return False, "Should detect small touch target"
+
+
+async def _case_bounds() -> Tuple[bool, str]:
+    """Components extending past the canvas are rejected"""
+    out_of_bounds_layout = _out_of_bounds_layout()
+    
+    is_valid, warnings = await layout_validator.validate(out_of_bounds_layout)
+    
+    bounds_errors = [w for w in warnings if w.code is WarningCode.OUT_OF_BOUNDS]
+    
+    if not is_valid and bounds_errors:
+        return True, f"Bounds errors: {len(bounds_errors)}"
+    return False, "Should detect out of bounds"
+
+
+async def test_layout_validator():
+    """Test layout validation"""
+    runner.print_header("LAYOUT VALIDATOR (Phase 4)")
+    
+    cases = [
+        ("Validate correct layout", _case_valid),
+        ("Detect component collisions", _case_collision),
+        ("Validate touch target sizes", _case_touch),
+        ("Validate component bounds", _case_bounds),
+    ]
+    
+    # validate() never suspends, so each call finishes on the shared
+    # layout_validator before another suite's task can run; the loop is
+    # sequential only to keep this suite's report in case order
+    for name, case in cases:
+        runner.print_test(name)
         
-        bounds_errors = [w for w in warnings if "beyond" in w.message.lower()]
+        try:
+            ok, detail = await case()
+        except Exception as e:
+            runner.fail_test(name, str(e))
+            continue
         
-        if not is_valid and len(bounds_errors) > 0:
-            runner.pass_test("Validate component bounds")
-            print(f"      Bounds errors: {len(bounds_errors)}")
+        if ok:
+            runner.pass_test(name)
+            runner.log(f"      {detail}")
         else:
-            runner.fail_test("Validate component bounds", "Should detect out of bounds")
-            
-    except Exception as e:
-        runner.fail_test("Validate component bounds", str(e))
+            runner.fail_test(name, detail)
 
 
 async def test_collision_resolution():
     """Test collision detection and resolution"""
     runner.print_header("COLLISION RESOLUTION (Phase 4)")
     
-    from app.models.enhanced_schemas import (
-        EnhancedComponentDefinition,
-        PropertyValue
-    )
-    
     runner.print_test("Resolve overlapping components")
     
     try:
@@ -378,7 +538,7 @@ async def test_collision_resolution():
         
         if not overlap:
             runner.pass_test("Resolve overlapping components")
-            print(f"      Components repositioned successfully")
+            runner.log(f"      Components repositioned successfully")
         else:
             runner.fail_test("Resolve overlapping components", "Still overlapping after resolution")
             
@@ -386,76 +546,87 @@ async def test_collision_resolution():
         runner.fail_test("Resolve overlapping components", str(e))
 
 
-async def test_complete_pipeline():
-    """Test complete Phase 4 pipeline"""
+def _extract_components(layout: Any) -> List[Dict[str, Any]]:
+    """Components of a pipeline layout (first screen for multi-screen apps)"""
+    if not isinstance(layout, dict):
+        return []
+    if 'components' in layout:
+        # Single screen layout
+        return layout['components']
+    # Multiple screens, get first
+    first = next(iter(layout.values()), {})
+    return first.get('components', []) if isinstance(first, dict) else []
+
+
+async def test_complete_pipeline() -> Optional[Dict[str, Any]]:
+    """
+    Test complete Phase 4 pipeline.
+    
+    The pipeline runs once; both checks read slices taken from that one
+    result.
+    
+    Returns:
+        Pipeline result, or None if the pipeline failed
+    """
     runner.print_header("COMPLETE PIPELINE (Phase 4)")
     
-    # Test 1: Simple app with layout
-    runner.print_test("Pipeline with layout generation")
+    request = _pipeline_request(PIPELINE_PROMPT)
+    
+    result = None
+    error = None
     
     try:
-        start = time.time()
-        
-        request = AIRequest(
-            user_id="test_user_phase4",
-            session_id="test_session_phase4",
-            socket_id="test_socket_phase4",
-            prompt="Create a counter app with a text showing count and + - buttons"
-        )
-        
+        start = time.perf_counter_ns()
         result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
-        
-        # Verify layout was generated
-        if 'layout' in result:
-            layout = result['layout']
-            
-            # Handle both single and multiple screen layouts
-            if isinstance(layout, dict):
-                if 'components' in layout:
-                    # Single screen layout
-                    components = layout['components']
-                else:
-                    # Multiple screens, get first
-                    components = list(layout.values())[0].get('components', [])
-            else:
-                components = []
-            
-            if len(components) > 0:
-                runner.pass_test("Pipeline with layout generation", duration)
-                print(f"      Components: {len(components)}")
-                print(f"      Total time: {result.get('total_time_ms', 0)}ms")
-            else:
-                runner.fail_test("Pipeline with layout generation", "No components generated")
-        else:
-            runner.fail_test("Pipeline with layout generation", "No layout in result")
-            
+        duration = (time.perf_counter_ns() - start) // 1_000_000
     except Exception as e:
-        runner.fail_test("Pipeline with layout generation", str(e))
+        error = str(e)
+    
+    # Test 1: Simple app with layout
+    runner.print_test("Pipeline with layout generation")
+    
+    if result is None:
+        runner.fail_test("Pipeline with layout generation", error)
+        runner.print_test("Layout warnings captured")
+        runner.fail_test("Layout warnings captured", "Pipeline produced no result")
+        return None
+    
+    has_layout = 'layout' in result
+    components = _extract_components(result.get('layout'))
+    warnings = result.get('layout_warnings', [])
+    
+    if not has_layout:
+        runner.fail_test("Pipeline with layout generation", "No layout in result")
+    elif components:
+        runner.pass_test("Pipeline with layout generation", duration)
+        runner.log(f"      Components: {len(components)}")
+        runner.log(f"      Total time: {result.get('total_time_ms', 0)}ms")
+    else:
+        runner.fail_test("Pipeline with layout generation", "No components generated")
     
     # Test 2: Verify warnings captured
     runner.print_test("Layout warnings captured")
     
-    try:
-        if 'layout_warnings' in result:
-            warnings = result['layout_warnings']
-            runner.pass_test("Layout warnings captured")
-            print(f"      Warnings: {len(warnings)}")
-            
-            if warnings:
-                for w in warnings[:3]:  # Show first 3
-                    print(f"         - {w['level']}: {w['message'][:50]}...")
-        else:
-            # Warnings might be empty, that's ok
-            runner.pass_test("Layout warnings captured")
-            print(f"      No warnings (clean layout)")
-            
-    except Exception as e:
-        runner.fail_test("Layout warnings captured", str(e))
+    # Warnings might be empty, that's ok
+    runner.pass_test("Layout warnings captured")
+    if warnings:
+        runner.log(f"      Warnings: {len(warnings)}")
+        for w in warnings[:3]:  # Show first 3
+            runner.log(f"         - {w['level']}: {w['message'][:50]}...")
+    else:
+        runner.log(f"      No warnings (clean layout)")
+    
+    return result
 
 
-async def test_statistics():
-    """Test generator statistics"""
+async def test_statistics(pipeline_result: Optional[Dict[str, Any]] = None):
+    """
+    Test generator statistics.
+    
+    Args:
+        pipeline_result: Result from test_complete_pipeline, reused rather
+            than re-running the pipeline
+    """
     runner.print_header("STATISTICS (Phase 4)")
     
     runner.print_test("Layout generator statistics")
@@ -465,10 +636,12 @@ async def test_statistics():
         
         if 'total_requests' in stats and 'successful' in stats:
             runner.pass_test("Layout generator statistics")
-            print(f"      Total requests: {stats['total_requests']}")
-            print(f"      Successful: {stats['successful']}")
-            print(f"      Success rate: {stats['success_rate']:.1f}%")
-            print(f"      Collisions resolved: {stats['collisions_resolved']}")
+            runner.log(f"      Total requests: {stats['total_requests']}")
+            runner.log(f"      Successful: {stats['successful']}")
+            runner.log(f"      Success rate: {stats['success_rate']:.1f}%")
+            runner.log(f"      Collisions resolved: {stats['collisions_resolved']}")
+            if pipeline_result is not None:
+                runner.log(f"      Pipeline total time: {pipeline_result.get('total_time_ms', 0)}ms")
         else:
             runner.fail_test("Layout generator statistics", "Missing stats")
             
@@ -478,41 +651,38 @@ async def test_statistics():
 
 async def main():
     """Run all Phase 4 tests"""
-    print("\n" + "=" * 60)
-    print("  PHASE 4 COMPREHENSIVE TEST SUITE")
-    print("  Layout Generation with Claude")
-    print("=" * 60)
-    print(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    runner.log("\n" + "=" * 60)
+    runner.log("  PHASE 4 COMPREHENSIVE TEST SUITE")
+    runner.log("  Layout Generation with Claude")
+    runner.log("=" * 60)
+    runner.log(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    runner.log("=" * 60)
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
-        # Connect to infrastructure
-        await cache_manager.connect()
-        await db_manager.connect()
-        await queue_manager.connect()
-        
-        # Run test suites
-        await test_layout_generator()
-        await test_layout_validator()
-        await test_collision_resolution()
-        await test_complete_pipeline()
-        await test_statistics()
-        
-        # Cleanup
-        await cache_manager.disconnect()
-        await db_manager.disconnect()
-        await queue_manager.disconnect()
+        # Connect once per process; reused if a driver already connected
+        with _replay_llm_responses():
+            async with infrastructure():
+                # Independent suites overlap their LLM latency; statistics
+                # reads the counters they leave behind, so it runs last
+                *_, pipeline_result = await runner.run_concurrently(
+                    test_layout_generator,
+                    test_layout_validator,
+                    test_collision_resolution,
+                    test_complete_pipeline
+                )
+                await test_statistics(pipeline_result)
         
     except Exception as e:
         logger.error(f"Test suite failed: {e}")
-        print(f"\n❌ Test suite crashed: {e}\n")
+        runner.log(f"\n❌ Test suite crashed: {e}\n")
+        runner.flush()
         return 1
     
     # Print summary
-    total_time = time.time() - start_time
-    print(f"\n⏱️  Total test time: {total_time:.2f}s")
+    total_time = (time.perf_counter_ns() - start_time) / 1e9
+    runner.log(f"\n⏱️  Total test time: {total_time:.2f}s")
     
     return runner.print_summary()
 
@@ -8,102 +8,245 @@ Tests Phase 5 components:
 4. Complete pipeline with full generation
 """
 import asyncio
+import contextlib
+import functools
+import hashlib
+import os
+import re
 import sys
 import time
+from collections import Counter
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import orjson
 from loguru import logger
-from app.core.database import db_manager
-from app.core.messaging import queue_manager
-from app.core.cache import cache_manager
-from app.models.schemas import AIRequest
+from harness import PhaseTestRunner, infrastructure
+from app.models.schemas import (
+    AIRequest,
+    ArchitectureDesign,
+    ScreenDefinition,
+    NavigationStructure,
+    StateDefinition,
+    DataFlowDiagram
+)
+from app.models.enhanced_schemas import (
+    EnhancedLayoutDefinition,
+    EnhancedComponentDefinition,
+    PropertyValue
+)
+from app.services.generation.architecture_generator import architecture_generator
+from app.services.generation.layout_generator import layout_generator
 from app.services.generation.blockly_generator import blockly_generator
 from app.services.generation.blockly_validator import blockly_validator
 from app.services.pipeline import default_pipeline
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
-class Phase5TestRunner:
+
+# Machine-readable results land beside the other suites' reports
+REPORT_DIR = Path(__file__).parent.parent / "tests" / "test_reports"
+
+class Phase5TestRunner(PhaseTestRunner):
     """Test runner for Phase 5"""
     
-    def __init__(self):
-        self.tests_passed = 0
-        self.tests_failed = 0
-        self.test_results = []
-    
-    def print_header(self, title: str):
-        """Print test section header"""
-        print("\n" + "=" * 60)
-        print(f"  {title}")
-        print("=" * 60 + "\n")
-    
-    def print_test(self, name: str):
-        """Print test name"""
-        print(f"[TEST] {name}...", end=" ", flush=True)
-    
-    def pass_test(self, name: str, details: str = "", duration_ms: int = 0):
-        """Mark test as passed"""
+    def pass_test(
+        self,
+        name: str,
+        details: str = "",
+        duration_ms: int = 0,
+        extras: Optional[List[str]] = None
+    ):
+        """
+        Mark test as passed.
+        
+        Args:
+            name: Test name
+            details: Summary shown on the PASS line
+            duration_ms: Test duration, shown when non-zero
+            extras: Lines printed under the PASS line, in the same write
+        """
         self.tests_passed += 1
         extra = f" ({duration_ms}ms)" if duration_ms > 0 else ""
         extra += f" | {details}" if details else ""
         self.test_results.append(("PASS", name, details or "Success"))
-        print(f"✅ PASS{extra}")
+        self.log("\n".join([f"✅ PASS{extra}", *(extras or ())]))
     
     def fail_test(self, name: str, error: str):
         """Mark test as failed"""
         self.tests_failed += 1
         self.test_results.append(("FAIL", name, error))
-        print(f"❌ FAIL")
-        print(f"   Error: {error}")
+        self.log(f"❌ FAIL")
+        self.log(f"   Error: {error}")
     
-    def print_summary(self):
-        """Print test summary"""
-        total = self.tests_passed + self.tests_failed
+    @contextlib.asynccontextmanager
+    async def track(self, name: str):
+        """
+        Run one test: announce it, time it and record the outcome.
         
-        print("\n" + "=" * 60)
-        print("  TEST SUMMARY")
-        print("=" * 60)
+        The body sets `t.details` for the PASS line and may append to
+        `t.notes`, which are printed under it. Raising fails the test with
+        the exception message.
         
-        print(f"\nTotal Tests: {total}")
-        print(f"Passed: {self.tests_passed} ({self.tests_passed/total*100:.1f}% if total > 0 else 0}%)")
-        print(f"Failed: {self.tests_failed} ({self.tests_failed/total*100:.1f}% if total > 0 else 0}%)")
+        Usage:
+            async with runner.track("Validate something") as t:
+                t.details = "3 warnings"
+        """
+        self.print_test(name)
+        t = SimpleNamespace(details="", notes=[])
+        start = time.perf_counter_ns()
         
-        if self.tests_failed > 0:
-            print("\n❌ Failed Tests:")
-            for status, name, error in self.test_results:
-                if status == "FAIL":
-                    print(f"   - {name}: {error}")
+        try:
+            yield t
+        except Exception as e:
+            self.fail_test(name, str(e))
+            return
         
-        print("\n" + "=" * 60)
+        self.pass_test(
+            name,
+            t.details,
+            (time.perf_counter_ns() - start) // 1_000_000,
+            extras=t.notes
+        )
+    
+    def write_report(self) -> Path:
+        """
+        Write the results as JSON next to the other test reports.
         
-        if self.tests_failed == 0:
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60 + "\n")
-            return 0
-        else:
-            print(f"❌ {self.tests_failed} TEST(S) FAILED")
-            print("=" * 60 + "\n")
-            return 1
+        Returns:
+            Path of the report file
+        """
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPORT_DIR / f"phase5_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        
+        path.write_bytes(orjson.dumps({
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "passed": self.tests_passed,
+            "failed": self.tests_failed,
+            "results": [
+                {"status": status, "name": name, "detail": detail}
+                for status, name, detail in self.test_results
+            ]
+        }, option=orjson.OPT_INDENT_2))
+        
+        return path
+    
+    def print_summary(self):
+        """Write the JSON report, then print the test summary"""
+        self.write_report()
+        return super().print_summary()
 
 
 runner = Phase5TestRunner()
 
 
-async def test_blockly_generator():
-    """Test Claude-powered Blockly generation"""
-    runner.print_header("BLOCKLY GENERATOR (Phase 5)")
+# Reuse pipeline results for repeated prompts within a process. Off by
+# default so CI always exercises the live pipeline.
+USE_PIPELINE_CACHE = os.getenv("PHASE5_TEST_CACHE") == "1"
+
+# Reuse validator results for identical payloads within a process. Off by
+# default so every run exercises the live validator.
+USE_VALIDATE_CACHE = os.getenv("PHASE5_VALIDATE_CACHE") == "1"
+
+# Structural-only runs: answer generator and pipeline calls with canned
+# results instead of calling the LLM
+DRY_RUN = os.getenv("PHASE5_DRY_RUN") == "1"
+
+# Skip the generators' retry back-off (2s, 4s, ...) so a flaky endpoint
+# fails fast instead of stretching the suite
+FAST_RETRY = os.getenv("PHASE5_FAST_SLEEP") == "1"
+
+if FAST_RETRY:
+    for _generator in (architecture_generator, layout_generator, blockly_generator):
+        _generator.retry_delay = 0
+
+_pipeline_cache: Dict[str, Dict[str, Any]] = {}
+_pipeline_lock = asyncio.Lock()
+
+
+async def _cached_execute(request: AIRequest) -> Dict[str, Any]:
+    """default_pipeline.execute(), memoized on the prompt when enabled"""
+    if DRY_RUN:
+        return _dry_run_pipeline_result()
     
-    from app.models.schemas import (
-        ArchitectureDesign, ScreenDefinition, NavigationStructure,
-        StateDefinition, DataFlowDiagram
-    )
-    from app.models.enhanced_schemas import (
-        EnhancedLayoutDefinition, EnhancedComponentDefinition, PropertyValue
+    if not USE_PIPELINE_CACHE:
+        return await default_pipeline.execute(request)
+    
+    # Held across the call so concurrent cases with the same prompt share
+    # one execution instead of racing to fill the cache
+    async with _pipeline_lock:
+        cached = _pipeline_cache.get(request.prompt)
+        if cached is not None:
+            return cached
+        
+        result = await default_pipeline.execute(request)
+        _pipeline_cache[request.prompt] = result
+        return result
+
+
+async def _generate_blockly(
+    architecture: ArchitectureDesign,
+    layouts: Dict[str, EnhancedLayoutDefinition]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """blockly_generator.generate(), or a canned result in dry-run mode"""
+    if DRY_RUN:
+        return VALID_BLOCKLY, {"api_duration_ms": 0, "model": "stub"}
+    
+    return await blockly_generator.generate(
+        architecture=architecture,
+        layouts=layouts
     )
+
+
+def _dry_run_pipeline_result() -> Dict[str, Any]:
+    """Pipeline result shaped like default_pipeline.execute() output"""
+    return {
+        "architecture": _counter_architecture().model_dump(),
+        "layout": {"screen_1": _counter_layout().model_dump()},
+        "blockly": VALID_BLOCKLY,
+        "blockly_warnings": [],
+        "stage_times": {
+            "architecture_generation": 0,
+            "layout_generation": 0,
+            "blockly_generation": 0
+        },
+        "total_time_ms": 0
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _style(left: int, top: int, width: int, height: int) -> PropertyValue:
+    """
+    Shared literal style for generator fixtures.
     
-    # Create test data
-    architecture = ArchitectureDesign(
+    Cached instances are shared, so only use this where the layout is never
+    mutated.
+    """
+    return PropertyValue(type="literal", value={
+        "left": left,
+        "top": top,
+        "width": width,
+        "height": height
+    })
+
+
+@functools.lru_cache(maxsize=64)
+def _literal(value: str) -> PropertyValue:
+    """Shared literal text property for generator fixtures"""
+    return PropertyValue(type="literal", value=value)
+
+
+# Generator fixtures: validated on first use, then shared by every run
+@functools.lru_cache(maxsize=None)
+def _counter_architecture() -> ArchitectureDesign:
+    """Single-screen counter architecture"""
+    return ArchitectureDesign(
         app_type="single-page",
         screens=[
             ScreenDefinition(
@@ -129,8 +272,12 @@ async def test_blockly_generator():
             local_storage=[]
         )
     )
-    
-    layout = EnhancedLayoutDefinition(
+
+
+@functools.lru_cache(maxsize=None)
+def _counter_layout() -> EnhancedLayoutDefinition:
+    """Layout for the counter screen: a count label and +/- buttons"""
+    return EnhancedLayoutDefinition(
         screen_id="screen_1",
         components=[
             EnhancedComponentDefinition(
@@ -138,327 +285,316 @@ async def test_blockly_generator():
                 component_type="Text",
                 properties={
                     "value": PropertyValue(type="variable", value="count"),
-                    "style": PropertyValue(type="literal", value={
-                        "left": 97, "top": 100, "width": 180, "height": 40
-                    })
+                    "style": _style(97, 100, 180, 40)
                 }
             ),
             EnhancedComponentDefinition(
                 component_id="btn_increment",
                 component_type="Button",
                 properties={
-                    "value": PropertyValue(type="literal", value="+"),
-                    "style": PropertyValue(type="literal", value={
-                        "left": 50, "top": 160, "width": 120, "height": 44
-                    })
+                    "value": _literal("+"),
+                    "style": _style(50, 160, 120, 44)
                 }
             ),
             EnhancedComponentDefinition(
                 component_id="btn_decrement",
                 component_type="Button",
                 properties={
-                    "value": PropertyValue(type="literal", value="-"),
-                    "style": PropertyValue(type="literal", value={
-                        "left": 200, "top": 160, "width": 120, "height": 44
-                    })
+                    "value": _literal("-"),
+                    "style": _style(200, 160, 120, 44)
                 }
             )
         ]
     )
+
+
+def _top_level_blocks(blockly: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Top-level block list of a Blockly workspace, or [] if absent"""
+    workspace = blockly.get('blocks') or {}
+    return workspace.get('blocks') or []
+
+
+async def test_blockly_generator():
+    """Test Claude-powered Blockly generation"""
+    runner.print_header("BLOCKLY GENERATOR (Phase 5)")
     
-    # Test generation
-    runner.print_test("Generate Blockly for counter app")
+    # Shared fixtures; treat as read-only
+    architecture = _counter_architecture()
+    layout = _counter_layout()
     
-    try:
-        start = time.time()
-        blockly, metadata = await blockly_generator.generate(
+    # Test generation
+    async with runner.track("Generate Blockly for counter app") as t:
+        blockly, metadata = await _generate_blockly(
             architecture=architecture,
             layouts={"screen_1": layout}
         )
-        duration = int((time.time() - start) * 1000)
         
-        block_count = len(blockly.get('blocks', {}).get('blocks', []))
+        block_count = len(_top_level_blocks(blockly))
         var_count = len(blockly.get('variables', []))
         
-        if block_count > 0:
-            runner.pass_test(
-                "Generate Blockly for counter app",
-                details=f"{block_count} blocks, {var_count} vars",
-                duration_ms=duration
-            )
-            print(f"      API time: {metadata.get('api_duration_ms', 'N/A')}ms")
-            print(f"      Model: {metadata.get('model', 'unknown')}")
-        else:
-            runner.fail_test("Generate Blockly for counter app", "No blocks generated")
-            
-    except Exception as e:
-        runner.fail_test("Generate Blockly for counter app", str(e))
+        if block_count == 0:
+            raise AssertionError("No blocks generated")
+        
+        t.details = f"{block_count} blocks, {var_count} vars"
+        t.notes.append(f"      API time: {metadata.get('api_duration_ms', 'N/A')}ms")
+        t.notes.append(f"      Model: {metadata.get('model', 'unknown')}")
+
+
+# Validation results by payload digest, used when USE_VALIDATE_CACHE is
+# set; identical payloads then reuse the first result
+_validate_cache: Dict[bytes, Tuple[bool, List[Any]]] = {}
+
+
+def _payload_key(payload: Dict[str, Any]) -> bytes:
+    """Digest of the payload's canonical JSON encoding"""
+    return hashlib.blake2b(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).digest()
+
+
+async def _validate_cases(
+    cases: List[Tuple[str, Dict[str, Any], bytes, Any]]
+) -> List[Tuple[bool, List[Any]]]:
+    """
+    Validation result per case, in order.
+    
+    With USE_VALIDATE_CACHE set, results already cached by digest are
+    reused and only the rest are validated.
+    """
+    if not USE_VALIDATE_CACHE:
+        return [await blockly_validator.validate(payload) for _, payload, _, _ in cases]
+    
+    pending = [(payload, key) for _, payload, key, _ in cases if key not in _validate_cache]
+    
+    if pending:
+        for payload, key in pending:
+            _validate_cache[key] = await blockly_validator.validate(payload)
+    
+    return [_validate_cache[key] for _, _, key, _ in cases]
+
+
+# Validator payloads: parsed once from the sidecar JSON file and shared by
+# the checks below; treat as read-only
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "phase5_blockly.json"
+_fixtures = orjson.loads(FIXTURES_PATH.read_bytes())
+
+VALID_BLOCKLY = _fixtures["valid"]
+DUPLICATE_BLOCKLY = _fixtures["duplicate"]
+UNDEFINED_VAR_BLOCKLY = _fixtures["undefined_var"]
+BAD_VARS_BLOCKLY = _fixtures["bad_vars"]  # one variable missing a name, one an id
+
+
+# Keywords the checks look for in warning messages, by category. One
+# precompiled alternation scans each message once for all of them.
+_KEYWORD_CATEGORIES = {
+    "duplicate": "duplicate",
+    "undefined": "undefined",
+    "not declared": "undefined",
+    "variable": "variable",
+}
+_KEYWORDS = re.compile("|".join(map(re.escape, _KEYWORD_CATEGORIES)), re.IGNORECASE)
+
+
+def _keyword_counts(warnings: List[Any]) -> Counter:
+    """Number of warnings mentioning each keyword category"""
+    counts = Counter()
+    for w in warnings:
+        counts.update({
+            _KEYWORD_CATEGORIES[match.group(0).lower()]
+            for match in _KEYWORDS.finditer(w.message)
+        })
+    return counts
+
+
+def _check_valid(is_valid: bool, warnings: List[Any]) -> Tuple[bool, str]:
+    """Correct Blockly passes validation"""
+    if is_valid:
+        return True, f"{len(warnings)} warnings"
+    return False, "Marked invalid when should be valid"
+
+
+def _check_duplicates(is_valid: bool, warnings: List[Any]) -> Tuple[bool, str]:
+    """Reused block IDs are reported as errors"""
+    # Valid output can't have reported duplicates; skip the scan
+    dup_count = 0 if is_valid else _keyword_counts(warnings)["duplicate"]
+    
+    if dup_count > 0:
+        return True, f"{dup_count} detected"
+    return False, "Failed to detect duplicates"
+
+
+def _check_undefined(is_valid: bool, warnings: List[Any]) -> Tuple[bool, str]:
+    """References to undeclared variables are flagged"""
+    undef_count = _keyword_counts(warnings)["undefined"]
+    
+    if undef_count > 0:
+        return True, f"{undef_count} found"
+    return False, "Missed undefined variable"
+
+
+def _check_variables(is_valid: bool, warnings: List[Any]) -> Tuple[bool, str]:
+    """Variables missing a name or id are flagged"""
+    var_count = _keyword_counts(warnings)["variable"]
+    
+    if var_count >= 2:
+        return True, f"{var_count} issues"
+    return False, "Failed to catch malformed variables"
+
+
+# (name, payload, digest, check); fixtures never change, so each digest is
+# computed once at import rather than on every run
+VALIDATOR_CASES = [
+    (name, payload, _payload_key(payload), check)
+    for name, payload, check in [
+        ("Validate correct Blockly", VALID_BLOCKLY, _check_valid),
+        ("Detect duplicate block IDs", DUPLICATE_BLOCKLY, _check_duplicates),
+        ("Detect undefined variable references", UNDEFINED_VAR_BLOCKLY, _check_undefined),
+        ("Validate variable structure", BAD_VARS_BLOCKLY, _check_variables),
+    ]
+]
 
 
 async def test_blockly_validator():
     """Test Blockly validation"""
     runner.print_header("BLOCKLY VALIDATOR (Phase 5)")
     
-    # Test 1: Valid Blockly
-    runner.print_test("Validate correct Blockly")
-    try:
-        valid_blockly = {
-            'blocks': {
-                'languageVersion': 0,
-                'blocks': [
-                    {
-                        'type': 'component_event',
-                        'id': 'event_1',
-                        'fields': {
-                            'COMPONENT': 'btn_increment',
-                            'EVENT': 'onPress'
-                        },
-                        'next': {
-                            'block': {
-                                'type': 'state_set',
-                                'id': 'action_1',
-                                'fields': {'VAR': 'count'},
-                                'inputs': {
-                                    'VALUE': {
-                                        'block': {
-                                            'type': 'math_arithmetic',
-                                            'fields': {'OP': 'ADD'},
-                                            'inputs': {
-                                                'A': {'block': {'type': 'variables_get', 'fields': {'VAR': 'count'}}},
-                                                'B': {'block': {'type': 'math_number', 'fields': {'NUM': 1}}}
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                ]
-            },
-            'variables': [{'name': 'count', 'id': 'var_1', 'type': ''}]
-        }
-        
-        is_valid, warnings = await blockly_validator.validate(valid_blockly)
-        
-        if is_valid:
-            runner.pass_test("Validate correct Blockly", details=f"{len(warnings)} warnings")
-        else:
-            runner.fail_test("Validate correct Blockly", "Marked invalid when should be valid")
-            
-    except Exception as e:
-        runner.fail_test("Validate correct Blockly", str(e))
-    
-    # Test 2: Duplicate block IDs
-    runner.print_test("Detect duplicate block IDs")
+    # Validate every case first, then report in a fixed order so the
+    # output stays stable. A validator error fails each case with it.
     try:
-        duplicate_blockly = {
-            'blocks': {
-                'languageVersion': 0,
-                'blocks': [
-                    {'type': 'block_a', 'id': 'dup_1'},
-                    {'type': 'block_b', 'id': 'dup_1'}
-                ]
-            },
-            'variables': []
-        }
-        
-        is_valid, warnings = await blockly_validator.validate(duplicate_blockly)
-        dup_errors = [w for w in warnings if "duplicate" in w.message.lower()]
-        
-        if not is_valid and len(dup_errors) > 0:
-            runner.pass_test("Detect duplicate block IDs", details=f"{len(dup_errors)} detected")
-        else:
-            runner.fail_test("Detect duplicate block IDs", "Failed to detect duplicates")
-            
+        results = await _validate_cases(VALIDATOR_CASES)
     except Exception as e:
-        runner.fail_test("Detect duplicate block IDs", str(e))
+        results = [e] * len(VALIDATOR_CASES)
     
-    # Test 3: Undefined variables
-    runner.print_test("Detect undefined variable references")
-    try:
-        undefined_var_blockly = {
-            'blocks': {
-                'languageVersion': 0,
-                'blocks': [{
-                    'type': 'variables_get',
-                    'id': 'get_1',
-                    'fields': {'VAR': 'missing_var'}
-                }]
-            },
-            'variables': [{'name': 'count', 'id': 'var_1'}]
-        }
+    for (name, _, _, check), outcome in zip(VALIDATOR_CASES, results):
+        runner.print_test(name)
         
-        is_valid, warnings = await blockly_validator.validate(undefined_var_blockly)
-        undef_warnings = [w for w in warnings if "undefined" in w.message.lower() or "not declared" in w.message.lower()]
+        if isinstance(outcome, Exception):
+            runner.fail_test(name, str(outcome))
+            continue
         
-        if len(undef_warnings) > 0:
-            runner.pass_test("Detect undefined variable references", details=f"{len(undef_warnings)} found")
-        else:
-            runner.fail_test("Detect undefined variable references", "Missed undefined variable")
-            
-    except Exception as e:
-        runner.fail_test("Detect undefined variable references", str(e))
-    
-    # Test 4: Invalid variable structure
-    runner.print_test("Validate variable structure")
-    try:
-        bad_vars = {
-            'blocks': {'languageVersion': 0, 'blocks': []},
-            'variables': [
-                {'name': 'ok', 'id': 'v1'},
-                {'id': 'v2'},           # missing name
-                {'name': 'v3'}          # missing id
-            ]
-        }
-        
-        is_valid, warnings = await blockly_validator.validate(bad_vars)
-        var_errors = [w for w in warnings if 'variable' in w.message.lower()]
+        try:
+            ok, detail = check(*outcome)
+        except Exception as e:
+            runner.fail_test(name, str(e))
+            continue
         
-        if len(var_errors) >= 2:
-            runner.pass_test("Validate variable structure", details=f"{len(var_errors)} issues")
+        if ok:
+            runner.pass_test(name, details=detail)
         else:
-            runner.fail_test("Validate variable structure", "Failed to catch malformed variables")
-            
-    except Exception as e:
-        runner.fail_test("Validate variable structure", str(e))
+            runner.fail_test(name, detail)
 
 
 async def test_complete_pipeline():
     """Test complete Phase 5 pipeline"""
     runner.print_header("COMPLETE PIPELINE (Phase 5)")
     
-    result = None  # Define early to avoid NameError
+    request = AIRequest(
+        user_id="test_user_phase5",
+        session_id="test_session_phase5",
+        socket_id="test_socket_phase5",
+        prompt="Create a counter app with a display and + - buttons"
+    )
+    
+    result: Optional[Dict[str, Any]] = None
     
-    # Test 1: Full generation pipeline
-    runner.print_test("Complete pipeline with all generations")
-    try:
-        start = time.time()
-        
-        request = AIRequest(
-            user_id="test_user_phase5",
-            session_id="test_session_phase5",
-            socket_id="test_socket_phase5",
-            prompt="Create a counter app with a display and + - buttons"
-        )
-        
-        result = await default_pipeline.execute(request)
-        duration = int((time.time() - start) * 1000)
+    # Test 1: Full generation pipeline. The pipeline runs once here; the
+    # checks below only read its result.
+    async with runner.track("Complete pipeline with all generations") as t:
+        result = await _cached_execute(request)
         
         # Check required keys
-        has_arch = 'architecture' in result
-        has_layout = 'layout' in result
-        has_blockly = 'blockly' in result
+        missing = [k for k in ('architecture', 'layout', 'blockly') if k not in result]
+        if missing:
+            raise AssertionError(f"Missing: {', '.join(missing)}")
         
-        if has_arch and has_layout and has_blockly:
-            arch = result['architecture']
-            screens = len(arch.get('screens', []))
-            blocks = len(result['blockly'].get('blocks', {}).get('blocks', []))
-            
-            runner.pass_test(
-                "Complete pipeline with all generations",
-                details=f"{screens} screen(s), {blocks} block(s)",
-                duration_ms=duration
-            )
-            print(f"      Total time: {result.get('total_time_ms', 'N/A')}ms")
-        else:
-            missing = [k for k, v in [('architecture', has_arch), ('layout', has_layout), ('blockly', has_blockly)] if not v]
-            runner.fail_test("Complete pipeline with all generations", f"Missing: {', '.join(missing)}")
-            
-    except Exception as e:
-        runner.fail_test("Complete pipeline with all generations", str(e))
+        screens = len(result['architecture'].get('screens', []))
+        blocks = len(_top_level_blocks(result['blockly']))
+        
+        t.details = f"{screens} screen(s), {blocks} block(s)"
+        t.notes.append(f"      Total time: {result.get('total_time_ms', 'N/A')}ms")
     
-    # These tests now safely handle partial failure
-    runner.print_test("Blockly warnings captured")
-    try:
-        if result and 'blockly_warnings' in result:
-            warnings = result['blockly_warnings']
-            count = len(warnings)
-            runner.pass_test("Blockly warnings captured", details=f"{count} warning(s)")
-            if count > 0 and count <= 3:
-                for w in warnings[:3]:
-                    print(f"         - {w.get('level', 'INFO')}: {w.get('message', '')[:60]}...")
-        else:
-            runner.pass_test("Blockly warnings captured", details="No warnings (clean)")
-    except Exception as e:
-        runner.fail_test("Blockly warnings captured", f"Crash during check: {e}")
+    if result is None:
+        # Nothing to inspect; Test 1 already recorded the failure
+        runner.log("      Skipping result checks: pipeline returned no result")
+        return
     
-    runner.print_test("Performance metrics tracking")
-    try:
-        if result and 'stage_times' in result:
-            stage_times = result['stage_times']
-            total_ms = sum(stage_times.values())
-            runner.pass_test("Performance metrics tracking", details=f"{total_ms}ms total")
-            for stage in ['architecture_generation', 'layout_generation', 'blockly_generation']:
-                if stage in stage_times:
-                    print(f"         {stage.replace('_', ' ').title()}: {stage_times[stage]}ms")
-        else:
-            runner.fail_test("Performance metrics tracking", "No stage_times in result")
-    except Exception as e:
-        runner.fail_test("Performance metrics tracking", f"Crash during check: {e}")
+    async with runner.track("Blockly warnings captured") as t:
+        warnings = result.get('blockly_warnings') or []
+        count = len(warnings)
+        t.details = f"{count} warning(s)" if warnings else "No warnings (clean)"
+        if 0 < count <= 3:
+            for w in warnings:
+                t.notes.append(f"         - {w.get('level', 'INFO')}: {w.get('message', '')[:60]}...")
+    
+    async with runner.track("Performance metrics tracking") as t:
+        if 'stage_times' not in result:
+            raise AssertionError("No stage_times in result")
+        
+        stage_times = result['stage_times']
+        t.details = f"{sum(stage_times.values())}ms total"
+        for stage in ['architecture_generation', 'layout_generation', 'blockly_generation']:
+            if stage in stage_times:
+                t.notes.append(f"         {stage.replace('_', ' ').title()}: {stage_times[stage]}ms")
 
 
 async def test_statistics():
     """Test generator statistics"""
     runner.print_header("STATISTICS (Phase 5)")
     
-    runner.print_test("Blockly generator statistics")
-    try:
+    async with runner.track("Blockly generator statistics") as t:
         stats = blockly_generator.get_statistics()
         
         total = stats.get('total_requests', 0)
         success_rate = stats.get('success_rate', 0)
         
-        runner.pass_test("Blockly generator statistics")
-        print(f"      Total requests: {total}")
-        print(f"      Successful: {stats.get('successful', 0)}")
-        print(f"      Success rate: {success_rate:.1f}%")
-        print(f"      Blocks generated: {stats.get('blocks_generated', 0)}")
-        print(f"      Variables created: {stats.get('variables_created', 0)}")
-        
-    except Exception as e:
-        runner.fail_test("Blockly generator statistics", str(e))
+        t.notes.append(f"      Total requests: {total}")
+        t.notes.append(f"      Successful: {stats.get('successful', 0)}")
+        t.notes.append(f"      Success rate: {success_rate:.1f}%")
+        t.notes.append(f"      Blocks generated: {stats.get('blocks_generated', 0)}")
+        t.notes.append(f"      Variables created: {stats.get('variables_created', 0)}")
 
 
 async def main():
     """Run all Phase 5 tests"""
-    print("\n" + "=" * 60)
-    print("  PHASE 5 COMPREHENSIVE TEST SUITE")
-    print("  Blockly Generation with Claude")
-    print("=" * 60)
-    print(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    runner.log("\n" + "=" * 60)
+    runner.log("  PHASE 5 COMPREHENSIVE TEST SUITE")
+    runner.log("  Blockly Generation with Claude")
+    runner.log("=" * 60)
+    runner.log(f"  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    runner.log("=" * 60)
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
-        # Connect to infrastructure
-        await cache_manager.connect()
-        await db_manager.connect()
-        await queue_manager.connect()
-        
-        # Run test suites
-        await test_blockly_generator()
-        await test_blockly_validator()
-        await test_complete_pipeline()
-        await test_statistics()
-        
-        # Cleanup
-        await cache_manager.disconnect()
-        await db_manager.disconnect()
-        await queue_manager.disconnect()
+        # Connect once per process; reused if a driver already connected
+        async with infrastructure():
+            # Independent suites overlap their LLM latency; statistics
+            # reads the counters they leave behind, so it runs last
+            await runner.run_concurrently(
+                test_blockly_generator,
+                test_blockly_validator,
+                test_complete_pipeline
+            )
+            await test_statistics()
         
     except Exception as e:
         logger.error(f"Test suite crashed: {e}")
-        print(f"\n❌ Test suite crashed: {e}\n")
+        runner.log(f"\n❌ Test suite crashed: {e}\n")
         return 1
     
     finally:
-        total_time = time.time() - start_time
-        print(f"\n⏱️ Total test time: {total_time:.2f}s")
+        total_time = (time.perf_counter_ns() - start_time) / 1e9
+        runner.log(f"\n⏱️ Total test time: {total_time:.2f}s")
+        runner.flush()
     
     return runner.print_summary()
 
 
 if __name__ == "__main__":
+    # A loop policy rather than asyncio.Runner(loop_factory=...), which
+    # needs Python 3.11
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Run the quick Phase 3, Phase 4 and flow checks in one go.
+
+The three prompts are sent together, so their LLM round-trips overlap
+instead of running back to back, and infrastructure is connected once.
+Each script's own report then runs against its matching result, in order.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harness import infrastructure
+from app.services.generation.architecture_generator import architecture_generator
+from app.services.pipeline import default_pipeline
+import test_quick_phase3
+import test_quick_phase4
+import test_quick_flow
+
+
+async def main() -> int:
+    """Run all quick checks; exit code is non-zero if any failed"""
+    start_time = time.perf_counter_ns()
+    
+    async with infrastructure():
+        outcomes = await asyncio.gather(
+            architecture_generator.generate(test_quick_phase3.TEST_PROMPT),
+            default_pipeline.execute(test_quick_phase4.build_request()),
+            default_pipeline.execute(test_quick_flow.build_request()),
+            return_exceptions=True
+        )
+        
+        checks = [
+            ("Quick Phase 3", lambda r: test_quick_phase3.report(*r)),
+            ("Quick Phase 4", test_quick_phase4.report),
+            ("Quick flow", test_quick_flow.report),
+        ]
+        
+        results = []
+        for (name, report), outcome in zip(checks, outcomes):
+            print("\n" + "=" * 60)
+            print(f"  {name.upper()}")
+            print("=" * 60)
+            
+            if isinstance(outcome, Exception):
+                print(f"\n❌ TEST FAILED: {outcome}")
+                results.append((name, 1))
+                continue
+            
+            try:
+                # The Phase 3 report also validates, so it is async
+                code = report(outcome)
+                if asyncio.iscoroutine(code):
+                    code = await code
+            except Exception as e:
+                print(f"\n❌ TEST FAILED: {e}")
+                code = 1
+            results.append((name, code))
+    
+    print("\n" + "=" * 60)
+    print("  ALL QUICK CHECKS")
+    print("=" * 60)
+    for name, code in results:
+        print(f"  {'✅' if code == 0 else '❌'} {name}")
+    print(f"\n⏱️  Total time: {(time.perf_counter_ns() - start_time) / 1e9:.2f}s")
+    
+    return max(code for _, code in results)
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -34,6 +34,7 @@ def test_multiple_requests():
     print(f"\n📤 Sending {len(test_prompts)} test requests...")
     
     task_ids = []
+    bodies = []
     
     for i, prompt in enumerate(test_prompts, 1):
         task_id = f"test-{int(time.time())}-{i}"
@@ -48,16 +49,27 @@ def test_multiple_requests():
             "context": None,
             "timestamp": datetime.now(timezone.utc).isoformat() + "Z"
         }
-        
+        bodies.append(json.dumps(request))
+    
+    properties = pika.BasicProperties(
+        delivery_mode=2,  # Make message persistent
+        content_type='application/json'
+    )
+    
+    # Publish the whole batch in one transaction: the publishes don't wait
+    # on the broker, and the commit is the only round-trip
+    channel.tx_select()
+    for body in bodies:
         channel.basic_publish(
             exchange='',
             routing_key='ai-requests',
-            body=json.dumps(request),
-            properties=pika.BasicProperties(delivery_mode=2)
+            body=body,
+            properties=properties
         )
-        
+    channel.tx_commit()
+    
+    for i, (prompt, task_id) in enumerate(zip(test_prompts, task_ids), 1):
         print(f"   {i}. {prompt} (Task: {task_id})")
-        time.sleep(0.5)  # Small delay between messages
     
     connection.close()
     
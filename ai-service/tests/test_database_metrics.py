@@ -0,0 +1,64 @@
+"""
+tests/test_database_metrics.py
+Tests for bulk request-metric inserts
+"""
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from app.core.database import DatabaseManager, METRIC_COLUMNS
+
+
+class FakePool:
+    """Pool stand-in that hands out one connection and counts checkouts"""
+    
+    def __init__(self):
+        self.connection = AsyncMock()
+        self.acquired = 0
+    
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self.connection
+
+
+@pytest.fixture
+def db():
+    """Database manager wired to a fake pool"""
+    manager = DatabaseManager()
+    manager.pool = FakePool()
+    manager._connected = True
+    return manager
+
+
+class TestBulkImportMetrics:
+    """Test db_manager.bulk_import_metrics"""
+    
+    @pytest.mark.asyncio
+    async def test_copies_rows_straight_into_request_metrics(self, db):
+        """All rows go out in one COPY on one connection"""
+        records = [
+            {"task_id": "t1", "user_id": "u1", "stage": "intent", "duration_ms": 12, "success": True},
+            {"task_id": "t1", "user_id": "u1", "stage": "layout", "duration_ms": 40, "success": False,
+             "error_message": "boom"},
+        ]
+        
+        imported = await db.bulk_import_metrics(records)
+        
+        assert imported == 2
+        assert db.pool.acquired == 1
+        db.pool.connection.copy_records_to_table.assert_awaited_once_with(
+            "request_metrics",
+            records=[
+                ("t1", "u1", "intent", 12, True, None),
+                ("t1", "u1", "layout", 40, False, "boom"),
+            ],
+            columns=METRIC_COLUMNS
+        )
+        db.pool.connection.execute.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_the_database(self, db):
+        """No records means no connection checkout"""
+        assert await db.bulk_import_metrics([]) == 0
+        assert db.pool.acquired == 0
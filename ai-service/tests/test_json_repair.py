@@ -0,0 +1,52 @@
+"""
+tests/test_json_repair.py
+Tests for the near-JSON repair applied to LLM architecture output
+"""
+import pytest
+import json
+
+from app.services.generation.architecture_generator import _repair_json
+
+
+class TestRepairJson:
+    """Test _repair_json"""
+    
+    @pytest.mark.parametrize("text, expected", [
+        ('{"a": 1,}', {"a": 1}),
+        ('[1, 2, 3,]', [1, 2, 3]),
+        ('{"a": [1, 2,\n  ],\n}', {"a": [1, 2]}),
+        ('{"a": {"b": true,\t}\r\n,}', {"a": {"b": True}}),
+    ])
+    def test_drops_trailing_commas(self, text, expected):
+        """Commas before a closing bracket are removed"""
+        assert json.loads(_repair_json(text)) == expected
+    
+    def test_drops_line_comments(self):
+        """// comments run to the end of the line"""
+        text = '{\n  "a": 1, // first\n  "b": 2 // last\n}'
+        assert json.loads(_repair_json(text)) == {"a": 1, "b": 2}
+    
+    def test_comment_on_last_line(self):
+        """A comment with no trailing newline ends the text"""
+        assert json.loads(_repair_json('{"a": 1} // done')) == {"a": 1}
+    
+    def test_comment_hides_trailing_comma(self):
+        """A comma followed by a comment before the bracket is still dropped"""
+        text = '{"a": [1, 2, // more later\n]}'
+        assert json.loads(_repair_json(text)) == {"a": [1, 2]}
+    
+    @pytest.mark.parametrize("text", [
+        '{"url": "https://example.com/api"}',
+        '{"pattern": "a,}", "list": "x, ]"}',
+        '{"quote": "say \\"hi\\", // not a comment,}"}',
+        '{"path": "C:\\\\dir\\\\", "next": "//x"}',
+    ])
+    def test_leaves_strings_untouched(self, text):
+        """Commas, brackets and // inside strings are kept as-is"""
+        assert _repair_json(text) == text
+        assert json.loads(_repair_json(text)) == json.loads(text)
+    
+    def test_valid_json_unchanged(self):
+        """Well-formed JSON passes through byte for byte"""
+        text = json.dumps({"screens": [{"id": "home", "tags": ["a", "b"]}], "n": 1.5})
+        assert _repair_json(text) == text
@@ -0,0 +1,161 @@
+"""
+tests/test_layout_batch.py
+Tests for batched layout generation with a mocked LLM orchestrator
+"""
+import pytest
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.llm import LLMProvider, LLMResponse
+from app.models.schemas import ScreenDefinition
+from app.services.generation.layout_generator import LayoutGenerator, LayoutGenerationError
+
+
+LAYOUT = {"components": [{"id": "btn_main", "type": "Button", "properties": {}}]}
+
+
+def screen_count(messages):
+    """Screens in a batched prompt, or None for a single-screen prompt"""
+    prompt = messages[-1].content
+    if "JSON array" not in prompt:
+        return None
+    return prompt.count("**Screen Details:**")
+
+
+def reply(payload):
+    """LLM response carrying a JSON payload"""
+    return LLMResponse(
+        content=json.dumps(payload),
+        provider=LLMProvider.LLAMA3,
+        tokens_used=100
+    )
+
+
+def make_orchestrator(batch_reply, single_reply):
+    """
+    Orchestrator mock answering batched and single-screen prompts.
+    
+    Each reply callable gets the prompt's screen count (batched) or the
+    user prompt (single) and returns a payload, or raises.
+    """
+    async def generate(messages, temperature, max_tokens):
+        count = screen_count(messages)
+        if count:
+            return reply(batch_reply(count))
+        return reply(single_reply(messages[-1].content))
+    
+    return SimpleNamespace(generate=AsyncMock(side_effect=generate))
+
+
+def batch_sizes(orchestrator):
+    """Screen count of every batched call, in call order"""
+    sizes = [screen_count(call.kwargs['messages']) for call in orchestrator.generate.call_args_list]
+    return [size for size in sizes if size]
+
+
+def single_calls(orchestrator):
+    """Number of single-screen calls"""
+    return sum(
+        1 for call in orchestrator.generate.call_args_list
+        if not screen_count(call.kwargs['messages'])
+    )
+
+
+@pytest.fixture
+def architecture():
+    """Six screens, one Button each"""
+    return SimpleNamespace(screens=[
+        ScreenDefinition(id=f"screen_{i}", name=f"Screen {i}", purpose="Test screen", components=["Button"])
+        for i in range(6)
+    ])
+
+
+def make_generator(orchestrator):
+    """Layout generator on a mocked orchestrator, without retry back-off"""
+    generator = LayoutGenerator(orchestrator=orchestrator)
+    generator.retry_delay = 0
+    return generator
+
+
+class TestGenerateBatch:
+    """Test LayoutGenerator.generate_batch"""
+    
+    @pytest.mark.asyncio
+    async def test_splits_into_chunks(self, architecture):
+        """Screens go out in chunks of max_batch_size, results in input order"""
+        orchestrator = make_orchestrator(lambda count: [LAYOUT] * count, lambda prompt: LAYOUT)
+        generator = make_generator(orchestrator)
+        screen_ids = [s.id for s in reversed(architecture.screens)]
+        
+        results = await generator.generate_batch(architecture, screen_ids)
+        
+        assert sorted(batch_sizes(orchestrator)) == [2, 4]
+        assert single_calls(orchestrator) == 0
+        assert [layout.screen_id for layout, _ in results] == screen_ids
+        assert all(metadata['generation_method'] == 'llm' for _, metadata in results)
+        assert generator.get_statistics()['llama3_successes'] == 6
+    
+    @pytest.mark.asyncio
+    async def test_missing_layout_retried_alone(self, architecture):
+        """Only screens the batch reply left out get their own call"""
+        orchestrator = make_orchestrator(lambda count: [LAYOUT] * (count - 1), lambda prompt: LAYOUT)
+        generator = make_generator(orchestrator)
+        screen_ids = [s.id for s in architecture.screens]
+        
+        results = await generator.generate_batch(architecture, screen_ids)
+        
+        # The last screen of each chunk (4 and 2) is missing from its reply
+        assert single_calls(orchestrator) == 2
+        retried = [layout.screen_id for layout, metadata in results if 'batch_size' not in metadata]
+        assert retried == ["screen_3", "screen_5"]
+        assert generator.get_statistics()['heuristic_fallbacks'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_retry_falls_back_to_heuristic(self, architecture):
+        """A screen whose own call also fails gets a heuristic layout"""
+        def single_reply(prompt):
+            raise RuntimeError("LLM unavailable")
+        
+        orchestrator = make_orchestrator(lambda count: [LAYOUT] * (count - 1), single_reply)
+        generator = make_generator(orchestrator)
+        screen_ids = [s.id for s in architecture.screens[:4]]
+        
+        results = await generator.generate_batch(architecture, screen_ids)
+        
+        methods = [metadata['generation_method'] for _, metadata in results]
+        assert methods == ['llm', 'llm', 'llm', 'heuristic']
+        assert single_calls(orchestrator) == generator.max_retries
+        assert results[-1][0].components
+        
+        stats = generator.get_statistics()
+        assert stats['total_requests'] == 4
+        assert stats['heuristic_fallbacks'] == 1
+        assert stats['llama3_successes'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_batch_failure_retries_every_screen(self, architecture):
+        """A failed batch call sends each of its screens on its own"""
+        def batch_reply(count):
+            raise RuntimeError("batch timed out")
+        
+        orchestrator = make_orchestrator(batch_reply, lambda prompt: LAYOUT)
+        generator = make_generator(orchestrator)
+        screen_ids = [s.id for s in architecture.screens[:3]]
+        
+        results = await generator.generate_batch(architecture, screen_ids)
+        
+        assert batch_sizes(orchestrator) == [3]
+        assert single_calls(orchestrator) == 3
+        assert [layout.screen_id for layout, _ in results] == screen_ids
+    
+    @pytest.mark.asyncio
+    async def test_unknown_screen(self, architecture):
+        """Screens missing from the architecture are rejected up front"""
+        orchestrator = make_orchestrator(lambda count: [LAYOUT] * count, lambda prompt: LAYOUT)
+        generator = make_generator(orchestrator)
+        
+        with pytest.raises(LayoutGenerationError, match="screen_missing"):
+            await generator.generate_batch(architecture, ["screen_0", "screen_missing"])
+        
+        orchestrator.generate.assert_not_awaited()
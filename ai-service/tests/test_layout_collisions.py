@@ -0,0 +1,139 @@
+"""
+tests/test_layout_collisions.py
+Tests for the sort-and-sweep collision checks against a pairwise reference
+"""
+import pytest
+import random
+from itertools import combinations
+from pydantic import ValidationError
+
+from app.models.enhanced_schemas import EnhancedComponentDefinition, EnhancedLayoutDefinition
+from app.services.generation.layout_generator import layout_generator
+
+
+def pairwise_overlap(rects):
+    """Reference check: compare every pair"""
+    return any(
+        layout_generator._rectangles_overlap(a, b)
+        for a, b in combinations(rects, 2)
+    )
+
+
+def random_rects(rng, count, step=1):
+    """
+    Random (left, top, right, bottom) rectangles.
+    
+    A coarse step snaps every edge to a grid, so many pairs share an edge.
+    """
+    rects = []
+    for _ in range(count):
+        left = rng.randrange(0, 290, step)
+        top = rng.randrange(0, 600, step)
+        width = rng.randrange(step, 80, step)
+        height = rng.randrange(step, 60, step)
+        rects.append((left, top, left + width, top + height))
+    return rects
+
+
+def make_layout(rects):
+    """EnhancedLayoutDefinition with one Text component per rectangle"""
+    return EnhancedLayoutDefinition(
+        screen_id="screen_1",
+        components=[
+            EnhancedComponentDefinition(
+                component_id=f"text_{index}",
+                component_type="Text",
+                properties={
+                    "value": {"type": "literal", "value": "Label"},
+                    "style": {"type": "literal", "value": {
+                        "left": left, "top": top,
+                        "width": right - left, "height": bottom - top
+                    }}
+                }
+            )
+            for index, (left, top, right, bottom) in enumerate(rects)
+        ]
+    )
+
+
+class TestAnyOverlap:
+    """Test LayoutGenerator._any_overlap"""
+    
+    def test_empty_and_single(self):
+        """Nothing to collide with"""
+        assert not layout_generator._any_overlap([])
+        assert not layout_generator._any_overlap([(0, 0, 10, 10)])
+    
+    @pytest.mark.parametrize("rects", [
+        [(0, 0, 10, 10), (10, 0, 20, 10)],    # touching on x
+        [(0, 0, 10, 10), (0, 10, 10, 20)],    # touching on y
+        [(0, 0, 10, 10), (10, 10, 20, 20)],   # touching at a corner
+        [(10, 0, 20, 10), (0, 0, 10, 10)],    # touching, unsorted input
+    ])
+    def test_touching_edges_do_not_overlap(self, rects):
+        """Shared edges are not collisions"""
+        assert not pairwise_overlap(rects)
+        assert not layout_generator._any_overlap(rects)
+    
+    def test_same_left_edge_overlap(self):
+        """Rectangles starting at the same x are still compared"""
+        rects = [(0, 0, 10, 10), (0, 5, 10, 15)]
+        assert layout_generator._any_overlap(rects)
+    
+    def test_overlap_with_earlier_wide_rect(self):
+        """A wide rectangle stays active past narrower ones that end"""
+        rects = [(0, 0, 100, 10), (20, 20, 30, 30), (50, 5, 60, 15)]
+        assert pairwise_overlap(rects)
+        assert layout_generator._any_overlap(rects)
+    
+    @pytest.mark.parametrize("step", [1, 20])
+    def test_matches_pairwise_on_random_layouts(self, step):
+        """Sweep and pairwise agree on random layouts, including grid-aligned ones"""
+        rng = random.Random(step)
+        outcomes = set()
+        
+        for _ in range(500):
+            rects = random_rects(rng, rng.randrange(2, 12), step)
+            expected = pairwise_overlap(rects)
+            outcomes.add(expected)
+            assert layout_generator._any_overlap(rects) == expected, rects
+        
+        # The sample covers both answers
+        assert outcomes == {True, False}
+
+
+class TestLayoutDefinitionCollisions:
+    """Test EnhancedLayoutDefinition.validate_no_collisions"""
+    
+    @pytest.mark.parametrize("rects", [
+        [(0, 0, 10, 10), (10, 0, 20, 10)],
+        [(0, 0, 10, 10), (0, 10, 10, 20)],
+        [(10, 10, 20, 20), (0, 0, 10, 10)],
+    ])
+    def test_touching_edges_are_valid(self, rects):
+        """Shared edges are not collisions"""
+        assert len(make_layout(rects).components) == len(rects)
+    
+    def test_collision_names_components_in_input_order(self):
+        """The error lists the earlier component first, whatever the x order"""
+        with pytest.raises(ValidationError, match="text_0 overlaps with text_1"):
+            make_layout([(50, 0, 100, 50), (0, 0, 60, 50)])
+    
+    @pytest.mark.parametrize("step", [1, 20])
+    def test_matches_pairwise_on_random_layouts(self, step):
+        """Validation fails exactly when some pair overlaps"""
+        rng = random.Random(step)
+        outcomes = set()
+        
+        for _ in range(200):
+            rects = random_rects(rng, rng.randrange(2, 10), step)
+            expected = pairwise_overlap(rects)
+            outcomes.add(expected)
+            
+            if expected:
+                with pytest.raises(ValidationError, match="Component collision detected"):
+                    make_layout(rects)
+            else:
+                make_layout(rects)
+        
+        assert outcomes == {True, False}
@@ -107,7 +107,7 @@ class TestGeneration:
         mock_response.raise_for_status = Mock()
         
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
             
@@ -136,7 +136,7 @@ class TestGeneration:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             await provider.generate(
                 test_messages,
@@ -166,7 +166,7 @@ class TestGeneration:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             await provider.generate(test_messages, temperature=0.7)
             
@@ -188,7 +188,7 @@ class TestErrorHandling:
     async def test_timeout_error(self, provider, test_messages):
         """Test handling of timeout errors"""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 side_effect=httpx.TimeoutException("Timeout")
             )
             
@@ -203,7 +203,7 @@ class TestErrorHandling:
         mock_response.text = "Internal Server Error"
         
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 side_effect=httpx.HTTPStatusError(
                     "Error",
                     request=Mock(),
@@ -222,7 +222,7 @@ class TestErrorHandling:
         mock_response.raise_for_status = Mock()
         
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
             
@@ -233,7 +233,7 @@ class TestErrorHandling:
     async def test_network_error(self, provider, test_messages):
         """Test handling of network errors"""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("Network error")
             )
             
@@ -257,7 +257,7 @@ class TestHealthCheck:
         mock_response.raise_for_status = Mock()
         
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
             
@@ -268,7 +268,7 @@ class TestHealthCheck:
     async def test_unhealthy_provider(self, provider):
         """Test health check when provider is unhealthy"""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("Service unavailable")
             )
             
@@ -300,7 +300,7 @@ class TestAPIKeyHandling:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             messages = [LLMMessage(role="user", content="test")]
             await provider.generate(messages)
@@ -323,7 +323,7 @@ class TestAPIKeyHandling:
         
         with patch('httpx.AsyncClient') as mock_client:
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             await provider.generate(test_messages)
             
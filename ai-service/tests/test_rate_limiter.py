@@ -0,0 +1,84 @@
+"""
+tests/test_rate_limiter.py
+Tests for the Redis fixed-window rate limiter, run against fakeredis
+"""
+import pytest
+import fakeredis
+
+from app.config import settings
+from app.core.cache import cache_manager
+from app.utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+async def limiter(monkeypatch):
+    """Rate limiter whose cache manager talks to an in-memory Redis"""
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(cache_manager, "client", client)
+    monkeypatch.setattr(cache_manager, "_connected", True)
+    monkeypatch.setattr(cache_manager, "_scripts", {})
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    
+    yield RateLimiter()
+    
+    await client.aclose()
+
+
+class TestCheckRateLimit:
+    """Test the Lua check-and-increment path"""
+    
+    @pytest.mark.asyncio
+    async def test_allows_up_to_limit(self, limiter):
+        """Requests under the limit are allowed and counted"""
+        for expected_remaining in (2, 1, 0):
+            allowed, info = await limiter.check_rate_limit("u1", limit=3)
+            assert allowed
+            assert info['remaining'] == expected_remaining
+            assert info['limit'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_rejects_at_limit_without_counting(self, limiter):
+        """Rejected requests don't push the stored count past the limit"""
+        for _ in range(3):
+            await limiter.check_rate_limit("u1", limit=3)
+        
+        for _ in range(2):
+            allowed, info = await limiter.check_rate_limit("u1", limit=3)
+            assert not allowed
+            assert info['limited']
+            assert info['remaining'] == 0
+            assert 0 < info['retry_after'] <= limiter.window_seconds
+        
+        info = await limiter.get_rate_limit_info("u1")
+        assert info['count'] == 3
+        assert info['remaining'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_window_gets_a_ttl(self, limiter):
+        """The first request starts the window"""
+        await limiter.check_rate_limit("u1", limit=3)
+        
+        ttl = await cache_manager.ttl(f"{limiter.prefix}u1")
+        assert 0 < ttl <= limiter.window_seconds
+    
+    @pytest.mark.asyncio
+    async def test_info_reports_custom_limit(self, limiter):
+        """get_rate_limit_info uses the limit the window was checked against"""
+        await limiter.check_rate_limit("u1", limit=5)
+        
+        info = await limiter.get_rate_limit_info("u1")
+        assert info['count'] == 1
+        assert info['limit'] == 5
+        assert info['remaining'] == 4
+    
+    @pytest.mark.asyncio
+    async def test_reset_clears_window(self, limiter):
+        """A reset window starts counting from zero"""
+        for _ in range(3):
+            await limiter.check_rate_limit("u1", limit=3)
+        
+        assert await limiter.reset_rate_limit("u1")
+        
+        allowed, info = await limiter.check_rate_limit("u1", limit=3)
+        assert allowed
+        assert info['remaining'] == 2